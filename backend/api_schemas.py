@@ -1,6 +1,6 @@
 
 from pydantic import BaseModel
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 
 class BaseRequest(BaseModel):
@@ -13,6 +13,7 @@ class ChatWithAutorRequest(BaseRequest):
 
     messages: str
     learner_profile: str = ""
+    use_cache: bool = True  # False bypasses the semantic answer cache
 
 
 class LearningGoalRefinementRequest(BaseRequest):
@@ -124,6 +125,21 @@ class TailoredContentGenerationRequest(BaseModel):
     with_quiz: bool = True
 
 
+class LearningContentStreamRequest(BaseRequest):
+
+    learner_profile: str
+    learning_path: str
+    learning_session: str
+    use_search: bool = True
+    allow_parallel: bool = True
+    with_quiz: bool = True
+    output_markdown: bool = True
+    single_choice_count: int = 3
+    multiple_choice_count: int = 0
+    true_false_count: int = 0
+    short_answer_count: int = 0
+
+
 class KnowledgePointExplorationRequest(BaseModel):
     
     learner_profile: str
@@ -198,3 +214,9 @@ class AuthLoginRequest(BaseModel):
 
 class UserStateRequest(BaseModel):
     state: Dict[str, Any]
+
+
+class UserStatePatchRequest(BaseModel):
+    set: Dict[str, Any] = {}
+    unset: List[str] = []
+    version: Optional[int] = None  # version the patch is based on; None skips the check
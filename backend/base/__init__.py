@@ -1,7 +1,7 @@
 from .base_agent import BaseAgent
 from .llm_factory import LLMFactory
 from .searcher_factory import SearcherFactory, SearchRunner
-from .embedder_factory import EmbedderFactory
+from .embedder_factory import CachedEmbeddings, EmbedderFactory
 from .rag_factory import TextSplitterFactory, VectorStoreFactory
 
 
@@ -11,6 +11,7 @@ __all__ = [
     "SearcherFactory",
     "SearchRunner",
     "EmbedderFactory",
+    "CachedEmbeddings",
     "TextSplitterFactory",
     "VectorStoreFactory",
 ]
\ No newline at end of file
@@ -0,0 +1,90 @@
+"""Process-wide registry of compiled agent graphs.
+
+``create_agent`` compiles a LangGraph graph, which costs far more than the
+LLM-independent work of a helper call. Agents are built per request, so
+without sharing every call (and every knowledge point in a drafting batch)
+recompiles the same graph. A compiled graph without a checkpointer keeps no
+per-run state, so one instance can serve concurrent invocations from any
+thread or event loop.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from langchain.agents import create_agent
+
+_MAX_AGENTS = 256
+
+_lock = threading.Lock()
+# key -> (objects the key refers to by id, compiled graph); least recently used first
+_agents: "OrderedDict[Tuple, Tuple[Tuple, Any]]" = OrderedDict()
+hits = 0
+misses = 0
+
+
+def _key(model: Any, system_prompt: Optional[str], tools: Optional[Sequence[Any]], agent_kwargs: Dict[str, Any]):
+    # Models, tools and middleware are matched by identity. The entry holds a
+    # reference to each of them, so an id cannot be reused while it is cached.
+    referents = (model, tuple(tools or ()), tuple(agent_kwargs.values()))
+    key = (
+        id(model),
+        system_prompt,
+        tuple(id(tool) for tool in tools or ()),
+        tuple((name, id(value)) for name, value in sorted(agent_kwargs.items())),
+    )
+    return key, referents
+
+
+def get_agent(
+    model: Any,
+    system_prompt: Optional[str] = None,
+    tools: Optional[Sequence[Any]] = None,
+    **agent_kwargs: Any,
+):
+    """Return the compiled agent for these arguments, building it on first use."""
+    global hits, misses
+    key, referents = _key(model, system_prompt, tools, agent_kwargs)
+    with _lock:
+        entry = _agents.get(key)
+        if entry is not None:
+            _agents.move_to_end(key)
+            hits += 1
+            return entry[1]
+        misses += 1
+    agent = create_agent(model=model, tools=tools, system_prompt=system_prompt, **agent_kwargs)
+    with _lock:
+        # keep the first graph if another thread compiled the same agent meanwhile
+        if key in _agents:
+            return _agents[key][1]
+        _agents[key] = (referents, agent)
+        while len(_agents) > _MAX_AGENTS:
+            _agents.popitem(last=False)
+    return agent
+
+
+def forget_models(models: Sequence[Any]) -> None:
+    """Drop the graphs built for *models*.
+
+    A graph references its model, so without this a client evicted from the
+    ``LLMFactory`` pool (and its open connections) would stay alive until
+    the registry's own LRU rolls over.
+    """
+    ids = {id(model) for model in models}
+    if not ids:
+        return
+    with _lock:
+        for key in [key for key, (referents, _) in _agents.items() if id(referents[0]) in ids]:
+            del _agents[key]
+
+
+def stats() -> Dict[str, int]:
+    with _lock:
+        return {"size": len(_agents), "hits": hits, "misses": misses}
+
+
+def clear() -> None:
+    global hits, misses
+    with _lock:
+        _agents.clear()
+        hits = misses = 0
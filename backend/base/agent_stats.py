@@ -0,0 +1,37 @@
+"""Per-agent counters for how BaseAgent calls end up being answered.
+
+``calls``       invocations that reached the LLM (cache hits are not counted)
+``structured``  answered by provider-native structured output
+``fallbacks``   structured output failed or was skipped, so the free-text parser ran
+``repaired``    replies that failed schema validation but were fixed without another call
+``retries``     extra LLM round-trips after an unparseable or invalid reply
+``failures``    calls that raised after exhausting their retries
+"""
+
+import threading
+from typing import Dict
+
+_COUNTERS = ("calls", "structured", "fallbacks", "repaired", "retries", "failures")
+
+_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def record(agent_name: str, counter: str) -> None:
+    with _lock:
+        counters = _stats.setdefault(agent_name, dict.fromkeys(_COUNTERS, 0))
+        counters[counter] += 1
+
+
+def stats() -> Dict[str, Dict[str, float]]:
+    """Counters per agent, plus the average number of retries per call."""
+    with _lock:
+        return {
+            name: {**counters, "retries_per_call": counters["retries"] / max(1, counters["calls"])}
+            for name, counters in _stats.items()
+        }
+
+
+def clear() -> None:
+    with _lock:
+        _stats.clear()
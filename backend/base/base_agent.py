@@ -1,10 +1,19 @@
 import json
-from typing import Any, Dict, Optional, Sequence
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Sequence, Type, Union
 
-from langchain.agents import create_agent
+from langchain.agents.structured_output import StructuredOutputError
 from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk
+from langgraph.errors import GraphRecursionError
+from omegaconf import DictConfig
+from pydantic import BaseModel, ValidationError
 
-from utils.llm_output import convert_json_output, preprocess_response
+from base import agent_registry, agent_stats, response_cache
+from utils.config import ensure_config_dict
+
+from utils.llm_output import ThinkStripper, convert_json_output, preprocess_response
+from utils.schema_repair import apply_patch, feedback_prompt, repair_output, repairing_model
 from langgraph.typing import InputT, OutputT, StateT
 from langchain.agents.middleware.types import (
     AgentMiddleware,
@@ -17,6 +26,15 @@ from langchain.agents.middleware.types import (
     _OutputAgentState,
 )
 
+logger = logging.getLogger(__name__)
+
+# errors that mean "this model/schema pair cannot do structured output"; the
+# free-text parser is tried instead. Anything else (provider, network and
+# programming errors) propagates rather than paying for a second call.
+_STRUCTURED_OUTPUT_ERRORS = (StructuredOutputError, GraphRecursionError, NotImplementedError)
+# graph steps for a structured call: the model turn plus two schema-error corrections
+_STRUCTURED_CALL_CONFIG = {"recursion_limit": 6}
+
 valid_agent_arg_list = [
     "middleware",
     "response_format",
@@ -34,6 +52,9 @@ valid_agent_arg_list = [
 
 class BaseAgent:
 
+    # default for agents constructed without structured_output=; see configure_structured_output
+    structured_output_enabled: bool = True
+
     def __init__(
             self,
             model: BaseChatModel,
@@ -49,15 +70,58 @@ class BaseAgent:
         self._agent = self._build_agent()
         self.exclude_think = kwargs.get("exclude_think", True)
         self.jsonalize_output = kwargs.get("jsonalize_output", True)
+        # None defers to the llm_cache.agents list in the config
+        self.cache_responses = kwargs.get("cache_responses")
+        # None defers to llm.structured_output in the config
+        self.structured_output = kwargs.get("structured_output")
+
+    @classmethod
+    def configure_structured_output(cls, config: Union[DictConfig, Dict[str, Any]]) -> None:
+        """Apply ``llm.structured_output`` from the app config."""
+        llm_config = ensure_config_dict(config).get("llm", {}) or {}
+        cls.structured_output_enabled = bool(llm_config.get("structured_output", cls.structured_output_enabled))
 
     def _build_agent(self):
-        return create_agent(
+        # compiled graphs are shared across instances; see base.agent_registry
+        return agent_registry.get_agent(
+            model=self._model,
+            tools=self._tools,
+            system_prompt=self._system_prompt,
+            **self._agent_kwargs,
+        )
+
+    def _structured_schema(self, output_schema: Optional[Type[BaseModel]]) -> Optional[Type[BaseModel]]:
+        """The schema to request native structured output for, or None to parse free text."""
+        if output_schema is None or not self.jsonalize_output or "response_format" in self._agent_kwargs:
+            return None
+        enabled = self.structured_output
+        if enabled is None:
+            enabled = BaseAgent.structured_output_enabled
+        if not enabled:
+            return None
+        # tool calling is what both the provider and the tool strategy bind to
+        if getattr(type(self._model), "bind_tools", None) in (None, BaseChatModel.bind_tools):
+            return None
+        return output_schema
+
+    def _structured_agent(self, schema: Type[BaseModel]):
+        # create_agent picks provider-native JSON schema output where the model
+        # supports it and a forced tool call otherwise
+        return agent_registry.get_agent(
             model=self._model,
             tools=self._tools,
             system_prompt=self._system_prompt,
+            response_format=repairing_model(schema),
             **self._agent_kwargs,
         )
 
+    @staticmethod
+    def _structured_result(raw_output: Any) -> Optional[Any]:
+        structured = (raw_output or {}).get("structured_response")
+        if isinstance(structured, BaseModel):
+            return structured.model_dump()
+        return structured
+
     def set_prompts(self, system_prompt: Optional[str] = None, task_prompt: Optional[str] = None) -> None:
         """Set or update system/task prompts and rebuild the internal agent if needed."""
         if system_prompt is not None:
@@ -78,39 +142,243 @@ class BaseAgent:
         }
         return prompt
 
-    def invoke(self, input_dict: dict, task_prompt: Optional[str] = None, max_retries: int = 2) -> Any:
+    @property
+    def _agent_name(self) -> str:
+        return getattr(self, "name", type(self).__name__)
+
+    def _response_cache_key(
+        self, input_prompt: _InputAgentState, schema: Optional[Type[BaseModel]] = None
+    ) -> Optional[str]:
+        """The response cache key, or None when this call must not be cached."""
+        enabled = self.cache_responses
+        if enabled is None:
+            enabled = response_cache.enabled_for(self._agent_name)
+        if not enabled or not response_cache.is_deterministic(self._model):
+            return None
+        output_mode = (self.jsonalize_output, self.exclude_think)
+        if schema is not None:
+            output_mode += (schema.__name__,)
+        return response_cache.make_key(self._model, self._system_prompt, input_prompt["messages"], output_mode)
+
+    def _process_output(
+        self,
+        raw_output: Any,
+        input_prompt: _InputAgentState,
+        can_retry: bool,
+        output_schema: Optional[Type[BaseModel]] = None,
+        patch_base: Any = None,
+    ):
+        """Turn a raw agent result into the final output.
+
+        Returns ``(result, None, None)`` on success, or ``(None, retry_prompt,
+        patch_base)`` when another attempt is allowed and needed. With an
+        *output_schema*, JSON that fails validation is first repaired
+        deterministically (see ``utils.schema_repair``). If that is not enough,
+        the retry asks only for corrected values of the failing fields, and
+        the next reply is applied to *patch_base*, the document returned here.
+        """
+        # Extract text and strip <think> tags without JSON parsing.
+        text_output = preprocess_response(
+            raw_output, only_text=True, exclude_think=self.exclude_think, json_output=False
+        )
+
+        if not self.jsonalize_output:
+            return text_output, None, None
+
+        try:
+            parsed = convert_json_output(text_output)
+        except json.JSONDecodeError:
+            if not can_retry:
+                raise
+            return None, self._retry_prompt(input_prompt, text_output, (
+                "Your previous response could not be parsed as valid JSON. "
+                "Please return ONLY a valid JSON object with no additional "
+                "text, markdown formatting, or code fences."
+            )), patch_base
+
+        if patch_base is not None:
+            parsed = apply_patch(patch_base, parsed)
+        if output_schema is None:
+            return parsed, None, None
+        try:
+            repaired, fixes = repair_output(output_schema, parsed)
+        except ValidationError as exc:
+            if not can_retry:
+                raise
+            return None, self._retry_prompt(input_prompt, text_output, feedback_prompt(exc)), parsed
+        if fixes:
+            logger.info("Repaired %s output without another call: %s", self._agent_name, "; ".join(fixes))
+            agent_stats.record(self._agent_name, "repaired")
+        return repaired, None, None
+
+    @staticmethod
+    def _retry_prompt(input_prompt: _InputAgentState, text_output: str, correction: str) -> _InputAgentState:
+        return {
+            "messages": input_prompt["messages"] + [
+                {"role": "assistant", "content": text_output},
+                {"role": "user", "content": correction},
+            ]
+        }
+
+    def invoke(
+        self,
+        input_dict: dict,
+        task_prompt: Optional[str] = None,
+        max_retries: int = 2,
+        output_schema: Optional[Type[BaseModel]] = None,
+    ) -> Any:
         """Invoke the agent with the given input text.
 
-        When JSON output is expected and the LLM response fails to parse,
-        the conversation is extended with the failed response and a
-        correction prompt, then re-invoked up to *max_retries* times.
+        With an *output_schema* and a model that supports tool calling, the
+        reply is requested as native structured output bound to that schema
+        and returned as a dict. Otherwise, or if that fails, the text reply
+        is parsed as JSON: when parsing fails the conversation is extended
+        with the failed response and a correction prompt, then re-invoked up
+        to *max_retries* times. Parsed JSON that fails validation against
+        *output_schema* is repaired in place where possible; otherwise the
+        retry asks only for the failing fields. With response caching enabled for this agent,
+        a previously parsed response for the same model and prompts is
+        returned without a call. Outcomes are counted in ``base.agent_stats``.
         """
         input_prompt = self._build_prompt(input_dict, task_prompt=task_prompt)
+        schema = self._structured_schema(output_schema)
+        cache_key = self._response_cache_key(input_prompt, schema)
+        if cache_key is not None:
+            hit, cached = response_cache.lookup(self._agent_name, cache_key)
+            if hit:
+                return cached
 
-        for attempt in range(1 + max_retries):
-            raw_output = self._agent.invoke(input_prompt)
+        agent_stats.record(self._agent_name, "calls")
+        raw_output = None
+        if schema is not None:
+            try:
+                raw_output = self._structured_agent(schema).invoke(input_prompt, config=_STRUCTURED_CALL_CONFIG)
+            except _STRUCTURED_OUTPUT_ERRORS:
+                logger.warning("Structured output failed for %s; parsing text instead", self._agent_name, exc_info=True)
+            result = self._structured_result(raw_output)
+            if result is not None:
+                return self._finish(cache_key, result, "structured")
+            # a finished structured call without a structured response still has a text reply to parse
+            if raw_output is not None:
+                logger.warning("No structured response from %s; parsing text instead", self._agent_name)
+            agent_stats.record(self._agent_name, "fallbacks")
 
-            # Extract text and strip <think> tags without JSON parsing.
-            text_output = preprocess_response(
-                raw_output, only_text=True, exclude_think=self.exclude_think, json_output=False
+        patch_base = None
+        for attempt in range(1 + max_retries):
+            if raw_output is None:
+                raw_output = self._agent.invoke(input_prompt)
+            result, retry_prompt, patch_base = self._parse_attempt(
+                raw_output, input_prompt, attempt < max_retries, output_schema, patch_base
             )
+            if retry_prompt is None:
+                return self._finish(cache_key, result)
+            input_prompt, raw_output = retry_prompt, None
+
+    async def ainvoke(
+        self,
+        input_dict: dict,
+        task_prompt: Optional[str] = None,
+        max_retries: int = 2,
+        output_schema: Optional[Type[BaseModel]] = None,
+    ) -> Any:
+        """Async counterpart of :meth:`invoke`.
 
-            if not self.jsonalize_output:
-                return text_output
+        Awaits the model call instead of blocking, so concurrent requests
+        overlap their LLM latency on the event loop.
+        """
+        input_prompt = self._build_prompt(input_dict, task_prompt=task_prompt)
+        schema = self._structured_schema(output_schema)
+        cache_key = self._response_cache_key(input_prompt, schema)
+        if cache_key is not None:
+            hit, cached = response_cache.lookup(self._agent_name, cache_key)
+            if hit:
+                return cached
 
+        agent_stats.record(self._agent_name, "calls")
+        raw_output = None
+        if schema is not None:
             try:
-                return convert_json_output(text_output)
-            except json.JSONDecodeError:
-                if attempt < max_retries:
-                    input_prompt = {
-                        "messages": input_prompt["messages"] + [
-                            {"role": "assistant", "content": text_output},
-                            {"role": "user", "content": (
-                                "Your previous response could not be parsed as valid JSON. "
-                                "Please return ONLY a valid JSON object with no additional "
-                                "text, markdown formatting, or code fences."
-                            )},
-                        ]
-                    }
-                else:
-                    raise
+                raw_output = await self._structured_agent(schema).ainvoke(input_prompt, config=_STRUCTURED_CALL_CONFIG)
+            except _STRUCTURED_OUTPUT_ERRORS:
+                logger.warning("Structured output failed for %s; parsing text instead", self._agent_name, exc_info=True)
+            result = self._structured_result(raw_output)
+            if result is not None:
+                return self._finish(cache_key, result, "structured")
+            if raw_output is not None:
+                logger.warning("No structured response from %s; parsing text instead", self._agent_name)
+            agent_stats.record(self._agent_name, "fallbacks")
+
+        patch_base = None
+        for attempt in range(1 + max_retries):
+            if raw_output is None:
+                raw_output = await self._agent.ainvoke(input_prompt)
+            result, retry_prompt, patch_base = self._parse_attempt(
+                raw_output, input_prompt, attempt < max_retries, output_schema, patch_base
+            )
+            if retry_prompt is None:
+                return self._finish(cache_key, result)
+            input_prompt, raw_output = retry_prompt, None
+
+    def run_task(self, request: Dict[str, Any]) -> Any:
+        """:meth:`invoke` with the keyword arguments in *request*, post-processed by :meth:`_task_result`.
+
+        Agent methods build *request* (payload, task prompt, output schema)
+        in one helper shared with their async twin, which calls
+        :meth:`arun_task` with it; the two then differ only in the call.
+        """
+        return self._task_result(self.invoke(**request), request)
+
+    async def arun_task(self, request: Dict[str, Any]) -> Any:
+        """Async counterpart of :meth:`run_task`."""
+        return self._task_result(await self.ainvoke(**request), request)
+
+    def _task_result(self, raw_output: Any, request: Dict[str, Any]) -> Any:
+        """The reply validated against the request's ``output_schema`` and dumped to a dict."""
+        output_schema = request.get("output_schema")
+        if output_schema is None:
+            return raw_output
+        return output_schema.model_validate(raw_output).model_dump()
+
+    def _parse_attempt(self, raw_output, input_prompt, can_retry, output_schema=None, patch_base=None):
+        """:meth:`_process_output`, counting retries and final failures."""
+        try:
+            result, retry_prompt, patch_base = self._process_output(
+                raw_output, input_prompt, can_retry, output_schema, patch_base
+            )
+        except (json.JSONDecodeError, ValidationError):
+            agent_stats.record(self._agent_name, "failures")
+            raise
+        if retry_prompt is not None:
+            agent_stats.record(self._agent_name, "retries")
+        return result, retry_prompt, patch_base
+
+    def _finish(self, cache_key: Optional[str], result: Any, outcome: Optional[str] = None) -> Any:
+        if outcome is not None:
+            agent_stats.record(self._agent_name, outcome)
+        if cache_key is not None:
+            response_cache.save(self._agent_name, cache_key, result)
+        return result
+
+    async def astream(self, input_dict: dict, task_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield the reply text as the model generates it.
+
+        Only for text agents (``jsonalize_output=False``): partial JSON is of
+        no use to a caller. ``<think>`` blocks are dropped on the fly when
+        ``exclude_think`` is set. Streamed replies bypass the response cache.
+        """
+        if self.jsonalize_output:
+            raise ValueError(f"{self._agent_name} produces JSON output; use ainvoke instead of astream")
+        input_prompt = self._build_prompt(input_dict, task_prompt=task_prompt)
+        stripper = ThinkStripper() if self.exclude_think else None
+        async for chunk, _metadata in self._agent.astream(input_prompt, stream_mode="messages"):
+            if not isinstance(chunk, AIMessageChunk):
+                continue
+            text = str(chunk.text)
+            if stripper is not None:
+                text = stripper.feed(text)
+            if text:
+                yield text
+        if stripper is not None:
+            tail = stripper.flush()
+            if tail:
+                yield tail
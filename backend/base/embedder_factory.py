@@ -1,5 +1,16 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
 from langchain_core.embeddings import Embeddings
-from typing import Optional
+from omegaconf import DictConfig
+
+from utils.config import ensure_config_dict
+from utils.disk_cache import DiskCache
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
 
 
 class EmbedderFactory:
@@ -7,8 +18,13 @@ class EmbedderFactory:
     def create(
         model: str = "sentence-transformers/all-MiniLM-L6-v2", 
         model_provider: Optional[str] = "huggingface",
+        **kwargs: Any,
         ) -> Embeddings:
-        """Create an embedding model instance based on the specified model name."""
+        """Create an embedding model instance based on the specified model name.
+
+        Extra keyword arguments go to providers that take options: for
+        ``onnx`` these are the arguments of :meth:`OnnxEmbeddings.from_pretrained`.
+        """
         if ':' in model:
             model_provider, model = model.split(':', 1)
         else:
@@ -17,6 +33,8 @@ class EmbedderFactory:
             case "huggingface":
                 from langchain_huggingface import HuggingFaceEmbeddings
                 return HuggingFaceEmbeddings(model_name=model)
+            case "onnx":
+                return OnnxEmbeddings.from_pretrained(model, **kwargs)
             case "openai":
                 from langchain_openai import OpenAIEmbeddings
                 return OpenAIEmbeddings(model=model)
@@ -31,6 +49,220 @@ class EmbedderFactory:
                 raise ValueError(f"Unsupported model provider: {model_provider}")
 
 
+# int8 weights, dynamically quantized; exported by sentence-transformers to the model repos
+_QUANTIZED_ONNX_FILES = {
+    "arm64": "onnx/model_qint8_arm64.onnx",
+    "aarch64": "onnx/model_qint8_arm64.onnx",
+}
+_DEFAULT_QUANTIZED_ONNX_FILE = "onnx/model_quint8_avx2.onnx"
+
+
+class OnnxEmbeddings(Embeddings):
+    """Sentence-transformer embeddings computed with onnxruntime on CPU.
+
+    Runs the ONNX export of a sentence-transformers model without torch.
+    Texts are tokenized with the model's fast tokenizer, sorted by length and
+    run in batches of ``batch_size``, so each batch is padded only to its own
+    longest text. Token states are pooled and normalized the way the model's
+    sentence-transformers configuration says (mean pooling and no
+    normalization when it has none).
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        tokenizer: Any,
+        pad_id: int = 0,
+        pooling: str = "mean",
+        normalize: bool = False,
+        batch_size: int = 32,
+    ):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.pad_id = pad_id
+        self.pooling = pooling
+        self.normalize = normalize
+        self.batch_size = batch_size
+        self._input_names = {model_input.name for model_input in session.get_inputs()}
+
+    @classmethod
+    def from_pretrained(
+        cls,
+        model: str,
+        quantize: bool = True,
+        threads: int = 0,
+        batch_size: int = 32,
+        onnx_file: Optional[str] = None,
+    ) -> "OnnxEmbeddings":
+        """Load *model*, a Hugging Face repo ID or a local directory with the same layout.
+
+        With *quantize* the int8 export for this CPU architecture is used,
+        otherwise ``onnx/model.onnx``; *onnx_file* names another file in the
+        model. *threads* caps onnxruntime's intra-op threads (0 lets it
+        decide).
+        """
+        import platform
+
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        fetch = _model_file_fetcher(model)
+        if onnx_file is None:
+            arch = platform.machine().lower()
+            onnx_file = _QUANTIZED_ONNX_FILES.get(arch, _DEFAULT_QUANTIZED_ONNX_FILE) if quantize else "onnx/model.onnx"
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = int(threads)
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(_required(fetch, model, onnx_file), options, providers=["CPUExecutionProvider"])
+
+        tokenizer = Tokenizer.from_file(_required(fetch, model, "tokenizer.json"))
+        tokenizer.no_padding()
+        st_config = _read_json(fetch, "sentence_bert_config.json")
+        tokenizer.enable_truncation(max_length=int(st_config.get("max_seq_length", 512)))
+        pad_token = _read_json(fetch, "tokenizer_config.json").get("pad_token")
+        if isinstance(pad_token, dict):
+            pad_token = pad_token.get("content")
+        pad_id = tokenizer.token_to_id(pad_token) if isinstance(pad_token, str) else None
+
+        pooling_config = _read_json(fetch, "1_Pooling/config.json")
+        modules = _read_json(fetch, "modules.json") or []
+        return cls(
+            session,
+            tokenizer,
+            pad_id=pad_id or 0,
+            pooling="cls" if pooling_config.get("pooling_mode_cls_token") else "mean",
+            normalize=any(module.get("type", "").endswith("Normalize") for module in modules),
+            batch_size=batch_size,
+        )
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # similar lengths share a batch, so little compute goes to padding
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors: List[List[float]] = [[] for _ in texts]
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            for index, vector in zip(batch, self._encode([texts[i] for i in batch])):
+                vectors[index] = vector.tolist()
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._encode([text])[0].tolist()
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        width = max(len(encoding.ids) for encoding in encodings)
+        input_ids = np.full((len(encodings), width), self.pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), width), dtype=np.int64)
+        for row, encoding in enumerate(encodings):
+            input_ids[row, :len(encoding.ids)] = encoding.ids
+            attention_mask[row, :len(encoding.ids)] = 1
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask, "token_type_ids": np.zeros_like(input_ids)}
+        output = self.session.run(None, {name: feeds[name] for name in self._input_names})[0]
+        if output.ndim == 2:  # the export already pools
+            pooled = output
+        elif self.pooling == "cls":
+            pooled = output[:, 0]
+        else:
+            weights = attention_mask[..., None].astype(output.dtype)
+            pooled = (output * weights).sum(axis=1) / np.clip(weights.sum(axis=1), 1e-9, None)
+        if self.normalize:
+            pooled = pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32)
+
+
+def _model_file_fetcher(model: str) -> Callable[[str], Optional[str]]:
+    """Path of a file of *model*; None for optional files it does not have."""
+    local = Path(model).expanduser()
+    if local.is_dir():
+        return lambda filename: str(local / filename) if (local / filename).exists() else None
+
+    from huggingface_hub import hf_hub_download
+    from huggingface_hub.errors import EntryNotFoundError
+
+    def fetch(filename: str) -> Optional[str]:
+        try:
+            return hf_hub_download(repo_id=model, filename=filename)
+        except EntryNotFoundError:
+            return None
+
+    return fetch
+
+
+def _required(fetch: Callable[[str], Optional[str]], model: str, filename: str) -> str:
+    path = fetch(filename)
+    if path is None:
+        raise ValueError(f"Embedding model {model} has no {filename}; export it to ONNX or set onnx_file")
+    return path
+
+
+def _read_json(fetch: Callable[[str], Optional[str]], filename: str) -> Any:
+    path = fetch(filename)
+    if path is None:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings backed by a persistent cache of vectors.
+
+    Vectors are stored as float32 in a :class:`DiskCache` keyed by the model
+    name, whether the text was embedded as a document or a query (some models
+    embed the two differently) and a hash of the text. Only texts missing
+    from the cache reach the wrapped model, in one batch, so re-ingested
+    content and repeated queries skip the forward pass entirely.
+    """
+
+    def __init__(self, embedder: Embeddings, cache: DiskCache, model_name: str):
+        self.embedder = embedder
+        self.cache = cache
+        self.model_name = model_name
+
+    @staticmethod
+    def from_config(
+        config: Union[DictConfig, Dict[str, Any]],
+        embedder: Embeddings,
+        model_name: str,
+        section: str = "embedding_cache",
+    ) -> Embeddings:
+        """Wrap *embedder* as configured by ``config[section]``; unwrapped when disabled."""
+        settings = ensure_config_dict(config).get(section, {}) or {}
+        if not settings.get("enabled", True):
+            return embedder
+        path = Path(settings.get("path", "data/embedding_cache.db"))
+        cache = DiskCache(
+            path if path.is_absolute() else _BACKEND_DIR / path,
+            max_entries=int(settings.get("max_entries", 200_000)),
+            max_bytes=int(settings.get("max_bytes", 512 * 2**20)),
+        )
+        return CachedEmbeddings(embedder, cache, model_name)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, "document", self.embedder.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text], "query", lambda texts: [self.embedder.embed_query(texts[0])])[0]
+
+    def _key(self, kind: str, text: str) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.model_name}:{kind}:{digest}"
+
+    def _embed(self, texts: List[str], kind: str, compute: Callable[[List[str]], List[List[float]]]) -> List[List[float]]:
+        keys = [self._key(kind, text) for text in texts]
+        vectors = {key: np.frombuffer(value, dtype=np.float32) for key, value in self.cache.get_many(keys).items()}
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if missing:
+            computed = [np.asarray(vector, dtype=np.float32) for vector in compute(list(missing.values()))]
+            vectors.update(zip(missing, computed))
+            self.cache.set_many({key: vector.tobytes() for key, vector in zip(missing, computed)})
+        # cached and fresh vectors both come back as float32 values
+        return [vectors[key].tolist() for key in keys]
+
+    def stats(self) -> Dict[str, float]:
+        return self.cache.stats()
+
+
 if __name__ == "__main__":
     # Example usage
     embedder = EmbedderFactory.create(
@@ -1,6 +1,11 @@
+import hashlib
 import logging
-from typing import Optional, Union, Any, Dict
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Union, Any, Dict, List, Tuple
 from omegaconf import DictConfig, OmegaConf
+from base import agent_registry
 from utils.config import ensure_config_dict
 
 from langchain_core.language_models import BaseChatModel
@@ -13,6 +18,17 @@ logger = logging.getLogger(__name__)
 
 class LLMFactory:
 
+    # Shared clients keyed by (provider, model, base_url, temperature, extras),
+    # least recently used first. Each client owns an HTTP connection pool, so
+    # reusing it keeps keep-alive connections warm across requests.
+    _pool: "OrderedDict[Tuple, Tuple[BaseChatModel, float]]" = OrderedDict()
+    _pool_lock = threading.Lock()
+    pool_max_size: int = 16
+    pool_idle_seconds: float = 3600.0
+    pool_hits: int = 0
+    pool_misses: int = 0
+    pool_evictions: int = 0
+
     @staticmethod
     def create(
         model: Optional[str] = None,
@@ -58,6 +74,99 @@ class LLMFactory:
         llm = init_chat_model(**config_kwargs)
         return llm
 
+    @staticmethod
+    def _pool_key(model, model_provider, temperature, base_url, api_key, kwargs) -> Tuple:
+        # only a digest of the key is kept so it never shows up in reprs or logs
+        key_digest = hashlib.sha256(api_key.encode()).hexdigest() if api_key else None
+        extras = tuple(sorted((k, repr(v)) for k, v in kwargs.items()))
+        return (model_provider, model, base_url, float(temperature), key_digest, extras)
+
+    @classmethod
+    def get(
+        cls,
+        model: Optional[str] = None,
+        model_provider: Optional[str] = None,
+        temperature: float = 0,
+        base_url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        **kwargs
+    ) -> BaseChatModel:
+        """Return a pooled client for these parameters, creating it on first use.
+
+        Takes the same arguments as :meth:`create`. Clients idle for longer
+        than ``pool_idle_seconds`` are dropped, and the least recently used
+        client is evicted once the pool holds ``pool_max_size`` entries.
+        """
+        if model is None:
+            model = "gpt-4o"
+            model_provider = model_provider or "openai"
+        key = cls._pool_key(model, model_provider, temperature, base_url, api_key, kwargs)
+        now = time.monotonic()
+        with cls._pool_lock:
+            evicted = cls._evict_idle(now)
+            entry = cls._pool.get(key)
+            if entry is not None:
+                cls._pool[key] = (entry[0], now)
+                cls._pool.move_to_end(key)
+                cls.pool_hits += 1
+            else:
+                cls.pool_misses += 1
+        # compiled graphs hold their model; release them with the client
+        agent_registry.forget_models(evicted)
+        if entry is not None:
+            return entry[0]
+        llm = cls.create(model, model_provider, temperature, base_url, api_key, **kwargs)
+        evicted = []
+        with cls._pool_lock:
+            # another thread may have built the same client meanwhile; keep the first
+            if key in cls._pool:
+                return cls._pool[key][0]
+            cls._pool[key] = (llm, now)
+            while len(cls._pool) > cls.pool_max_size:
+                evicted.append(cls._pool.popitem(last=False)[1][0])
+                cls.pool_evictions += 1
+        agent_registry.forget_models(evicted)
+        return llm
+
+    @classmethod
+    def _evict_idle(cls, now: float) -> List[BaseChatModel]:
+        """Drop clients idle for longer than ``pool_idle_seconds``; returns them."""
+        evicted = []
+        while cls._pool:
+            key, (client, last_used) = next(iter(cls._pool.items()))
+            if now - last_used <= cls.pool_idle_seconds:
+                break
+            del cls._pool[key]
+            evicted.append(client)
+            cls.pool_evictions += 1
+        return evicted
+
+    @classmethod
+    def pool_stats(cls) -> Dict[str, int]:
+        with cls._pool_lock:
+            return {
+                "size": len(cls._pool),
+                "hits": cls.pool_hits,
+                "misses": cls.pool_misses,
+                "evictions": cls.pool_evictions,
+            }
+
+    @classmethod
+    def clear_pool(cls) -> None:
+        with cls._pool_lock:
+            evicted = [client for client, _ in cls._pool.values()]
+            cls._pool.clear()
+            cls.pool_hits = cls.pool_misses = cls.pool_evictions = 0
+        agent_registry.forget_models(evicted)
+
+    @classmethod
+    def configure_pool(cls, config: Union[DictConfig, OmegaConf, Dict[str, Any]]) -> None:
+        """Apply ``llm.pool_size`` / ``llm.pool_idle_seconds`` from the app config."""
+        config = ensure_config_dict(config)
+        llm_config = config.get("llm", {})
+        cls.pool_max_size = int(llm_config.get("pool_size", cls.pool_max_size))
+        cls.pool_idle_seconds = float(llm_config.get("pool_idle_seconds", cls.pool_idle_seconds))
+
     @classmethod
     def from_config(cls, config: Union[DictConfig, OmegaConf, Dict[str, Any]]) -> "LLMFactory":
         """Initialize LLM client from WorkflowConfig.
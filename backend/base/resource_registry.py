@@ -0,0 +1,107 @@
+"""Process-wide registry of the retrieval resources behind SearchRagManager.
+
+Building a SearchRagManager loads a sentence-transformer, opens a Chroma
+client (which counts its collection on open) and builds a web searcher.
+Everything obtained here is built once per process
+for the same settings and then shared. The embedder, vectorstore client and
+search runner are safe to use from several threads, so one instance serves
+all requests. Concurrent first requests wait for a single build instead of
+each loading the model.
+"""
+
+import json
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from omegaconf import DictConfig
+
+from base.search_rag import SearchRagManager
+from base.searcher_factory import SearchRunner
+from utils.config import ensure_config_dict
+
+_lock = threading.Lock()
+_resources: Dict[Tuple[str, str], Any] = {}
+_building: Dict[Tuple[str, str], threading.Lock] = {}
+_generation = 0
+hits = 0
+misses = 0
+
+
+def _config(config: Optional[Union[DictConfig, Dict[str, Any]]]) -> Dict[str, Any]:
+    if config is None:
+        from config.loader import default_config
+        config = default_config
+    return ensure_config_dict(config)
+
+
+def _shared(kind: str, settings: Dict[str, Any], build: Callable[[], Any]) -> Any:
+    """The *kind* resource for *settings*, built by *build* on first use."""
+    global hits, misses
+    key = (kind, json.dumps(settings, sort_keys=True, default=str))
+    with _lock:
+        if key in _resources:
+            hits += 1
+            return _resources[key]
+        build_lock = _building.setdefault(key, threading.Lock())
+        generation = _generation
+    with build_lock:
+        with _lock:
+            if key in _resources:
+                hits += 1
+                return _resources[key]
+            misses += 1
+        resource = build()
+        with _lock:
+            # A clear() while building drops this build from the registry.
+            if generation == _generation:
+                _resources[key] = resource
+            if _building.get(key) is build_lock:
+                del _building[key]
+    return resource
+
+
+def get_embedder(config: Optional[Union[DictConfig, Dict[str, Any]]] = None) -> Embeddings:
+    config = _config(config)
+    settings = {"embedding": SearchRagManager.embedding_settings(config)}
+    return _shared("embedder", settings, lambda: SearchRagManager.create_embedder(config))
+
+
+def get_vectorstore(config: Optional[Union[DictConfig, Dict[str, Any]]] = None) -> VectorStore:
+    config = _config(config)
+    settings = {"embedding": SearchRagManager.embedding_settings(config), "vectorstore": config.get("vectorstore", {})}
+    return _shared("vectorstore", settings, lambda: SearchRagManager.create_vectorstore(config, get_embedder(config)))
+
+
+def get_search_runner(config: Optional[Union[DictConfig, Dict[str, Any]]] = None) -> SearchRunner:
+    config = _config(config)
+    settings = {name: config.get(name, {}) for name in ("search", "search_cache")}
+    return _shared("search_runner", settings, lambda: SearchRunner.from_config(config))
+
+
+def get_search_rag_manager(config: Optional[Union[DictConfig, Dict[str, Any]]] = None) -> SearchRagManager:
+    """The shared manager for *config* (the default config when None)."""
+    config = _config(config)
+    settings = {name: config.get(name, {}) for name in ("vectorstore", "search", "search_cache", "rag")}
+    settings["embedding"] = SearchRagManager.embedding_settings(config)
+    return _shared("search_rag_manager", settings, lambda: SearchRagManager.from_config(
+        config,
+        embedder=get_embedder(config),
+        vectorstore=get_vectorstore(config),
+        search_runner=get_search_runner(config),
+    ))
+
+
+def stats() -> Dict[str, int]:
+    with _lock:
+        return {"size": len(_resources), "hits": hits, "misses": misses}
+
+
+def clear() -> None:
+    global hits, misses, _generation
+    with _lock:
+        _resources.clear()
+        _building.clear()
+        _generation += 1
+        hits = misses = 0
@@ -0,0 +1,133 @@
+"""Opt-in persistent cache of parsed agent responses.
+
+A cached response is keyed by a hash of the model's identifying parameters,
+the system prompt, the formatted task prompt and the output parser version,
+so any change to one of them misses. Only deterministic calls are cached:
+models without an explicit temperature of zero always go to the LLM, since
+an unset temperature means the provider's sampling default.
+
+Caching is enabled per agent, either with ``BaseAgent(..., cache_responses=True)``
+or by listing the agent's ``name`` under ``llm_cache.agents`` in the config.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+from omegaconf import DictConfig
+
+from utils.config import ensure_config_dict
+from utils.disk_cache import DiskCache
+from utils.llm_output import PARSER_VERSION
+from utils.serialization import decode_record, encode_record
+
+logger = logging.getLogger(__name__)
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_lock = threading.Lock()
+_cache: Optional[DiskCache] = None
+_path: Path = _BACKEND_DIR / "data" / "llm_cache.db"
+_ttl_seconds: Optional[float] = 7 * 24 * 3600
+_max_entries: int = 10_000
+_max_bytes: int = 256 * 2**20
+_enabled_agents: frozenset = frozenset()
+# agent name -> {"hits": n, "misses": n}
+_agent_stats: Dict[str, Dict[str, int]] = {}
+
+
+def configure(config: Union[DictConfig, Dict[str, Any]]) -> None:
+    """Apply the ``llm_cache`` section. Safe to call again; reopens the cache file."""
+    global _cache, _path, _ttl_seconds, _max_entries, _max_bytes, _enabled_agents
+    section = ensure_config_dict(config).get("llm_cache", {}) or {}
+    path = Path(section.get("path", "data/llm_cache.db"))
+    with _lock:
+        _path = path if path.is_absolute() else _BACKEND_DIR / path
+        _ttl_seconds = section.get("ttl_seconds", _ttl_seconds)
+        _max_entries = int(section.get("max_entries", _max_entries))
+        _max_bytes = int(section.get("max_bytes", _max_bytes))
+        _enabled_agents = frozenset(section.get("agents", []) or [])
+        if _cache is not None:
+            _cache.close()
+            _cache = None
+
+
+def enabled_for(agent_name: str) -> bool:
+    return agent_name in _enabled_agents
+
+
+def _get_cache() -> DiskCache:
+    global _cache
+    with _lock:
+        if _cache is None:
+            _cache = DiskCache(_path, max_entries=_max_entries, max_bytes=_max_bytes, ttl_seconds=_ttl_seconds)
+        return _cache
+
+
+def is_deterministic(model: Any) -> bool:
+    # an unset temperature (None) leaves sampling to the provider default
+    return getattr(model, "temperature", None) == 0
+
+
+def make_key(model: Any, system_prompt: Optional[str], messages: Sequence[Dict[str, Any]], output_mode: Tuple) -> str:
+    """Hash everything that determines the parsed response."""
+    params = getattr(model, "_identifying_params", None) or {}
+    material = {
+        "model": [type(model).__name__, params],
+        "system_prompt": system_prompt,
+        "messages": list(messages),
+        "output_mode": list(output_mode),
+        "parser_version": PARSER_VERSION,
+    }
+    blob = json.dumps(material, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _count(agent_name: str, outcome: str) -> None:
+    with _lock:
+        counters = _agent_stats.setdefault(agent_name, {"hits": 0, "misses": 0})
+        counters[outcome] += 1
+
+
+def lookup(agent_name: str, key: str) -> Tuple[bool, Any]:
+    """Return ``(True, response)`` on a hit and ``(False, None)`` otherwise."""
+    try:
+        blob = _get_cache().get(key)
+    except Exception:
+        logger.exception("LLM response cache lookup failed")
+        blob = None
+    if blob is None:
+        _count(agent_name, "misses")
+        return False, None
+    _count(agent_name, "hits")
+    return True, decode_record(blob)
+
+
+def save(agent_name: str, key: str, response: Any) -> None:
+    try:
+        _get_cache().set(key, encode_record(response))
+    except Exception:
+        # a cache that cannot be written must never fail the request
+        logger.exception("Could not cache response for %s", agent_name)
+
+
+def stats() -> Dict[str, Any]:
+    """Cache-wide counters plus per-agent hits, misses and hit ratio."""
+    with _lock:
+        agents = {
+            name: {**counters, "hit_ratio": counters["hits"] / max(1, counters["hits"] + counters["misses"])}
+            for name, counters in _agent_stats.items()
+        }
+        cache = _cache
+    return {"cache": cache.stats() if cache is not None else None, "agents": agents}
+
+
+def clear() -> None:
+    _get_cache().clear()
+    with _lock:
+        _agent_stats.clear()
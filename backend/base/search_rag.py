@@ -1,4 +1,5 @@
 import os
+import hashlib
 import logging
 from typing import List, Optional, Dict, Any, Union
 from omegaconf import DictConfig
@@ -9,7 +10,7 @@ from langchain_core.vectorstores import VectorStore
 from langchain_text_splitters.base import TextSplitter
 
 from base.dataclass import SearchResult
-from base.embedder_factory import EmbedderFactory
+from base.embedder_factory import CachedEmbeddings, EmbedderFactory
 from base.searcher_factory import SearcherFactory, SearchRunner
 from base.rag_factory import TextSplitterFactory, VectorStoreFactory
 from utils.config import ensure_config_dict
@@ -17,6 +18,17 @@ from utils.config import ensure_config_dict
 logger = logging.getLogger(__name__)
 
 
+def chunk_id(document: Document) -> str:
+    """Content-addressed ID: hash of the chunk's source and whitespace-normalized text.
+
+    The same page fetched again splits into chunks with the same IDs, so they
+    are recognised as already stored.
+    """
+    source = (document.metadata or {}).get("source", "")
+    text = " ".join(document.page_content.split())
+    return hashlib.sha256(f"{source}\n{text}".encode("utf-8")).hexdigest()
+
+
 class SearchRagManager:
 
     def __init__(
@@ -36,12 +48,19 @@ class SearchRagManager:
     @staticmethod
     def from_config(
         config: Union[DictConfig, Dict[str, Any]],
+        *,
+        embedder: Optional[Embeddings] = None,
+        vectorstore: Optional[VectorStore] = None,
+        search_runner: Optional[SearchRunner] = None,
     ) -> "SearchRagManager":
+        """Build a manager from *config*; components passed in are used instead of new ones.
+
+        Each call loads the embedding model and opens the vectorstore again.
+        Request handlers should use ``base.resource_registry`` instead, which
+        shares one set of components per process.
+        """
         config = ensure_config_dict(config)
-        embedder = EmbedderFactory.create(
-            model=config.get("embedder", {}).get("model_name", "sentence-transformers/all-mpnet-base-v2"),
-            model_provider=config.get("embedder", {}).get("provider", "huggingface"),
-        )
+        embedder = embedder or SearchRagManager.create_embedder(config)
 
         text_splitter = TextSplitterFactory.create(
             splitter_type=config.get("rag", {}).get("text_splitter_type", "recursive_character"),
@@ -49,14 +68,9 @@ class SearchRagManager:
             chunk_overlap=config.get("rag", {}).get("chunk_overlap", 0),
         )
 
-        vectorstore = VectorStoreFactory.create(
-            vectorstore_type=config.get("vectorstore", {}).get("type", "chroma"),
-            collection_name=config.get("vectorstore", {}).get("collection_name", "default_collection"),
-            persist_directory=config.get("vectorstore", {}).get("persist_directory", "./data/vectorstore"),
-            embedder=embedder,
-        )
+        vectorstore = vectorstore or SearchRagManager.create_vectorstore(config, embedder)
 
-        search_runner = SearchRunner.from_config(
+        search_runner = search_runner or SearchRunner.from_config(
             config=config
         )
 
@@ -68,6 +82,34 @@ class SearchRagManager:
             max_retrieval_results=config.get("rag", {}).get("num_retrieval_results", 5),
         )
 
+    @staticmethod
+    def embedding_settings(config: Union[DictConfig, Dict[str, Any]]) -> Dict[str, Any]:
+        """The ``embedding`` config section (``embedder`` in older configs)."""
+        config = ensure_config_dict(config)
+        return dict(config.get("embedding") or config.get("embedder") or {})
+
+    @staticmethod
+    def create_embedder(config: Union[DictConfig, Dict[str, Any]]) -> Embeddings:
+        settings = SearchRagManager.embedding_settings(config)
+        model = settings.pop("model_name", "sentence-transformers/all-mpnet-base-v2")
+        provider = settings.pop("provider", "huggingface")
+        options, variant = {}, ""
+        if provider == "onnx":
+            options = {key: value for key, value in settings.items() if value is not None}
+            # quantized and full-precision vectors differ, so they are cached apart
+            variant = ":" + (options.get("onnx_file") or ("int8" if options.get("quantize", True) else "fp32"))
+        embedder = EmbedderFactory.create(model=model, model_provider=provider, **options)
+        return CachedEmbeddings.from_config(config, embedder, model_name=f"{provider}:{model}{variant}")
+
+    @staticmethod
+    def create_vectorstore(config: Union[DictConfig, Dict[str, Any]], embedder: Optional[Embeddings]) -> VectorStore:
+        config = ensure_config_dict(config)
+        return VectorStoreFactory.create(
+            vectorstore_type=config.get("vectorstore", {}).get("type", "chroma"),
+            collection_name=config.get("vectorstore", {}).get("collection_name", "default_collection"),
+            persist_directory=config.get("vectorstore", {}).get("persist_directory", "./data/vectorstore"),
+            embedder=embedder,
+        )
 
     def search(self, query: str) -> List[SearchResult]:
         if not self.search_runner:
@@ -79,10 +121,16 @@ class SearchRagManager:
         self,
         documents: List[Document],
         source_type: Optional[str] = None
-    ) -> None:
+    ) -> int:
+        """Split, embed and store *documents*; returns the number of chunks added.
+
+        Chunks are stored under :func:`chunk_id`, and chunks already in the
+        vectorstore (or repeated within *documents*) are skipped before
+        embedding, so only unique content costs embedding time and space.
+        """
         if len(documents) == 0:
             logger.warning("No documents to add to the vectorstore.")
-            return
+            return 0
         if not self.vectorstore:
             raise ValueError("VectorStore is not initialized.")
         documents = [doc for doc in documents if len(doc.page_content.strip()) > 0]
@@ -94,8 +142,26 @@ class SearchRagManager:
             split_docs = self.text_splitter.split_documents(documents)
         else:
             split_docs = documents
-        self.vectorstore.add_documents(split_docs, embedding_function=self.embedder)
-        logger.info(f"Added {len(split_docs)} documents to the vectorstore.")
+        chunks = {}
+        for doc in split_docs:
+            chunks.setdefault(chunk_id(doc), doc)
+        if not chunks:
+            return 0
+        stored = self._stored_ids(list(chunks))
+        new_ids = [id_ for id_ in chunks if id_ not in stored]
+        if new_ids:
+            self.vectorstore.add_documents([chunks[id_] for id_ in new_ids], ids=new_ids)
+        logger.info(
+            f"Added {len(new_ids)} chunks to the vectorstore; "
+            f"skipped {len(split_docs) - len(new_ids)} already stored or repeated."
+        )
+        return len(new_ids)
+
+    def _stored_ids(self, ids: List[str]) -> set:
+        if hasattr(self.vectorstore, "get"):
+            # Chroma: look up IDs only, without loading documents or embeddings
+            return set(self.vectorstore.get(ids=ids, include=[])["ids"])
+        return {doc.id for doc in self.vectorstore.get_by_ids(ids)}
 
     def retrieve(self, query: str, k: Optional[int] = None) -> List[Document]:
         k = k or self.max_retrieval_results
@@ -6,13 +6,23 @@ instead of hand-written HTTP code. It supports Bing, Tavily, and Serper.dev.
 
 from __future__ import annotations
 
+from pathlib import Path
 from pydoc import doc
-from typing import Any, Dict, List, Union, cast
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 from langchain_core.documents import Document
 from .dataclass import SearchResult
 from pydantic import BaseModel
 from omegaconf import OmegaConf, DictConfig
 from utils.config import ensure_config_dict
+from utils.disk_cache import DiskCache
+from utils.serialization import decode_record, encode_record
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of *query*, used for cache keys."""
+    return " ".join(query.casefold().split())
 
 
 class SearcherFactory:
@@ -68,18 +78,32 @@ class WebDocumentLoader:
 
 
 class SearchRunner:
-    """Manager to perform searches using different providers."""
+    """Manager to perform searches using different providers.
+
+    With a *cache*, the structured results of a query (provider hits and the
+    loaded pages) are stored on disk for *cache_ttl_seconds*, keyed by the
+    provider, loader, result count and normalized query. Repeated queries
+    then skip both the provider round-trip and the page loads. Searches
+    that return no loaded page are not cached, so a rate-limited or failed
+    search is retried on the next call.
+    """
 
     def __init__(
             self, 
             searcher: BaseModel,
             loader_type: str = "web",
             max_search_results: int = 5,
+            provider: str = "",
+            cache: Optional[DiskCache] = None,
+            cache_ttl_seconds: Optional[float] = None,
             **kwargs: Any
         ) -> None:
         self.searcher = searcher
         self.loader_type = loader_type
         self.max_search_results = max_search_results
+        self.provider = provider
+        self.cache = cache
+        self.cache_ttl_seconds = cache_ttl_seconds
 
     @staticmethod
     def from_config(
@@ -87,18 +111,82 @@ class SearchRunner:
         ) -> "SearchRunner":
   
         config_dict = ensure_config_dict(config)
+        provider = config_dict.get("search", {}).get("provider", "duckduckgo")
         searcher = SearcherFactory.create(
-            provider=config_dict.get("search", {}).get("provider", "duckduckgo"),
+            provider=provider,
             **config_dict,
         )
+        provider = (provider or "").strip().lower()
+        cache, ttl_seconds = SearchRunner.create_cache(config_dict, provider)
         return SearchRunner(
             searcher=searcher,
             loader_type=config_dict.get("search", {}).get("loader_type", "web"),
             max_search_results=config_dict.get("search", {}).get("max_results", 5),
+            provider=provider,
+            cache=cache,
+            cache_ttl_seconds=ttl_seconds,
+        )
+
+    @staticmethod
+    def create_cache(
+            config: Union[DictConfig, Dict[str, Any]],
+            provider: str,
+            section: str = "search_cache",
+        ) -> Tuple[Optional[DiskCache], Optional[float]]:
+        """The result cache configured by ``config[section]`` and its TTL for *provider*.
+
+        Returns ``(None, None)`` when the cache is disabled.
+        """
+        settings = ensure_config_dict(config).get(section, {}) or {}
+        if not settings.get("enabled", True):
+            return None, None
+        path = Path(settings.get("path", "data/search_cache.db"))
+        cache = DiskCache(
+            path if path.is_absolute() else _BACKEND_DIR / path,
+            max_entries=int(settings.get("max_entries", 5000)),
+            max_bytes=int(settings.get("max_bytes", 256 * 2**20)),
         )
+        ttl_seconds = (settings.get("provider_ttl_seconds") or {}).get(provider, settings.get("ttl_seconds", 86400))
+        return cache, ttl_seconds
 
     def invoke(self, query: str) -> List[SearchResult]:
         """Perform a search and return structured results."""
+        if self.cache is None:
+            return self._search(query)
+        key = self._cache_key(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return [self._decode_result(item) for item in decode_record(cached)]
+        results = self._search(query)
+        if any(result.document is not None for result in results):
+            value = encode_record([self._encode_result(result) for result in results])
+            self.cache.set(key, value, ttl_seconds=self.cache_ttl_seconds)
+        return results
+
+    def _cache_key(self, query: str) -> str:
+        return f"{self.provider}:{self.loader_type}:{self.max_search_results}:{normalize_query(query)}"
+
+    @staticmethod
+    def _encode_result(result: SearchResult) -> Dict[str, Any]:
+        document = result.document
+        return {
+            "title": result.title,
+            "link": result.link,
+            "snippet": result.snippet,
+            "content": result.content,
+            "document": None if document is None else {"page_content": document.page_content, "metadata": document.metadata},
+        }
+
+    @staticmethod
+    def _decode_result(item: Dict[str, Any]) -> SearchResult:
+        document = item.pop("document")
+        return SearchResult(**item, document=None if document is None else Document(**document))
+
+    def stats(self) -> Optional[Dict[str, float]]:
+        """Counters of the result cache; None when results are not cached."""
+        return self.cache.stats() if self.cache is not None else None
+
+    def _search(self, query: str) -> List[SearchResult]:
         raw_results = self.searcher.results(query, max_results=self.max_search_results)
         urls = [item.get("link", "") for item in raw_results if item.get("link")]
         url_contents = WebDocumentLoader.invoke(urls, loader_type=self.loader_type)
@@ -0,0 +1,121 @@
+"""In-memory semantic cache: answers looked up by embedding similarity.
+
+Entries live in buckets; a lookup only considers entries of the same bucket
+and returns the most similar one whose cosine similarity reaches the
+threshold. The cache is bounded by ``max_entries`` (least recently used
+first) and entries expire after ``ttl_seconds``.
+"""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from omegaconf import DictConfig
+
+from utils.config import ensure_config_dict
+
+
+class SemanticCache:
+
+    def __init__(
+        self,
+        embedder: Embeddings,
+        similarity_threshold: float = 0.92,
+        max_entries: int = 2000,
+        ttl_seconds: Optional[float] = 86400,
+    ):
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        # entry id -> (bucket, unit vector, value, expires); least recently used first
+        self._entries: "OrderedDict[int, Tuple[Hashable, np.ndarray, Any, Optional[float]]]" = OrderedDict()
+        self._buckets: Dict[Hashable, set] = {}
+
+    @staticmethod
+    def from_config(
+        config: Union[DictConfig, Dict[str, Any]],
+        embedder: Embeddings,
+        section: str = "semantic_cache",
+    ) -> Optional["SemanticCache"]:
+        """Build a cache from ``config[section]``; None when the section disables it."""
+        settings = ensure_config_dict(config).get(section, {}) or {}
+        if not settings.get("enabled", True):
+            return None
+        return SemanticCache(
+            embedder,
+            similarity_threshold=float(settings.get("similarity_threshold", 0.92)),
+            max_entries=int(settings.get("max_entries", 2000)),
+            ttl_seconds=settings.get("ttl_seconds", 86400),
+        )
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.embedder.embed_query(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, bucket: Hashable, vector: np.ndarray) -> Optional[Any]:
+        """The cached value most similar to *vector* in *bucket*, or None."""
+        now = time.monotonic()
+        with self._lock:
+            ids = [i for i in list(self._buckets.get(bucket, ())) if not self._expired(i, now)]
+            best = None
+            if ids:
+                similarities = np.stack([self._entries[i][1] for i in ids]) @ vector
+                top = int(np.argmax(similarities))
+                if similarities[top] >= self.similarity_threshold:
+                    best = ids[top]
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(best)
+            return self._entries[best][2]
+
+    def put(self, bucket: Hashable, vector: np.ndarray, value: Any) -> None:
+        expires = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            entry_id = next(self._ids)
+            self._entries[entry_id] = (bucket, vector, value, expires)
+            self._buckets.setdefault(bucket, set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def _expired(self, entry_id: int, now: float) -> bool:
+        expires = self._entries[entry_id][3]
+        if expires is None or expires > now:
+            return False
+        self._remove(entry_id)
+        return True
+
+    def _remove(self, entry_id: int) -> None:
+        bucket = self._entries.pop(entry_id)[0]
+        members = self._buckets[bucket]
+        members.discard(entry_id)
+        if not members:
+            del self._buckets[bucket]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
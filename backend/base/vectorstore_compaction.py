@@ -0,0 +1,86 @@
+"""One-off deduplication of a vectorstore collection filled before content-hash IDs.
+
+Older versions of ``SearchRagManager.add_documents`` stored every fetched page
+again under random IDs, so popular pages exist many times over. Compaction
+keeps one record per :func:`base.search_rag.chunk_id` and deletes the rest.
+The kept record is moved to its content-hash ID, with its stored embedding,
+so later ingestion recognises it and nothing is embedded again.
+
+    python -m base.vectorstore_compaction [--dry-run]
+"""
+
+import argparse
+import logging
+from typing import Any, Dict, List
+
+from langchain_core.documents import Document
+
+from base.search_rag import chunk_id
+
+
+def compact_collection(collection: Any, batch_size: int = 500, dry_run: bool = False) -> Dict[str, int]:
+    """Deduplicate a Chroma *collection* in place; returns record counts.
+
+    ``records`` and ``unique`` count before and after, ``removed`` the deleted
+    duplicates and ``rekeyed`` the kept records moved to their content ID.
+    With *dry_run* nothing is changed.
+    """
+    # pass 1: content ID of every record, reading documents and metadata only
+    keep: Dict[str, str] = {}  # content ID -> ID of the record kept for it
+    duplicates: List[str] = []
+    offset = 0
+    while True:
+        page = collection.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+        if not page["ids"]:
+            break
+        for record_id, text, metadata in zip(page["ids"], page["documents"], page["metadatas"]):
+            content_id = chunk_id(Document(page_content=text or "", metadata=metadata or {}))
+            if content_id not in keep:
+                keep[content_id] = record_id
+            elif record_id == content_id:
+                # already stored under its content ID; keep this one instead
+                duplicates.append(keep[content_id])
+                keep[content_id] = record_id
+            else:
+                duplicates.append(record_id)
+        offset += len(page["ids"])
+
+    rekey = [(record_id, content_id) for content_id, record_id in keep.items() if record_id != content_id]
+    counts = {"records": offset, "unique": len(keep), "removed": len(duplicates), "rekeyed": len(rekey)}
+    if dry_run:
+        return counts
+
+    # pass 2: move kept records to their content ID, reusing the stored embeddings
+    for start in range(0, len(rekey), batch_size):
+        batch = dict(rekey[start:start + batch_size])
+        records = collection.get(ids=list(batch), include=["embeddings", "documents", "metadatas"])
+        collection.upsert(
+            ids=[batch[record_id] for record_id in records["ids"]],
+            embeddings=records["embeddings"],
+            documents=records["documents"],
+            metadatas=records["metadatas"],
+        )
+        collection.delete(ids=records["ids"])
+    for start in range(0, len(duplicates), batch_size):
+        collection.delete(ids=duplicates[start:start + batch_size])
+    return counts
+
+
+if __name__ == "__main__":
+    # python -m base.vectorstore_compaction  -- deduplicate the configured collection
+    from config import default_config
+    from base.search_rag import SearchRagManager
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dry-run", action="store_true", help="only report what would change")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    # records are moved with their stored embeddings, so no embedding model is needed
+    vectorstore = SearchRagManager.create_vectorstore(default_config, embedder=None)
+    counts = compact_collection(vectorstore._collection, dry_run=args.dry_run)
+    action = "Would remove" if args.dry_run else "Removed"
+    print(
+        f"{action} {counts['removed']} duplicate records of {counts['records']} "
+        f"({counts['unique']} unique, {counts['rekeyed']} moved to content IDs)"
+    )
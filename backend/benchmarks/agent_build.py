@@ -0,0 +1,67 @@
+"""Benchmark the per-call overhead of building agents with and without the registry.
+
+Every ``*_with_llm`` helper constructs a new agent. Without the registry
+that compiles a LangGraph graph via ``create_agent`` each time; with it the
+compiled graph is looked up. A fake chat model answers instantly, so the
+end-to-end numbers show the framework overhead a real LLM call pays on top
+of its latency.
+
+Run from the backend directory:
+    python benchmarks/agent_build.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain.agents import create_agent
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from base import agent_registry
+from modules.personalized_resource_delivery import LearnerFeedbackSimulator, simulate_path_feedback_with_llm
+
+ROUNDS = 200
+FEEDBACK = (
+    '{"feedback": {"progression": "ok", "engagement": "ok", "personalization": "ok"}, '
+    '"suggestions": {"progression": "", "engagement": "", "personalization": ""}}'
+)
+
+
+def _per_call_ms(fn, number=ROUNDS):
+    return timeit.timeit(fn, number=number) / number * 1e3
+
+
+def _uncached(fn):
+    """Run *fn* with the registry bypassed (the previous behaviour)."""
+    original = agent_registry.get_agent
+    agent_registry.get_agent = lambda model, system_prompt=None, tools=None, **kw: create_agent(
+        model=model, tools=tools, system_prompt=system_prompt, **kw
+    )
+    try:
+        return fn()
+    finally:
+        agent_registry.get_agent = original
+
+
+def main():
+    llm = FakeListChatModel(responses=[FEEDBACK])
+    helper = lambda: simulate_path_feedback_with_llm(llm, {"name": "alice"}, [])
+
+    build_uncached = _uncached(lambda: _per_call_ms(lambda: LearnerFeedbackSimulator(llm)))
+    helper_uncached = _uncached(lambda: _per_call_ms(helper))
+    agent_registry.clear()
+    build_cached = _per_call_ms(lambda: LearnerFeedbackSimulator(llm))
+    helper_cached = _per_call_ms(helper)
+
+    print(f"{'':<28} {'compile (ms)':>13} {'registry (ms)':>14} {'saved':>7}")
+    print(f"{'agent construction':<28} {build_uncached:>13.3f} {build_cached:>14.3f} "
+          f"{1 - build_cached / build_uncached:>7.0%}")
+    print(f"{'helper call (fake LLM)':<28} {helper_uncached:>13.3f} {helper_cached:>14.3f} "
+          f"{1 - helper_cached / helper_uncached:>7.0%}")
+    print(f"registry: {agent_registry.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Benchmark CPU embedding backends: torch (huggingface) vs. onnxruntime fp32 and int8.
+
+Each backend runs in its own process, so the resident memory it adds is
+measured in isolation. Reported per backend:
+
+- load time and RSS added by loading the model
+- throughput of ``embed_documents`` over a corpus of passage-sized chunks
+- p50/p95 latency of single ``embed_query`` calls
+- recall@10: overlap of each query's 10 nearest chunks with the torch ranking
+
+The model is the one configured under ``embedding.model_name``; it is
+downloaded on first use if it is not cached.
+
+Run from the backend directory:
+    python benchmarks/embedding_backends.py [threads]
+"""
+
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+
+CHUNKS = 512
+QUERIES = 64
+TOP_K = 10
+BACKENDS = {
+    "torch": ("huggingface", {}),
+    "onnx fp32": ("onnx", {"quantize": False}),
+    "onnx int8": ("onnx", {"quantize": True}),
+}
+
+TOPICS = [
+    "gradient descent", "binary search trees", "recursion", "SQL joins", "photosynthesis",
+    "supply and demand", "the French revolution", "Newton's laws", "neural networks", "hash tables",
+    "cell division", "probability distributions", "object-oriented design", "plate tectonics",
+    "compound interest", "HTTP caching",
+]
+TEMPLATES = [
+    "An introduction to {t} for beginners, with worked examples and common mistakes.",
+    "Why {t} matters in practice, and how experts reason about it step by step.",
+    "A short quiz on {t}: test your understanding of the key definitions.",
+    "Comparing {t} with related ideas; when to use which approach and why.",
+    "Historical background of {t} and the problems it was developed to solve.",
+]
+
+
+def _corpus(rng):
+    chunks = []
+    while len(chunks) < CHUNKS:
+        topic, template = rng.choice(TOPICS), rng.choice(TEMPLATES)
+        filler = " ".join(rng.choice(TEMPLATES).format(t=rng.choice(TOPICS)) for _ in range(rng.randint(2, 8)))
+        chunks.append(template.format(t=topic) + " " + filler)
+    queries = [f"explain {rng.choice(TOPICS)} {rng.choice(['simply', 'with examples', 'for an exam'])}" for _ in range(QUERIES)]
+    return chunks, queries
+
+
+def _rss_mb():
+    import psutil
+    return psutil.Process().memory_info().rss / 2**20
+
+
+def _run_backend(provider, options, model, threads, chunks, queries, results):
+    from base.embedder_factory import EmbedderFactory
+
+    if provider == "onnx":
+        options = {**options, "threads": threads}
+    else:
+        import torch
+        torch.set_num_threads(threads or os.cpu_count())
+    rss_before, start = _rss_mb(), time.perf_counter()
+    embedder = EmbedderFactory.create(model=model, model_provider=provider, **options)
+    embedder.embed_query("warm-up")
+    load_s, rss_added = time.perf_counter() - start, _rss_mb() - rss_before
+
+    start = time.perf_counter()
+    documents = np.asarray(embedder.embed_documents(chunks), dtype=np.float32)
+    throughput = len(chunks) / (time.perf_counter() - start)
+
+    latencies, query_vectors = [], []
+    for query in queries:
+        start = time.perf_counter()
+        query_vectors.append(embedder.embed_query(query))
+        latencies.append((time.perf_counter() - start) * 1e3)
+    results.put({
+        "load_s": load_s,
+        "rss_mb": rss_added,
+        "throughput": throughput,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "documents": documents,
+        "queries": np.asarray(query_vectors, dtype=np.float32),
+    })
+
+
+def _top_k(documents, queries):
+    documents = documents / np.linalg.norm(documents, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    return np.argsort(-(queries @ documents.T), axis=1)[:, :TOP_K]
+
+
+def main():
+    from config.loader import default_config
+    from base.search_rag import SearchRagManager
+
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    model = SearchRagManager.embedding_settings(default_config).get("model_name", "sentence-transformers/all-mpnet-base-v2")
+    chunks, queries = _corpus(random.Random(0))
+    context = multiprocessing.get_context("spawn")
+
+    measured = {}
+    for name, (provider, options) in BACKENDS.items():
+        results = context.Queue()
+        process = context.Process(target=_run_backend, args=(provider, options, model, threads, chunks, queries, results))
+        process.start()
+        measured[name] = results.get()
+        process.join()
+
+    reference = _top_k(measured["torch"]["documents"], measured["torch"]["queries"])
+    print(f"model: {model}, {len(chunks)} chunks, {len(queries)} queries, threads: {threads or 'all'}")
+    print(f"{'backend':<10} {'load (s)':>9} {'RSS (MB)':>9} {'chunks/s':>9} {'p50 (ms)':>9} {'p95 (ms)':>9} {'recall@10':>10}")
+    for name, m in measured.items():
+        ranking = _top_k(m["documents"], m["queries"])
+        recall = np.mean([len(set(a) & set(b)) / TOP_K for a, b in zip(reference, ranking)])
+        print(f"{name:<10} {m['load_s']:>9.1f} {m['rss_mb']:>9.0f} {m['throughput']:>9.1f} "
+              f"{m['p50_ms']:>9.2f} {m['p95_ms']:>9.2f} {recall:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
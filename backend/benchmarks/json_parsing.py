@@ -0,0 +1,117 @@
+"""Benchmark parsing LLM replies into JSON: single-pass extractor vs. the previous parser.
+
+The previous ``convert_json_output`` tried ``json.loads`` on the whole reply,
+then again after a regex escape fix over the whole text, then on a brace slice
+(twice), and ``extract_think_and_result`` ran two regex scans. The replies
+below are learning documents of growing size in the shapes LLMs return them:
+clean, fenced with a ``<think>`` block, with LaTeX escapes, and with prose
+after the JSON.
+
+Run from the backend directory:
+    python benchmarks/json_parsing.py
+"""
+
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils.llm_output import JsonExtractor, convert_json_output, extract_think_and_result
+
+REPEAT = 5
+SIZES = (2_000, 20_000, 200_000)
+
+
+def _legacy_fix_invalid_escapes(s):
+    return re.sub(r'\\(?!["\\/bfnrtu])', r'\\\\', s)
+
+
+def _legacy_convert_json_output(output):
+    output = output.strip()
+    if output.startswith("```json"):
+        output = output[7:].strip()
+    if output.endswith("```"):
+        output = output[:-3].strip()
+    try:
+        return json.loads(output)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(_legacy_fix_invalid_escapes(output))
+    except json.JSONDecodeError:
+        pass
+    start_idx, end_idx = output.find('{'), output.rfind('}') + 1
+    json_str = output[start_idx:end_idx]
+    try:
+        return json.loads(json_str)
+    except json.JSONDecodeError:
+        return json.loads(_legacy_fix_invalid_escapes(json_str))
+
+
+def _legacy_extract_think_and_result(info):
+    think_match = re.search(r"<think>(.*?)</think>", info, re.DOTALL)
+    think_content = think_match.group(1).strip() if think_match else ''
+    return think_content, re.sub(r"<think>.*?</think>", "", info, flags=re.DOTALL).strip()
+
+
+def _document(chars, latex):
+    paragraph = "Gradient descent updates each weight against the slope of the loss. "
+    if latex:
+        paragraph += r"The step is \theta \leftarrow \theta - \eta \nabla L. "
+    sections, size = [], 0
+    while size < chars:
+        body = paragraph * 8
+        sections.append({"title": f"Section {len(sections) + 1}", "content": body})
+        size += len(body)
+    return json.dumps({"title": "Doc", "sections": sections}).replace("\\\\", "\\")
+
+
+def _replies(chars):
+    clean = _document(chars, latex=False)
+    latex = _document(chars, latex=True)
+    return {
+        "clean": clean,
+        "fenced + think": "<think>" + "Let me plan the sections. " * 40 + "</think>\n```json\n" + clean + "\n```",
+        "latex escapes": latex,
+        "trailing prose": clean + "\n\nLet me know if you want {more} detail.",
+    }
+
+
+def _best_ms(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=REPEAT)) / number * 1e3
+
+
+def main():
+    print(f"{'reply':<16} {'chars':>8} {'previous (ms)':>14} {'single-pass (ms)':>17} {'speed-up':>9}")
+    for chars in SIZES:
+        number = max(1, 200_000 // chars)
+        for name, reply in _replies(chars).items():
+            legacy = lambda: _legacy_convert_json_output(_legacy_extract_think_and_result(reply)[1])
+            current = lambda: convert_json_output(extract_think_and_result(reply)[1])
+            current_ms = _best_ms(current, number)
+            try:
+                assert legacy() == current(), name
+            except json.JSONDecodeError:
+                print(f"{name:<16} {len(reply):>8} {'fails':>14} {current_ms:>17.3f} {'':>9}")
+                continue
+            legacy_ms = _best_ms(legacy, number)
+            print(f"{name:<16} {len(reply):>8} {legacy_ms:>14.3f} {current_ms:>17.3f} {legacy_ms / current_ms:>8.1f}x")
+
+    reply = _replies(SIZES[1])["fenced + think"]
+    chunks = [reply[i:i + 16] for i in range(0, len(reply), 16)]
+
+    def streamed():
+        extractor = JsonExtractor()
+        for chunk in chunks:
+            extractor.feed(chunk)
+        return extractor.close()
+
+    print(f"\nstreamed in {len(chunks)} chunks of 16 chars: {_best_ms(streamed, 20):.3f} ms "
+          f"(whole reply: {_best_ms(lambda: convert_json_output(reply), 20):.3f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark per-user profile lookups in the JSON store as the user base grows.
+
+Compares ``store.get_all_profiles_for_user`` (served from the per-user index)
+with the previous full scan over every profile key.
+
+Run from the backend directory:
+    python benchmarks/profile_lookup.py
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils import store
+
+USER_COUNTS = [100, 1_000, 10_000, 100_000]
+GOALS_PER_USER = 3
+LOOKUPS = 1_000
+
+
+def _scan_profiles_for_user(user_id):
+    """The pre-index implementation: prefix match against every key."""
+    prefix = f"{user_id}:"
+    result = {}
+    for key, profile in store._profiles.items():
+        if key.startswith(prefix):
+            gid = key[len(prefix):]
+            try:
+                result[int(gid)] = profile
+            except ValueError:
+                result[gid] = profile
+    return result
+
+
+def _load_users(data_dir: Path, n_users: int):
+    store._DATA_DIR = data_dir
+    store._PROFILES_PATH = data_dir / "profiles.json"
+    store._EVENTS_PATH = data_dir / "events.json"
+    store._EVENTS_LOG_PATH = data_dir / "events.log"
+    store._EVENTS_ARCHIVE_DIR = data_dir / "events_archive"
+    store._USER_STATES_PATH = data_dir / "user_states.json"
+    store._USER_STATE_VERSIONS_PATH = data_dir / "user_state_versions.json"
+    profiles = {
+        f"user{u}:{g}": {"learning_goal": f"goal {g}", "level": "beginner"}
+        for u in range(n_users)
+        for g in range(GOALS_PER_USER)
+    }
+    store._PROFILES_PATH.write_text(json.dumps(profiles), encoding="utf-8")
+    store.load()
+
+
+def _per_call_us(fn, user_ids, number):
+    it = iter(user_ids * number)
+    seconds = timeit.timeit(lambda: fn(next(it)), number=len(user_ids) * number)
+    return seconds / (len(user_ids) * number) * 1e6
+
+
+def main():
+    random.seed(0)
+    print(f"{'users':>8} {'indexed (us)':>14} {'scan (us)':>12}")
+    for n_users in USER_COUNTS:
+        with tempfile.TemporaryDirectory() as tmp:
+            _load_users(Path(tmp), n_users)
+            user_ids = [f"user{random.randrange(n_users)}" for _ in range(LOOKUPS)]
+            indexed = _per_call_us(store.get_all_profiles_for_user, user_ids, number=5)
+            # the scan is O(total profiles); a handful of calls is enough
+            scan = _per_call_us(_scan_profiles_for_user, user_ids[:20], number=1)
+            assert store.get_all_profiles_for_user(user_ids[0]) == _scan_profiles_for_user(user_ids[0])
+        print(f"{n_users:>8} {indexed:>14.2f} {scan:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
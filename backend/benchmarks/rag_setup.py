@@ -0,0 +1,58 @@
+"""Benchmark per-request retrieval setup: a new SearchRagManager vs. the shared one.
+
+Drafting endpoints used to call ``SearchRagManager.from_config`` per request,
+which loads the sentence-transformer, opens a Chroma client and counts its
+collection each time. ``base.resource_registry`` builds these once per
+process. Uses the embedder and search settings of the default config with a
+throwaway vectorstore directory; the embedding model is downloaded on first
+use if it is not cached.
+
+Run from the backend directory:
+    python benchmarks/rag_setup.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from base import resource_registry
+from base.search_rag import SearchRagManager
+from config.loader import default_config
+from utils.config import ensure_config_dict
+
+REQUESTS = 5
+
+
+def _per_request_ms(setup, requests=REQUESTS):
+    times = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        manager = setup()
+        manager.embedder.embed_query("warm-up query")
+        times.append((time.perf_counter() - start) * 1e3)
+    return times
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        config = ensure_config_dict(default_config)
+        config["vectorstore"] = {**config.get("vectorstore", {}), "persist_directory": directory}
+
+        rebuilt = _per_request_ms(lambda: SearchRagManager.from_config(config))
+        resource_registry.clear()
+        shared = _per_request_ms(lambda: resource_registry.get_search_rag_manager(config))
+
+        print(f"{'request':<10} {'from_config (ms)':>17} {'registry (ms)':>14}")
+        for i, (before, after) in enumerate(zip(rebuilt, shared), 1):
+            print(f"{i:<10} {before:>17.1f} {after:>14.1f}")
+        steady_before = sum(rebuilt[1:]) / (REQUESTS - 1)
+        steady_after = sum(shared[1:]) / (REQUESTS - 1)
+        print(f"after the first request: {steady_before:.1f} ms -> {steady_after:.1f} ms per request")
+        print(f"registry: {resource_registry.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Benchmark store snapshot encodings: size, encode (flush) and decode (load) time.
+
+Compares the previous ``json.dumps(indent=2)`` snapshots with the orjson and
+msgpack+zstd encoders in ``utils.serialization`` on synthetic user states
+shaped like the frontend's (cached markdown documents, tutor messages, goals).
+
+Run from the backend directory:
+    python benchmarks/snapshot_format.py
+"""
+
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils.serialization import decode_snapshot, encode_snapshot
+
+USERS = 500
+REPEAT = 5
+
+
+def _user_state(rng: random.Random):
+    words = ["learning", "python", "function", "variable", "loop", "class", "module", "test"]
+
+    def text(n):
+        return " ".join(rng.choice(words) for _ in range(n))
+
+    return {
+        "goals": [
+            {"id": g, "learning_goal": text(6), "learning_path": [{"session": s, "title": text(4)} for s in range(8)]}
+            for g in range(2)
+        ],
+        "tutor_messages": [{"role": rng.choice(["user", "assistant"]), "content": text(40)} for _ in range(30)],
+        "document_caches": {f"0-{s}-0": "# " + text(600) for s in range(6)},
+        "session_learning_times": {f"0-{s}": rng.random() * 3600 for s in range(8)},
+        "logged_in": True,
+    }
+
+
+def _time_ms(fn):
+    return min(timeit.repeat(fn, number=1, repeat=REPEAT)) * 1000
+
+
+def main():
+    rng = random.Random(0)
+    states = {f"user{u}": _user_state(rng) for u in range(USERS)}
+
+    legacy = json.dumps(states, ensure_ascii=False, indent=2).encode("utf-8")
+    rows = [(
+        "json (stdlib, indent=2)",
+        len(legacy),
+        _time_ms(lambda: json.dumps(states, ensure_ascii=False, indent=2).encode("utf-8")),
+        _time_ms(lambda: json.loads(legacy)),
+    )]
+    for fmt in ("json", "msgpack"):
+        data = encode_snapshot(states, fmt)
+        assert decode_snapshot(data) == states
+        rows.append((
+            "orjson" if fmt == "json" else "msgpack+zstd",
+            len(data),
+            _time_ms(lambda: encode_snapshot(states, fmt)),
+            _time_ms(lambda: decode_snapshot(data)),
+        ))
+
+    print(f"user_states snapshot for {USERS} users")
+    print(f"{'format':<24} {'size (KB)':>10} {'flush (ms)':>11} {'load (ms)':>10}")
+    for name, size, enc, dec in rows:
+        print(f"{name:<24} {size / 1024:>10.0f} {enc:>11.1f} {dec:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
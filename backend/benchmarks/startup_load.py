@@ -0,0 +1,105 @@
+"""Benchmark startup cost of the JSON store against the lazily loaded SQLite engine.
+
+The JSON backend parses every profile, event and UI-state snapshot in
+``store.load()``; the SQLite engine reads nothing up front and loads a user's
+rows on first access. For growing user counts this prints the JSON load time
+and peak memory, the SQLite open time, and the latency of a user's first
+(cold) and repeated (cached) read.
+
+Run from the backend directory:
+    python benchmarks/startup_load.py
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from utils import store
+from utils.sqlite_store import SQLiteStore
+
+USER_COUNTS = [100, 1_000, 10_000, 50_000]
+GOALS_PER_USER = 2
+EVENTS_PER_USER = 20
+LOOKUPS = 200
+
+
+def _dataset(n_users: int):
+    profiles = {
+        f"user{u}:{g}": {"learning_goal": f"goal {g}", "level": "beginner", "notes": "x" * 200}
+        for u in range(n_users)
+        for g in range(GOALS_PER_USER)
+    }
+    events = {
+        f"user{u}": [{"type": "click", "ts": f"2026-01-01T00:00:{e:02d}"} for e in range(EVENTS_PER_USER)]
+        for u in range(n_users)
+    }
+    user_states = {f"user{u}": {"goals": [{"id": 0}], "tutor_messages": ["hi"] * 10} for u in range(n_users)}
+    return profiles, events, user_states
+
+
+def _point_json_store(data_dir: Path):
+    store._DATA_DIR = data_dir
+    store._PROFILES_PATH = data_dir / "profiles.json"
+    store._EVENTS_PATH = data_dir / "events.json"
+    store._EVENTS_LOG_PATH = data_dir / "events.log"
+    store._EVENTS_ARCHIVE_DIR = data_dir / "events_archive"
+    store._USER_STATES_PATH = data_dir / "user_states.json"
+    store._USER_STATE_VERSIONS_PATH = data_dir / "user_state_versions.json"
+
+
+def _timed(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _read_user(engine, user_id):
+    engine.get_all_profiles_for_user(user_id)
+    engine.get_events(user_id)
+    engine.get_user_state(user_id)
+
+
+def main():
+    random.seed(0)
+    print(f"{'users':>7} {'json load (ms)':>15} {'json peak (MB)':>15} {'sqlite open (ms)':>17} "
+          f"{'cold read (us)':>15} {'cached read (us)':>17}")
+    for n_users in USER_COUNTS:
+        profiles, events, user_states = _dataset(n_users)
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = Path(tmp)
+            _point_json_store(data_dir)
+            store._PROFILES_PATH.write_text(json.dumps(profiles), encoding="utf-8")
+            store._EVENTS_PATH.write_text(json.dumps(events), encoding="utf-8")
+            store._USER_STATES_PATH.write_text(json.dumps(user_states), encoding="utf-8")
+            _, json_load, json_peak = _timed(store.load)
+
+            db_path = data_dir / "genmentor.db"
+            SQLiteStore(db_path).import_records(profiles, events, user_states, {})
+            engine, sqlite_open, _ = _timed(lambda: SQLiteStore(db_path, cache_users=LOOKUPS))
+
+            user_ids = random.sample(range(n_users), min(LOOKUPS, n_users))
+            start = time.perf_counter()
+            for u in user_ids:
+                _read_user(engine, f"user{u}")
+            cold = (time.perf_counter() - start) / len(user_ids)
+            start = time.perf_counter()
+            for u in user_ids:
+                _read_user(engine, f"user{u}")
+            cached = (time.perf_counter() - start) / len(user_ids)
+        print(f"{n_users:>7} {json_load * 1e3:>15.1f} {json_peak / 2**20:>15.1f} {sqlite_open * 1e3:>17.2f} "
+              f"{cold * 1e6:>15.1f} {cached * 1e6:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 @dataclass
@@ -10,12 +10,20 @@ class LLMConfig:
     provider: str = "openai"  # e.g., openai, azure-openai, ollama, anthropic, groq
     model_name: str = "gpt-4o"
     base_url: Optional[str] = None
+    pool_size: int = 16  # pooled chat clients kept across requests (LRU)
+    pool_idle_seconds: float = 3600  # drop pooled clients unused for this long
+    structured_output: bool = True  # request schema-bound output from models with tool calling
 
 
 @dataclass
 class EmbeddingConfig:
-    provider: str = "huggingface"
+    provider: str = "huggingface"  # huggingface (torch) | onnx (onnxruntime, CPU) | openai | azure | together
     model_name: str = "sentence-transformers/all-mpnet-base-v2"
+    # onnx provider only
+    quantize: bool = True  # int8 export of the model instead of onnx/model.onnx
+    threads: int = 0  # onnxruntime intra-op threads; 0 = one per core
+    batch_size: int = 32
+    onnx_file: Optional[str] = None  # another .onnx file in the model repo or directory
 
 
 @dataclass
@@ -37,6 +45,54 @@ class RAGConfig:
     max_workers: int = 3
 
 
+@dataclass
+class StorageConfig:
+    backend: str = "json"  # json (loaded whole at startup) | sqlite (lazy per-user loading)
+    sqlite_path: str = "data/genmentor.db"  # relative to backend/
+    durability: str = "immediate"  # immediate | grouped (JSON backend, single worker only)
+    flush_interval_ms: int = 200
+    flush_max_pending: int = 100
+    snapshot_format: str = "json"  # json | msgpack (zstd-compressed)
+    # sqlite only (rejected with json): recently active users kept decoded in memory,
+    # 1000 when unset, 0 disables
+    cache_users: Optional[int] = None
+
+
+@dataclass
+class LLMCacheConfig:
+    path: str = "data/llm_cache.db"  # relative to backend/
+    ttl_seconds: Optional[float] = 604800  # 7 days; null keeps entries until evicted
+    max_entries: int = 10000
+    max_bytes: int = 268435456  # 256 MiB
+    agents: List[str] = field(default_factory=list)  # agent names (e.g. SkillRequirementMapper) whose responses are cached
+
+
+@dataclass
+class TutorCacheConfig:
+    enabled: bool = True
+    similarity_threshold: float = 0.92  # cosine similarity needed to reuse an answer
+    max_entries: int = 2000
+    ttl_seconds: Optional[float] = 86400
+
+
+@dataclass
+class EmbeddingCacheConfig:
+    enabled: bool = True
+    path: str = "data/embedding_cache.db"  # relative to backend/
+    max_entries: int = 200000
+    max_bytes: int = 536870912  # 512 MiB, least recently used vectors evicted first
+
+
+@dataclass
+class SearchCacheConfig:
+    enabled: bool = True
+    path: str = "data/search_cache.db"  # relative to backend/
+    ttl_seconds: Optional[float] = 86400  # null keeps results until evicted
+    provider_ttl_seconds: Dict[str, float] = field(default_factory=dict)  # per-provider override of ttl_seconds
+    max_entries: int = 5000
+    max_bytes: int = 268435456  # 256 MiB, least recently used results evicted first
+
+
 @dataclass
 class AppConfig:
     environment: str = "dev"  # dev | staging | prod
@@ -44,6 +100,12 @@ class AppConfig:
     log_level: str = "INFO"
 
     llm: LLMConfig = field(default_factory=LLMConfig)
+    embedding: EmbeddingConfig = field(default_factory=EmbeddingConfig)
     search: SearchConfig = field(default_factory=SearchConfig)
     vectorstore: VectorstoreConfig = field(default_factory=VectorstoreConfig)
     rag: RAGConfig = field(default_factory=RAGConfig)
+    storage: StorageConfig = field(default_factory=StorageConfig)
+    llm_cache: LLMCacheConfig = field(default_factory=LLMCacheConfig)
+    tutor_cache: TutorCacheConfig = field(default_factory=TutorCacheConfig)
+    embedding_cache: EmbeddingCacheConfig = field(default_factory=EmbeddingCacheConfig)
+    search_cache: SearchCacheConfig = field(default_factory=SearchCacheConfig)
@@ -18,23 +18,32 @@ from io import BytesIO
 import pdfplumber
 from base.llm_factory import LLMFactory
 from base.searcher_factory import SearchRunner
-from base.search_rag import SearchRagManager
-from fastapi.responses import JSONResponse
+from base.semantic_cache import SemanticCache
+from base import BaseAgent, CachedEmbeddings, agent_registry, agent_stats, resource_registry, response_cache
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from modules.skill_gap_identification import *
 from modules.adaptive_learner_modeling import *
 from modules.personalized_resource_delivery import *
-from modules.personalized_resource_delivery.agents.learning_path_scheduler import refine_learning_path_with_llm
-from modules.ai_chatbot_tutor import chat_with_tutor_with_llm
+from modules.personalized_resource_delivery.agents.learning_path_scheduler import arefine_learning_path_with_llm
+from modules.ai_chatbot_tutor import achat_with_tutor_with_llm, astream_chat_with_tutor_with_llm
 from api_schemas import *
 from config import load_config
 from utils import store
 from utils import auth_store, auth_jwt
+from utils import async_store
+from utils.serialization import encode_record
+from utils.state_patch import StateVersionConflict
 
 
 app_config = load_config(config_name="main")
-search_rag_manager = SearchRagManager.from_config(app_config)
-
-app = FastAPI()
+LLMFactory.configure_pool(app_config)
+BaseAgent.configure_structured_output(app_config)
+response_cache.configure(app_config)
+# one embedder, vectorstore client and search runner for every request in this process
+search_rag_manager = resource_registry.get_search_rag_manager(app_config)
+tutor_answer_cache = SemanticCache.from_config(app_config, search_rag_manager.embedder, section="tutor_cache")
+
+app = FastAPI(default_response_class=ORJSONResponse)
 from pydantic import BaseModel
 from typing import Any, Dict, List, Optional
 from datetime import datetime
@@ -42,9 +51,18 @@ from datetime import datetime
 
 @app.on_event("startup")
 def _load_stores():
+    store.configure(app_config)
+    auth_store.configure(app_config)
     store.load()
     auth_store.load()
 
+
+@app.on_event("shutdown")
+def _flush_stores():
+    async_store.shutdown()
+    store.close()
+    store.compact_events()
+
 class BehaviorEvent(BaseModel):
     user_id: str
     event_type: str
@@ -55,8 +73,8 @@ class BehaviorEvent(BaseModel):
 async def log_event(evt: BehaviorEvent):
     e = evt.dict() if hasattr(evt, "dict") else evt.model_dump()
     e["ts"] = e["ts"] or datetime.utcnow().isoformat()
-    store.append_event(evt.user_id, e)
-    return {"ok": True, "event_count": len(store.get_events(evt.user_id))}
+    await async_store.append_event(evt.user_id, e)
+    return {"ok": True, "event_count": len(await async_store.get_events(evt.user_id))}
 
 class AutoProfileUpdateRequest(BaseModel):
     user_id: str
@@ -88,7 +106,7 @@ async def auto_update_profile(request: AutoProfileUpdateRequest):
         goal_id = request.goal_id
 
         # grab recent events for this user (can be empty)
-        interactions = store.get_events(user_id)
+        interactions = await async_store.get_events(user_id)
 
         # Normalize optional structured fields (match style used in /create-learner-profile-with-info)
         learner_info = request.learner_information
@@ -106,21 +124,21 @@ async def auto_update_profile(request: AutoProfileUpdateRequest):
                 skill_gaps = {"raw": skill_gaps}
 
         # CASE A: first-time user => create profile
-        if store.get_profile(user_id, goal_id) is None:
+        if await async_store.get_profile(user_id, goal_id) is None:
             if not (request.learning_goal and learner_info is not None and skill_gaps is not None):
                 raise HTTPException(
                     status_code=400,
                     detail="No profile found for this user_id. Provide learning_goal, learner_information, and skill_gaps to initialize."
                 )
 
-            profile = initialize_learner_profile_with_llm(
+            profile = await ainitialize_learner_profile_with_llm(
                 llm,
                 request.learning_goal,
                 learner_info,
                 skill_gaps,
             )
 
-            store.upsert_profile(user_id, goal_id, profile)
+            await async_store.upsert_profile(user_id, goal_id, profile)
             return {
                 "ok": True,
                 "mode": "initialized",
@@ -131,7 +149,7 @@ async def auto_update_profile(request: AutoProfileUpdateRequest):
             }
 
         # CASE B: existing user => update profile from events
-        current_profile = store.get_profile(user_id, goal_id)
+        current_profile = await async_store.get_profile(user_id, goal_id)
 
         session_info = request.session_information or {}
         session_info = {
@@ -141,7 +159,7 @@ async def auto_update_profile(request: AutoProfileUpdateRequest):
             "source": "EVENT_STORE",
         }
 
-        updated_profile = update_learner_profile_with_llm(
+        updated_profile = await aupdate_learner_profile_with_llm(
             llm,
             current_profile,
             interactions,
@@ -149,7 +167,7 @@ async def auto_update_profile(request: AutoProfileUpdateRequest):
             session_info,
         )
 
-        store.upsert_profile(user_id, goal_id, updated_profile)
+        await async_store.upsert_profile(user_id, goal_id, updated_profile)
 
         return {
             "ok": True,
@@ -170,37 +188,66 @@ async def auto_update_profile(request: AutoProfileUpdateRequest):
 @app.get("/profile/{user_id}")
 async def get_profile(user_id: str, goal_id: Optional[int] = None):
     if goal_id is not None:
-        profile = store.get_profile(user_id, goal_id)
+        profile = await async_store.get_profile(user_id, goal_id)
         if not profile:
             raise HTTPException(status_code=404, detail="No profile found for this user_id and goal_id")
         return {"user_id": user_id, "goal_id": goal_id, "learner_profile": profile}
-    profiles = store.get_all_profiles_for_user(user_id)
+    profiles = await async_store.get_all_profiles_for_user(user_id)
     if not profiles:
         raise HTTPException(status_code=404, detail="No profile found for this user_id")
     return {"user_id": user_id, "profiles": profiles}
 
 @app.get("/events/{user_id}")
 async def get_events(user_id: str):
-    return {"user_id": user_id, "events": store.get_events(user_id)}
+    return {"user_id": user_id, "events": await async_store.get_events(user_id)}
+
+
+@app.get("/events/{user_id}/history")
+def get_event_history(
+    user_id: str,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    event_type: Optional[str] = None,
+):
+    """Stream the user's full event history (archived + recent) as NDJSON, filtered by time and type."""
+    events = store.query_events(user_id, start, end, event_type)
+    # the generator reads the archive lazily; Starlette iterates it in a worker thread
+    return StreamingResponse(
+        (encode_record(event) + b"\n" for event in events),
+        media_type="application/x-ndjson",
+    )
 
 
 @app.get("/user-state/{user_id}")
 async def get_user_state(user_id: str):
-    state = store.get_user_state(user_id)
+    state = await async_store.get_user_state(user_id)
     if state is None:
         raise HTTPException(status_code=404, detail="No state found for this user_id")
-    return {"state": state}
+    return {"state": state, "version": await async_store.get_user_state_version(user_id)}
 
 
 @app.put("/user-state/{user_id}")
 async def put_user_state(user_id: str, body: UserStateRequest):
-    store.put_user_state(user_id, body.state)
-    return {"ok": True}
+    version = await async_store.put_user_state(user_id, body.state)
+    return {"ok": True, "version": version}
+
+
+@app.patch("/user-state/{user_id}")
+async def patch_user_state(user_id: str, body: UserStatePatchRequest):
+    """Merge changed top-level keys into the stored state (optimistic concurrency on ``version``)."""
+    try:
+        version = await async_store.patch_user_state(user_id, body.set, body.unset, body.version)
+    except StateVersionConflict as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "User state was modified concurrently", "version": e.current_version},
+        )
+    return {"ok": True, "version": version}
 
 
 @app.delete("/user-state/{user_id}")
 async def delete_user_state(user_id: str):
-    store.delete_user_state(user_id)
+    await async_store.delete_user_state(user_id)
     return {"ok": True}
 
 
@@ -220,7 +267,7 @@ async def auth_register(request: AuthRegisterRequest):
     if len(request.password) < 6:
         raise HTTPException(status_code=400, detail="Password must be at least 6 characters")
     try:
-        auth_store.create_user(request.username, request.password)
+        await async_store.create_user(request.username, request.password)
     except ValueError:
         raise HTTPException(status_code=409, detail="Username already exists")
     token = auth_jwt.create_token(request.username)
@@ -229,7 +276,7 @@ async def auth_register(request: AuthRegisterRequest):
 
 @app.post("/auth/login")
 async def auth_login(request: AuthLoginRequest):
-    if not auth_store.verify_password(request.username, request.password):
+    if not await async_store.verify_password(request.username, request.password):
         raise HTTPException(status_code=401, detail="Invalid username or password")
     token = auth_jwt.create_token(request.username)
     return {"token": token, "username": request.username}
@@ -250,16 +297,16 @@ async def auth_delete_user(authorization: str = Header("")):
     username = auth_jwt.verify_token(token)
     if not username:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
-    if not auth_store.delete_user(username):
+    if not await async_store.delete_user(username):
         raise HTTPException(status_code=404, detail="User not found")
-    store.delete_all_user_data(username)
+    await async_store.delete_all_user_data(username)
     return {"ok": True}
 
 
 def get_llm(model_provider: str | None = None, model_name: str | None = None, **kwargs):
     model_provider = model_provider or app_config.llm.provider
     model_name = model_name or app_config.llm.model_name
-    return LLMFactory.create(model=model_name, model_provider=model_provider, **kwargs)
+    return LLMFactory.get(model=model_name, model_provider=model_provider, **kwargs)
 
 @app.post("/extract-pdf-text")
 async def extract_pdf_text(file: UploadFile = File(...)):
@@ -284,6 +331,23 @@ async def list_llm_models():
     except Exception as e:
         return JSONResponse(status_code=500, content={"detail": str(e)})
 
+def embedding_cache_stats() -> Optional[Dict[str, float]]:
+    embedder = search_rag_manager.embedder
+    return embedder.stats() if isinstance(embedder, CachedEmbeddings) else None
+
+@app.get("/agent-stats")
+async def get_agent_stats():
+    """How agent calls were answered (structured output, fallbacks, retries) plus cache and pool counters."""
+    return {
+        "agents": agent_stats.stats(),
+        "response_cache": response_cache.stats(),
+        "agent_registry": agent_registry.stats(),
+        "llm_pool": LLMFactory.pool_stats(),
+        "resources": resource_registry.stats(),
+        "embedding_cache": embedding_cache_stats(),
+        "search_cache": search_rag_manager.search_runner.stats() if search_rag_manager.search_runner else None,
+    }
+
 @app.post("/chat-with-tutor")
 async def chat_with_autor(request: ChatWithAutorRequest):
     llm = get_llm(request.model_provider, request.model_name)
@@ -293,22 +357,68 @@ async def chat_with_autor(request: ChatWithAutorRequest):
             converted_messages = ast.literal_eval(request.messages)
         else:
             return JSONResponse(status_code=400, content={"detail": "messages must be a JSON array string"})
-        response = chat_with_tutor_with_llm(
+        response = await achat_with_tutor_with_llm(
             llm,
             converted_messages,
             learner_profile,
             search_rag_manager=search_rag_manager,
             use_search=True,
+            answer_cache=tutor_answer_cache,
+            use_cache=request.use_cache,
         )
         return {"response": response}
     except Exception as e:
         return JSONResponse(status_code=500, content={"detail": str(e)})
 
+def _sse_event(event: str, data: Any) -> bytes:
+    """One Server-Sent Events frame with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+@app.post("/chat-with-tutor/stream")
+async def chat_with_autor_stream(request: ChatWithAutorRequest):
+    """Stream the tutor's reply as Server-Sent Events.
+
+    Emits ``token`` events (``{"text": chunk}``) while the model generates,
+    then one ``done`` event with the full ``response``, or an ``error`` event.
+    """
+    llm = get_llm(request.model_provider, request.model_name)
+    if not (isinstance(request.messages, str) and request.messages.strip().startswith("[")):
+        return JSONResponse(status_code=400, content={"detail": "messages must be a JSON array string"})
+    try:
+        converted_messages = ast.literal_eval(request.messages)
+    except Exception as e:
+        return JSONResponse(status_code=400, content={"detail": str(e)})
+
+    async def events():
+        chunks = []
+        try:
+            async for chunk in astream_chat_with_tutor_with_llm(
+                llm,
+                converted_messages,
+                request.learner_profile,
+                search_rag_manager=search_rag_manager,
+                use_search=True,
+                answer_cache=tutor_answer_cache,
+                use_cache=request.use_cache,
+            ):
+                chunks.append(chunk)
+                yield _sse_event("token", {"text": chunk})
+            yield _sse_event("done", {"response": "".join(chunks)})
+        except Exception as e:
+            yield _sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.post("/refine-learning-goal")
 async def refine_learning_goal(request: LearningGoalRefinementRequest):
     llm = get_llm(request.model_provider, request.model_name)
     try:
-        refined_learning_goal = refine_learning_goal_with_llm(llm, request.learning_goal, request.learner_information)
+        refined_learning_goal = await arefine_learning_goal_with_llm(llm, request.learning_goal, request.learner_information)
         return refined_learning_goal
     except Exception as e:
         return JSONResponse(status_code=500, content={"detail": str(e)})
@@ -324,7 +434,7 @@ async def identify_skill_gap_with_info(request: SkillGapIdentificationRequest):
             skill_requirements = ast.literal_eval(skill_requirements)
         if not isinstance(skill_requirements, dict):
             skill_requirements = None
-        skill_gaps, skill_requirements = identify_skill_gap_with_llm(
+        skill_gaps, skill_requirements = await aidentify_skill_gap_with_llm(
             llm, learning_goal, learner_information, skill_requirements
         )
         results = {**skill_gaps, **skill_requirements}
@@ -350,11 +460,11 @@ async def create_learner_profile_with_info(request: LearnerProfileInitialization
                 skill_gaps = ast.literal_eval(skill_gaps)
             except Exception:
                 skill_gaps = {"raw": skill_gaps}
-        learner_profile = initialize_learner_profile_with_llm(
+        learner_profile = await ainitialize_learner_profile_with_llm(
             llm, learning_goal, learner_information, skill_gaps
         )
         if request.user_id is not None and request.goal_id is not None:
-            store.upsert_profile(request.user_id, request.goal_id, learner_profile)
+            await async_store.upsert_profile(request.user_id, request.goal_id, learner_profile)
         return {"learner_profile": learner_profile}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -375,7 +485,7 @@ async def update_learner_profile(request: LearnerProfileUpdateRequest):
                 except Exception:
                     if name != "session_information":
                         locals()[name] = {"raw": val}
-        learner_profile = update_learner_profile_with_llm(
+        learner_profile = await aupdate_learner_profile_with_llm(
             llm,
             locals()["learner_profile"],
             locals()["learner_interactions"],
@@ -383,7 +493,7 @@ async def update_learner_profile(request: LearnerProfileUpdateRequest):
             locals()["session_information"],
         )
         if request.user_id is not None and request.goal_id is not None:
-            store.upsert_profile(request.user_id, request.goal_id, learner_profile)
+            await async_store.upsert_profile(request.user_id, request.goal_id, learner_profile)
         return {"learner_profile": learner_profile}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -398,7 +508,7 @@ async def schedule_learning_path(request: LearningPathSchedulingRequest):
             learner_profile = ast.literal_eval(learner_profile)
         if not isinstance(learner_profile, dict):
             learner_profile = {}
-        learning_path = schedule_learning_path_with_llm(llm, learner_profile, session_count)
+        learning_path = await aschedule_learning_path_with_llm(llm, learner_profile, session_count)
         return learning_path
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -422,7 +532,7 @@ async def reschedule_learning_path(request: LearningPathReschedulingRequest):
                 other_feedback = ast.literal_eval(other_feedback)
             except Exception:
                 pass
-        learning_path = reschedule_learning_path_with_llm(
+        learning_path = await areschedule_learning_path_with_llm(
             llm, learning_path, learner_profile, session_count, other_feedback
         )
         return learning_path
@@ -442,7 +552,7 @@ async def explore_knowledge_points(request: KnowledgePointExplorationRequest):
     if isinstance(learning_session, str) and learning_session.strip():
         learning_session = ast.literal_eval(learning_session)
     try:
-        knowledge_points = explore_knowledge_points_with_llm(llm, learner_profile, learning_path, learning_session)
+        knowledge_points = await aexplore_knowledge_points_with_llm(llm, learner_profile, learning_path, learning_session)
         return knowledge_points
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -457,7 +567,10 @@ async def draft_knowledge_point(request: KnowledgePointDraftingRequest):
     knowledge_point = request.knowledge_point
     use_search = request.use_search
     try:
-        knowledge_draft = draft_knowledge_point_with_llm(llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_point, use_search)
+        knowledge_draft = await adraft_knowledge_point_with_llm(
+            llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_point, use_search,
+            search_rag_manager=search_rag_manager,
+        )
         return {"knowledge_draft": knowledge_draft}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -472,7 +585,10 @@ async def draft_knowledge_points(request: KnowledgePointsDraftingRequest):
     use_search = request.use_search
     allow_parallel = request.allow_parallel
     try:
-        knowledge_drafts = draft_knowledge_points_with_llm(llm, learner_profile, learning_path, learning_session, knowledge_points, allow_parallel, use_search)
+        knowledge_drafts = await adraft_knowledge_points_with_llm(
+            llm, learner_profile, learning_path, learning_session, knowledge_points, allow_parallel, use_search,
+            search_rag_manager=search_rag_manager,
+        )
         return {"knowledge_drafts": knowledge_drafts}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -487,7 +603,7 @@ async def integrate_learning_document(request: LearningDocumentIntegrationReques
     knowledge_drafts = request.knowledge_drafts
     output_markdown = request.output_markdown
     try:
-        learning_document = integrate_learning_document_with_llm(llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts, output_markdown)
+        learning_document = await aintegrate_learning_document_with_llm(llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts, output_markdown)
         return {"learning_document": learning_document}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -502,7 +618,7 @@ async def generate_document_quizzes(request: KnowledgeQuizGenerationRequest):
     true_false_count = request.true_false_count
     short_answer_count = request.short_answer_count
     try:
-        document_quiz = generate_document_quizzes_with_llm(llm, learner_profile, learning_document, single_choice_count, multiple_choice_count, true_false_count, short_answer_count)
+        document_quiz = await agenerate_document_quizzes_with_llm(llm, learner_profile, learning_document, single_choice_count, multiple_choice_count, true_false_count, short_answer_count)
         return {"document_quiz": document_quiz}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -517,13 +633,60 @@ async def tailor_knowledge_content(request: TailoredContentGenerationRequest):
     allow_parallel = request.allow_parallel
     with_quiz = request.with_quiz
     try:
-        tailored_content = create_learning_content_with_llm(
-            llm, learner_profile, learning_path, learning_session, allow_parallel=allow_parallel, with_quiz=with_quiz, use_search=use_search
+        tailored_content = await acreate_learning_content_with_llm(
+            llm, learner_profile, learning_path, learning_session, allow_parallel=allow_parallel, with_quiz=with_quiz, use_search=use_search,
+            search_rag_manager=search_rag_manager,
         )
         return {"tailored_content": tailored_content}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/tailor-knowledge-content/stream")
+async def tailor_knowledge_content_stream(request: LearningContentStreamRequest):
+    """Run the content pipeline and stream each stage's output as Server-Sent Events.
+
+    Events: ``knowledge_points``, one ``draft`` per knowledge point as soon as it
+    is written, ``document``, ``quizzes``, then ``done`` with the full
+    ``tailored_content`` (or ``error``).
+    """
+    llm = get_llm(request.model_provider, request.model_name)
+
+    async def events():
+        try:
+            async for event, data in astream_learning_content_with_llm(
+                llm,
+                request.learner_profile,
+                request.learning_path,
+                request.learning_session,
+                allow_parallel=request.allow_parallel,
+                with_quiz=request.with_quiz,
+                use_search=request.use_search,
+                output_markdown=request.output_markdown,
+                method_name=request.method_name,
+                search_rag_manager=search_rag_manager,
+                single_choice_count=request.single_choice_count,
+                multiple_choice_count=request.multiple_choice_count,
+                true_false_count=request.true_false_count,
+                short_answer_count=request.short_answer_count,
+            ):
+                if event == "knowledge_points":
+                    data = {"knowledge_points": data}
+                elif event == "document":
+                    data = {"learning_document": data}
+                elif event == "quizzes":
+                    data = {"document_quiz": data}
+                elif event == "done":
+                    data = {"tailored_content": data}
+                yield _sse_event(event, data)
+        except Exception as e:
+            yield _sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 @app.post("/simulate-path-feedback")
 async def simulate_path_feedback(request: LearningPathFeedbackRequest):
     llm = get_llm(request.model_provider, request.model_name)
@@ -534,7 +697,7 @@ async def simulate_path_feedback(request: LearningPathFeedbackRequest):
             learner_profile = ast.literal_eval(learner_profile)
         if isinstance(learning_path, str) and learning_path.strip():
             learning_path = ast.literal_eval(learning_path)
-        feedback = simulate_path_feedback_with_llm(llm, learner_profile, learning_path)
+        feedback = await asimulate_path_feedback_with_llm(llm, learner_profile, learning_path)
         return {"feedback": feedback}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -549,7 +712,7 @@ async def simulate_content_feedback(request: LearningContentFeedbackRequest):
             learner_profile = ast.literal_eval(learner_profile)
         if isinstance(learning_content, str) and learning_content.strip():
             learning_content = ast.literal_eval(learning_content)
-        feedback = simulate_content_feedback_with_llm(llm, learner_profile, learning_content)
+        feedback = await asimulate_content_feedback_with_llm(llm, learner_profile, learning_content)
         return {"feedback": feedback}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -564,7 +727,7 @@ async def refine_learning_path(request: LearningPathRefinementRequest):
             learning_path = ast.literal_eval(learning_path)
         if isinstance(feedback, str) and feedback.strip():
             feedback = ast.literal_eval(feedback)
-        refined_path = refine_learning_path_with_llm(llm, learning_path, feedback)
+        refined_path = await arefine_learning_path_with_llm(llm, learning_path, feedback)
         return {"refined_learning_path": refined_path}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -586,13 +749,13 @@ async def iterative_refine_path(request: IterativeRefinementRequest):
 
         for i in range(max_iterations):
             # Simulate feedback for current path
-            feedback = simulate_path_feedback_with_llm(llm, learner_profile, current_path)
+            feedback = await asimulate_path_feedback_with_llm(llm, learner_profile, current_path)
             iterations.append({
                 "iteration": i + 1,
                 "feedback": feedback
             })
             # Refine path based on feedback
-            refined_result = refine_learning_path_with_llm(llm, current_path, feedback)
+            refined_result = await arefine_learning_path_with_llm(llm, current_path, feedback)
             current_path = refined_result.get("learning_path", current_path)
 
         return {
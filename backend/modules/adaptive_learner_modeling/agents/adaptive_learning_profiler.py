@@ -47,36 +47,74 @@ class AdaptiveLearnerProfiler(BaseAgent):
             jsonalize_output=True,
         )
 
+    def _initialization_request(self, input_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """``invoke`` arguments of :meth:`initialize_profile` and :meth:`ainitialize_profile`."""
+        return {
+            "input_dict": LearnerProfileInitializationPayload(**input_dict).model_dump(),
+            "task_prompt": adaptive_learner_profiler_task_prompt_initialization,
+            "output_schema": LearnerProfile,
+        }
+
+    def _update_request(self, input_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """``invoke`` arguments of :meth:`update_profile` and :meth:`aupdate_profile`."""
+        return {
+            "input_dict": LearnerProfileUpdatePayload(**input_dict).model_dump(),
+            "task_prompt": adaptive_learner_profiler_task_prompt_update,
+            "output_schema": LearnerProfile,
+        }
+
     def initialize_profile(self, input_dict: Dict[str, Any]) -> Dict[str, Any]:
         """Generate an initial learner profile using the provided onboarding information."""
-        task_prompt = adaptive_learner_profiler_task_prompt_initialization
-        payload_dict = LearnerProfileInitializationPayload(**input_dict).model_dump()
-        raw_output = self.invoke(payload_dict, task_prompt=task_prompt)
-        validated_output = LearnerProfile.model_validate(raw_output)
-        return validated_output.model_dump()
+        return self.run_task(self._initialization_request(input_dict))
 
     def update_profile(self, input_dict: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing learner profile with fresh interaction data."""
-        task_prompt = adaptive_learner_profiler_task_prompt_update
-        payload_dict = LearnerProfileUpdatePayload(**input_dict).model_dump()
-        raw_output = self.invoke(payload_dict, task_prompt=task_prompt)
-        validated_output = LearnerProfile.model_validate(raw_output)
-        return validated_output.model_dump()
+        return self.run_task(self._update_request(input_dict))
 
+    async def ainitialize_profile(self, input_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of :meth:`initialize_profile`."""
+        return await self.arun_task(self._initialization_request(input_dict))
 
-def initialize_learner_profile_with_llm(
-    llm: Any,
+    async def aupdate_profile(self, input_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of :meth:`update_profile`."""
+        return await self.arun_task(self._update_request(input_dict))
+
+
+def _initialization_payload(
     learning_goal: str,
     learner_information: Union[str, Mapping[str, Any]],
     skill_gaps: Union[str, Mapping[str, Any], List[Any]],
 ) -> Dict[str, Any]:
-    """Public helper for generating a learner profile with minimal boilerplate."""
-    learner_profiler = AdaptiveLearnerProfiler(llm)
-    payload_dict = {
+    return {
         "learning_goal": learning_goal,
         "learner_information": learner_information,
         "skill_gaps": skill_gaps,
     }
+
+
+def _update_payload(
+    learner_profile: Union[str, Mapping[str, Any]],
+    learner_interactions: Union[str, Mapping[str, Any]],
+    learner_information: Union[str, Mapping[str, Any]],
+    session_information: Optional[Union[str, Mapping[str, Any]]],
+) -> Dict[str, Any]:
+    return {
+        "learner_profile": learner_profile,
+        "learner_interactions": learner_interactions,
+        "learner_information": learner_information,
+        "session_information": session_information,
+    }
+
+
+def initialize_learner_profile_with_llm(
+    llm: Any,
+    learning_goal: str,
+    learner_information: Union[str, Mapping[str, Any]],
+    skill_gaps: Union[str, Mapping[str, Any], List[Any]],
+) -> Dict[str, Any]:
+    """Public helper for generating a learner profile with minimal boilerplate."""
+    learner_profiler = AdaptiveLearnerProfiler(llm)
+    payload_dict = _initialization_payload(learning_goal, learner_information, skill_gaps)
     learner_profile = learner_profiler.initialize_profile(payload_dict)
     return learner_profile
 
@@ -91,14 +129,34 @@ def update_learner_profile_with_llm(
     """Public helper for updating an existing learner profile via the LLM backend."""
 
     learner_profiler = AdaptiveLearnerProfiler(llm)
-    payload_dict = {
-        "learner_profile": learner_profile,
-        "learner_interactions": learner_interactions,
-        "learner_information": learner_information,
-        "session_information": session_information,
-    }
+    payload_dict = _update_payload(learner_profile, learner_interactions, learner_information, session_information)
     return learner_profiler.update_profile(payload_dict)
 
+
+async def ainitialize_learner_profile_with_llm(
+    llm: Any,
+    learning_goal: str,
+    learner_information: Union[str, Mapping[str, Any]],
+    skill_gaps: Union[str, Mapping[str, Any], List[Any]],
+) -> Dict[str, Any]:
+    """Async counterpart of :func:`initialize_learner_profile_with_llm`."""
+    learner_profiler = AdaptiveLearnerProfiler(llm)
+    payload_dict = _initialization_payload(learning_goal, learner_information, skill_gaps)
+    return await learner_profiler.ainitialize_profile(payload_dict)
+
+
+async def aupdate_learner_profile_with_llm(
+    llm: Any,
+    learner_profile: Union[str, Mapping[str, Any]],
+    learner_interactions: Union[str, Mapping[str, Any]],
+    learner_information: Union[str, Mapping[str, Any]],
+    session_information: Optional[Union[str, Mapping[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Async counterpart of :func:`update_learner_profile_with_llm`."""
+    learner_profiler = AdaptiveLearnerProfiler(llm)
+    payload_dict = _update_payload(learner_profile, learner_interactions, learner_information, session_information)
+    return await learner_profiler.aupdate_profile(payload_dict)
+
 if __name__ == "__main__":
     from base.llm_factory import LLMFactory
 
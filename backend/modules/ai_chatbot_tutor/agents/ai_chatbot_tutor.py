@@ -1,17 +1,23 @@
 from __future__ import annotations
 
 import ast
-from typing import Any, List, Mapping, Optional, Sequence
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, List, Mapping, Optional, Sequence, Tuple
 
 from pydantic import BaseModel, field_validator
 
 from base import BaseAgent
 from base.search_rag import SearchRagManager, format_docs
+from base.semantic_cache import SemanticCache
 from modules.ai_chatbot_tutor.prompts.ai_chatbot_tutor import (
 	ai_tutor_chatbot_system_prompt,
 	ai_tutor_chatbot_task_prompt,
 )
 
+logger = logging.getLogger(__name__)
+
 
 def _stringify_history(messages: Any) -> str:
 	if messages is None or len(messages) == 0:
@@ -53,10 +59,70 @@ def _last_user_query(messages: Any) -> str:
 	return ""
 
 
+def _last_assistant_turn(messages: Any, limit: int = 500) -> str:
+	"""Tail of the latest assistant message, used as conversational context for the answer cache."""
+	if isinstance(messages, str):
+		try:
+			messages = ast.literal_eval(messages)
+		except Exception:
+			return ""
+	for m in reversed(list(messages or [])):
+		if isinstance(m, Mapping) and str(m.get("role", "")).lower() == "assistant":
+			return str(m.get("content", "")).strip()[-limit:]
+	return ""
+
+
+def _profile_bucket(learner_profile: Any) -> Tuple:
+	"""Coarse learner key: cached answers are only shared between similar learners.
+
+	Learners match on learning goal, progress quartile and the content style
+	and activity type derived from their learning preferences.
+	"""
+	profile = learner_profile
+	if isinstance(profile, str):
+		text = profile.strip()
+		if not text:
+			return ("",)
+		try:
+			profile = json.loads(text)
+		except ValueError:
+			try:
+				profile = ast.literal_eval(text)
+			except Exception:
+				return ("raw", text)
+	if not isinstance(profile, Mapping):
+		return ("raw", str(profile))
+	cognitive = profile.get("cognitive_status") or {}
+	preferences = profile.get("learning_preferences") or {}
+	try:
+		progress_band = int(cognitive.get("overall_progress", 0)) // 25
+	except (TypeError, ValueError):
+		progress_band = 0
+	style = (preferences.get("content_style"), preferences.get("activity_type"))
+	if style == (None, None):
+		# profiles stored without the computed fields: band the raw FSLSM dimensions
+		dims = preferences.get("fslsm_dimensions") or {}
+		style = tuple(round(float(dims.get(k, 0) or 0)) for k in sorted(dims))
+	return (
+		str(profile.get("learning_goal", "")).strip().lower(),
+		progress_band,
+		style,
+	)
+
+
+def _model_identity(model: Any) -> Tuple:
+	"""Provider, model name and endpoint of a chat model, so cached answers are never replayed across models."""
+	provider = getattr(model, "_llm_type", None) or type(model).__name__
+	name = next((str(v) for v in (getattr(model, attr, None) for attr in ("model_name", "model", "model_id")) if v), "")
+	endpoint = getattr(model, "openai_api_base", None) or getattr(model, "base_url", None)
+	return (str(provider), name, str(endpoint or ""))
+
+
 class TutorChatPayload(BaseModel):
 	learner_profile: Any = ""
 	messages: Any
 	use_search: bool = True
+	use_cache: bool = True
 	top_k: int = 5
 	external_resources: Optional[str] = None
 
@@ -73,11 +139,45 @@ class TutorChatPayload(BaseModel):
 class AITutorChatbot(BaseAgent):
 	name: str = "AITutorChatbot"
 
-	def __init__(self, model: Any, *, search_rag_manager: Optional[SearchRagManager] = None):
+	def __init__(
+		self,
+		model: Any,
+		*,
+		search_rag_manager: Optional[SearchRagManager] = None,
+		answer_cache: Optional[SemanticCache] = None,
+	):
 		super().__init__(model=model, system_prompt=ai_tutor_chatbot_system_prompt, jsonalize_output=False)
 		self.search_rag_manager = search_rag_manager
+		self.answer_cache = answer_cache
 
-	def chat(self, payload: TutorChatPayload | Mapping[str, Any] | str):
+	def _cache_lookup(self, payload: TutorChatPayload):
+		"""Return ``(cached_answer, cache_slot)``.
+
+		``cached_answer`` is None on a miss; ``cache_slot`` is the
+		``(bucket, vector)`` to store a fresh answer under, or None when the
+		cache is off for this turn.
+		"""
+		if self.answer_cache is None or not payload.use_cache or payload.external_resources:
+			return None, None
+		query = _last_user_query(payload.messages)
+		if not query:
+			return None, None
+		context = _last_assistant_turn(payload.messages)
+		try:
+			vector = self.answer_cache.embed(f"{context}\n{query}" if context else query)
+		except Exception:
+			# the cache is optional; answer the turn without it
+			logger.exception("Tutor answer cache could not embed the query")
+			return None, None
+		bucket = (_model_identity(self._model), payload.use_search, _profile_bucket(payload.learner_profile))
+		return self.answer_cache.get(bucket, vector), (bucket, vector)
+
+	def _cache_store(self, cache_slot, reply: Any) -> None:
+		if cache_slot is not None and isinstance(reply, str) and reply.strip():
+			self.answer_cache.put(*cache_slot, reply)
+
+	def _prepare_input(self, payload: TutorChatPayload | Mapping[str, Any] | str) -> dict:
+		"""Validate the payload and gather retrieval context into the task prompt variables."""
 		if not isinstance(payload, TutorChatPayload):
 			payload = TutorChatPayload.model_validate(payload)
 
@@ -100,14 +200,67 @@ class AITutorChatbot(BaseAgent):
 			except Exception:
 				pass
 
-		input_vars = {
+		return {
 			"learner_profile": data.get("learner_profile", ""),
 			"messages": history_text,
 			"external_resources": external_context,
 		}
-		raw_reply = self.invoke(input_vars, task_prompt=ai_tutor_chatbot_task_prompt)
+
+	def _prepare_turn(self, payload: TutorChatPayload | Mapping[str, Any] | str) -> Tuple[Any, Any, Optional[dict]]:
+		"""Return ``(cached_answer, cache_slot, request)`` for one chat turn.
+
+		On a cache hit *request* is None; otherwise it holds the ``invoke``
+		arguments, with the retrieval context already gathered. Embedding and
+		retrieval block, so the async methods run this in a thread.
+		"""
+		if not isinstance(payload, TutorChatPayload):
+			payload = TutorChatPayload.model_validate(payload)
+		cached, cache_slot = self._cache_lookup(payload)
+		if cached is not None:
+			return cached, None, None
+		return None, cache_slot, {"input_dict": self._prepare_input(payload), "task_prompt": ai_tutor_chatbot_task_prompt}
+
+	def chat(self, payload: TutorChatPayload | Mapping[str, Any] | str):
+		cached, cache_slot, request = self._prepare_turn(payload)
+		if request is None:
+			return cached
+		raw_reply = self.run_task(request)
+		self._cache_store(cache_slot, raw_reply)
+		return raw_reply
+
+	async def achat(self, payload: TutorChatPayload | Mapping[str, Any] | str):
+		cached, cache_slot, request = await asyncio.to_thread(self._prepare_turn, payload)
+		if request is None:
+			return cached
+		raw_reply = await self.arun_task(request)
+		self._cache_store(cache_slot, raw_reply)
 		return raw_reply
 
+	async def astream_chat(self, payload: TutorChatPayload | Mapping[str, Any] | str) -> AsyncIterator[str]:
+		"""Like :meth:`achat`, but yields the reply in chunks as the model produces them.
+
+		A cached answer is yielded as a single chunk; a streamed reply is
+		stored in the answer cache once it has completed.
+		"""
+		cached, cache_slot, request = await asyncio.to_thread(self._prepare_turn, payload)
+		if request is None:
+			yield cached
+			return
+		chunks: List[str] = []
+		async for chunk in self.astream(**request):
+			chunks.append(chunk)
+			yield chunk
+		self._cache_store(cache_slot, "".join(chunks))
+
+
+def _chat_payload(messages: Any, learner_profile: Any, use_search: bool, use_cache: bool, top_k: int) -> dict:
+	return {
+		"learner_profile": learner_profile,
+		"messages": messages,
+		"use_search": use_search,
+		"use_cache": use_cache,
+		"top_k": top_k,
+	}
 
 def chat_with_tutor_with_llm(
 	llm: Any,
@@ -117,18 +270,52 @@ def chat_with_tutor_with_llm(
 	search_rag_manager: Optional[SearchRagManager] = None,
 	use_search: bool = True,
 	top_k: int = 5,
+	answer_cache: Optional[SemanticCache] = None,
+	use_cache: bool = True,
 ):
 	"""Convenience helper to run an AI tutor chat turn with optional RAG.
 
 	- If a SearchRagManager is provided and use_search=True, performs web search + retrieval.
 	- If provided and use_search=False, performs vectorstore-only retrieval.
 	- If not provided, replies without external context.
+	- With an answer_cache, a near-identical question from a similar learner is
+	  answered from the cache without retrieval or an LLM call (use_cache=False bypasses it).
 	"""
-	agent = AITutorChatbot(llm, search_rag_manager=search_rag_manager)
-	payload = {
-		"learner_profile": learner_profile,
-		"messages": messages,
-		"use_search": use_search,
-		"top_k": top_k,
-	}
+	agent = AITutorChatbot(llm, search_rag_manager=search_rag_manager, answer_cache=answer_cache)
+	payload = _chat_payload(messages, learner_profile, use_search, use_cache, top_k)
 	return agent.chat(payload)
+
+
+async def achat_with_tutor_with_llm(
+	llm: Any,
+	messages: Optional[Sequence[Mapping[str, Any]]] | str = None,
+	learner_profile: Any = "",
+	*,
+	search_rag_manager: Optional[SearchRagManager] = None,
+	use_search: bool = True,
+	top_k: int = 5,
+	answer_cache: Optional[SemanticCache] = None,
+	use_cache: bool = True,
+):
+	"""Async counterpart of :func:`chat_with_tutor_with_llm`."""
+	agent = AITutorChatbot(llm, search_rag_manager=search_rag_manager, answer_cache=answer_cache)
+	payload = _chat_payload(messages, learner_profile, use_search, use_cache, top_k)
+	return await agent.achat(payload)
+
+
+async def astream_chat_with_tutor_with_llm(
+	llm: Any,
+	messages: Optional[Sequence[Mapping[str, Any]]] | str = None,
+	learner_profile: Any = "",
+	*,
+	search_rag_manager: Optional[SearchRagManager] = None,
+	use_search: bool = True,
+	top_k: int = 5,
+	answer_cache: Optional[SemanticCache] = None,
+	use_cache: bool = True,
+) -> AsyncIterator[str]:
+	"""Streaming counterpart of :func:`achat_with_tutor_with_llm`; yields reply chunks."""
+	agent = AITutorChatbot(llm, search_rag_manager=search_rag_manager, answer_cache=answer_cache)
+	payload = _chat_payload(messages, learner_profile, use_search, use_cache, top_k)
+	async for chunk in agent.astream_chat(payload):
+		yield chunk
@@ -4,7 +4,7 @@ import ast
 from typing import Any, Dict, Mapping, Optional, Union
 
 from base import BaseAgent
-from .schemas import parse_ground_truth_profile_result
+from .schemas import GroundTruthProfileResult, parse_ground_truth_profile_result
 from .prompts import (
     ground_truth_profile_creator_system_prompt,
     ground_truth_profile_creator_task_prompt,
@@ -71,12 +71,27 @@ class GroundTruthProfileCreator(BaseAgent):
             jsonalize_output=True,
         )
 
+    def _create_request(self, input_dict: Mapping[str, Any]) -> Dict[str, Any]:
+        """``invoke`` arguments of :meth:`create_profile` and :meth:`acreate_profile`."""
+        return {
+            "input_dict": GroundTruthProfileCreatePayload(**input_dict).model_dump(),
+            "task_prompt": ground_truth_profile_creator_task_prompt,
+            "output_schema": GroundTruthProfileResult,
+        }
+
+    def _progress_request(self, input_dict: Mapping[str, Any]) -> Dict[str, Any]:
+        """``invoke`` arguments of :meth:`progress_profile` and :meth:`aprogress_profile`."""
+        return {
+            "input_dict": GroundTruthProfileProgressPayload(**input_dict).model_dump(),
+            "task_prompt": ground_truth_profile_creator_task_prompt_progress,
+            "output_schema": GroundTruthProfileResult,
+        }
+
+    def _task_result(self, raw_output: Any, request: Dict[str, Any]) -> Dict[str, Any]:
+        return parse_ground_truth_profile_result(raw_output).model_dump()
+
     def create_profile(self, input_dict: Mapping[str, Any]) -> Dict[str, Any]:
-        payload = GroundTruthProfileCreatePayload(**input_dict).model_dump()
-        task_prompt = ground_truth_profile_creator_task_prompt
-        raw_output = self.invoke(payload, task_prompt=task_prompt)
-        validated = parse_ground_truth_profile_result(raw_output)
-        return validated.model_dump()
+        return self.run_task(self._create_request(input_dict))
 
     def progress_profile(self, input_dict: Mapping[str, Any]) -> Dict[str, Any]:
         """
@@ -87,11 +102,27 @@ class GroundTruthProfileCreator(BaseAgent):
                 - ground_truth_profile (dict): The ground-truth learner profile.
                 - session_information (dict): Information about the current session.
         """
-        payload = GroundTruthProfileProgressPayload(**input_dict).model_dump()
-        task_prompt = ground_truth_profile_creator_task_prompt_progress
-        raw_output = self.invoke(payload, task_prompt=task_prompt)
-        validated = parse_ground_truth_profile_result(raw_output)
-        return validated.model_dump()
+        return self.run_task(self._progress_request(input_dict))
+
+    async def acreate_profile(self, input_dict: Mapping[str, Any]) -> Dict[str, Any]:
+        return await self.arun_task(self._create_request(input_dict))
+
+    async def aprogress_profile(self, input_dict: Mapping[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of :meth:`progress_profile`."""
+        return await self.arun_task(self._progress_request(input_dict))
+
+
+def _create_payload(
+    learning_goal: str,
+    learner_information: Union[str, Mapping[str, Any]],
+    skill_requirements: Optional[Union[str, Mapping[str, Any]]],
+) -> Dict[str, Any]:
+    return {
+        "learning_goal": learning_goal,
+        "learner_information": learner_information,
+        "skill_requirements": skill_requirements,
+    }
+
 
 def create_ground_truth_profile_with_llm(
     llm: Any,
@@ -100,10 +131,14 @@ def create_ground_truth_profile_with_llm(
     skill_requirements: Optional[Union[str, Mapping[str, Any]]] = None,
 ) -> Dict[str, Any]:
     creator = GroundTruthProfileCreator(llm)
-    return creator.create_profile(
-        {
-            "learning_goal": learning_goal,
-            "learner_information": learner_information,
-            "skill_requirements": skill_requirements,
-        }
-    )
+    return creator.create_profile(_create_payload(learning_goal, learner_information, skill_requirements))
+
+
+async def acreate_ground_truth_profile_with_llm(
+    llm: Any,
+    learning_goal: str,
+    learner_information: Union[str, Mapping[str, Any]] = "",
+    skill_requirements: Optional[Union[str, Mapping[str, Any]]] = None,
+) -> Dict[str, Any]:
+    creator = GroundTruthProfileCreator(llm)
+    return await creator.acreate_profile(_create_payload(learning_goal, learner_information, skill_requirements))
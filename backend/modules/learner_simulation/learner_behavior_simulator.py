@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import ast
+import asyncio
 import json
 import os
 from typing import Any, Dict, Mapping, Union
 
 from base import BaseAgent
-from .schemas import parse_learner_behavior_log
+from .schemas import LearnerBehaviorLog, parse_learner_behavior_log
 from .prompts import (
     learner_interaction_simulator_system_prompt,
     learner_interaction_simulator_task_prompt,
@@ -47,6 +48,17 @@ class LearnerInteractionSimulator(BaseAgent):
             jsonalize_output=True,
         )
 
+    def _interactions_request(self, input_dict: Mapping[str, Any]) -> Dict[str, Any]:
+        """``invoke`` arguments of :meth:`simulate_interactions` and :meth:`asimulate_interactions`."""
+        return {
+            "input_dict": LearnerInteractionPayload(**input_dict).model_dump(),
+            "task_prompt": learner_interaction_simulator_task_prompt,
+            "output_schema": LearnerBehaviorLog,
+        }
+
+    def _task_result(self, raw_output: Any, request: Dict[str, Any]) -> Dict[str, Any]:
+        return parse_learner_behavior_log(raw_output).model_dump()
+
     def simulate_interactions(self, input_dict: Mapping[str, Any]) -> Dict[str, Any]:
         """
         Simulate learner interactions based on the ground-truth profile and session count.
@@ -57,11 +69,20 @@ class LearnerInteractionSimulator(BaseAgent):
                 - progressed_ground_truth_profile (dict): The progressed ground-truth learner profile.
                 - session_information (dict): Information about the current session.
         """
-        payload = LearnerInteractionPayload(**input_dict).model_dump()
-        task_prompt = learner_interaction_simulator_task_prompt
-        raw_output = self.invoke(payload, task_prompt=task_prompt)
-        validated = parse_learner_behavior_log(raw_output)
-        return validated.model_dump()
+        return self.run_task(self._interactions_request(input_dict))
+
+    async def asimulate_interactions(self, input_dict: Mapping[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of :meth:`simulate_interactions`."""
+        return await self.arun_task(self._interactions_request(input_dict))
+
+
+def _save_behavior_logs(behavior_logs: list[Dict[str, Any]]) -> None:
+    # Save logs to data/output/behavior_logs.json
+    out_dir = os.path.join("data", "output")
+    os.makedirs(out_dir, exist_ok=True)
+    out_path = os.path.join(out_dir, "behavior_logs.json")
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(behavior_logs, f, ensure_ascii=False, indent=2)
 
 
 def simulate_learner_interactions_with_llm(
@@ -84,10 +105,32 @@ def simulate_learner_interactions_with_llm(
         )
         behavior_logs.append(behavior_log)
 
-    # Save logs to data/output/behavior_logs.json
-    out_dir = os.path.join("data", "output")
-    os.makedirs(out_dir, exist_ok=True)
-    out_path = os.path.join(out_dir, "behavior_logs.json")
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(behavior_logs, f, ensure_ascii=False, indent=2)
+    _save_behavior_logs(behavior_logs)
+    return behavior_logs
+
+
+async def asimulate_learner_interactions_with_llm(
+    llm: Any,
+    ground_truth_profile: Union[str, Mapping[str, Any]],
+    session_count: int = 5,
+) -> list[Dict[str, Any]]:
+    """Async counterpart of :func:`simulate_learner_interactions_with_llm`.
+
+    Sessions only depend on the ground-truth profile, so they are simulated
+    concurrently.
+    """
+
+    print("==== Step 2: Simulate Learner Interactions ====")
+    learner_behavior_simulator = LearnerInteractionSimulator(llm)
+    behavior_logs = list(await asyncio.gather(*(
+        learner_behavior_simulator.asimulate_interactions(
+            {
+                "ground_truth_profile": ground_truth_profile,
+                "session_number": session,
+            }
+        )
+        for session in range(1, session_count + 1)
+    )))
+
+    await asyncio.to_thread(_save_behavior_logs, behavior_logs)
     return behavior_logs
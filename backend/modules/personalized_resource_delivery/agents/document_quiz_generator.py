@@ -38,24 +38,32 @@ class DocumentQuizGenerator(BaseAgent):
     def __init__(self, model: Any):
         super().__init__(model=model, system_prompt=document_quiz_generator_system_prompt, jsonalize_output=True)
 
-    def generate(self, payload: DocumentQuizPayload | Mapping[str, Any] | str):
+    def _generate_request(self, payload: DocumentQuizPayload | Mapping[str, Any] | str) -> dict:
+        """``invoke`` arguments of :meth:`generate` and :meth:`agenerate`."""
         if not isinstance(payload, DocumentQuizPayload):
             payload = DocumentQuizPayload.model_validate(payload)
-        raw_output = self.invoke(payload.model_dump(), task_prompt=document_quiz_generator_task_prompt)
-        validated_output = DocumentQuiz.model_validate(raw_output)
-        return validated_output.model_dump()
+        return {
+            "input_dict": payload.model_dump(),
+            "task_prompt": document_quiz_generator_task_prompt,
+            "output_schema": DocumentQuiz,
+        }
 
+    def generate(self, payload: DocumentQuizPayload | Mapping[str, Any] | str):
+        return self.run_task(self._generate_request(payload))
 
-def generate_document_quizzes_with_llm(
-    llm,
+    async def agenerate(self, payload: DocumentQuizPayload | Mapping[str, Any] | str):
+        return await self.arun_task(self._generate_request(payload))
+
+
+def _quiz_payload(
     learner_profile,
     learning_document,
-    single_choice_count: int = 3,
-    multiple_choice_count: int = 0,
-    true_false_count: int = 0,
-    short_answer_count: int = 0,
-):
-    payload = {
+    single_choice_count: int,
+    multiple_choice_count: int,
+    true_false_count: int,
+    short_answer_count: int,
+) -> dict:
+    return {
         "learner_profile": learner_profile,
         "learning_document": learning_document,
         "single_choice_count": single_choice_count,
@@ -63,5 +71,44 @@ def generate_document_quizzes_with_llm(
         "true_false_count": true_false_count,
         "short_answer_count": short_answer_count,
     }
+
+def generate_document_quizzes_with_llm(
+    llm,
+    learner_profile,
+    learning_document,
+    single_choice_count: int = 3,
+    multiple_choice_count: int = 0,
+    true_false_count: int = 0,
+    short_answer_count: int = 0,
+):
+    payload = _quiz_payload(
+        learner_profile,
+        learning_document,
+        single_choice_count,
+        multiple_choice_count,
+        true_false_count,
+        short_answer_count,
+    )
     gen = DocumentQuizGenerator(llm)
     return gen.generate(payload)
+
+
+async def agenerate_document_quizzes_with_llm(
+    llm,
+    learner_profile,
+    learning_document,
+    single_choice_count: int = 3,
+    multiple_choice_count: int = 0,
+    true_false_count: int = 0,
+    short_answer_count: int = 0,
+):
+    payload = _quiz_payload(
+        learner_profile,
+        learning_document,
+        single_choice_count,
+        multiple_choice_count,
+        true_false_count,
+        short_answer_count,
+    )
+    gen = DocumentQuizGenerator(llm)
+    return await gen.agenerate(payload)
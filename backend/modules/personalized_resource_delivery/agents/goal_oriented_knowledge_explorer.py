@@ -23,23 +23,42 @@ class GoalOrientedKnowledgeExplorer(BaseAgent):
     def __init__(self, model: Any):
         super().__init__(model=model, system_prompt=goal_oriented_knowledge_explorer_system_prompt, jsonalize_output=True)
 
-    def explore(self, payload: KnowledgeExplorePayload | Mapping[str, Any] | str | dict):
+    def _explore_request(self, payload: KnowledgeExplorePayload | Mapping[str, Any] | str | dict) -> dict:
+        """``invoke`` arguments of :meth:`explore` and :meth:`aexplore`."""
         if not isinstance(payload, KnowledgeExplorePayload):
             payload = KnowledgeExplorePayload.model_validate(payload)
-        raw_output = self.invoke(payload.model_dump(), task_prompt=goal_oriented_knowledge_explorer_task_prompt)
-        validated_output = KnowledgePoints.model_validate(raw_output)
-        return validated_output.model_dump()
+        return {
+            "input_dict": payload.model_dump(),
+            "task_prompt": goal_oriented_knowledge_explorer_task_prompt,
+            "output_schema": KnowledgePoints,
+        }
 
+    def explore(self, payload: KnowledgeExplorePayload | Mapping[str, Any] | str | dict):
+        return self.run_task(self._explore_request(payload))
 
-def explore_knowledge_points_with_llm(llm, learner_profile, learning_path, learning_session):
-    """Convenience wrapper to explore knowledge points for a session using the agent.
+    async def aexplore(self, payload: KnowledgeExplorePayload | Mapping[str, Any] | str | dict):
+        return await self.arun_task(self._explore_request(payload))
 
-    Mirrors the selected helper signature and behavior.
-    """
-    input_dict = {
+
+def _explore_payload(learner_profile, learning_path, learning_session) -> dict:
+    return {
         "learner_profile": learner_profile,
         "learning_path": learning_path,
         "learning_session": learning_session,
     }
+
+def explore_knowledge_points_with_llm(llm, learner_profile, learning_path, learning_session):
+    """Convenience wrapper to explore knowledge points for a session using the agent.
+
+    Mirrors the selected helper signature and behavior.
+    """
+    input_dict = _explore_payload(learner_profile, learning_path, learning_session)
     explorer = GoalOrientedKnowledgeExplorer(llm)
     return explorer.explore(input_dict)
+
+
+async def aexplore_knowledge_points_with_llm(llm, learner_profile, learning_path, learning_session):
+    """Async counterpart of :func:`explore_knowledge_points_with_llm`."""
+    input_dict = _explore_payload(learner_profile, learning_path, learning_session)
+    explorer = GoalOrientedKnowledgeExplorer(llm)
+    return await explorer.aexplore(input_dict)
@@ -42,21 +42,37 @@ class LearnerFeedbackSimulator(BaseAgent):
         super().__init__(model=model, jsonalize_output=True)
         self.system_prompt = learner_feedback_simulator_system_prompt
 
-    def feedback_path(self, payload: LearningPathFeedbackPayload | Mapping[str, Any] | str):
-        task_prompt = learner_feedback_simulator_task_prompt_path
+    def _path_request(self, payload: LearningPathFeedbackPayload | Mapping[str, Any] | str) -> dict:
+        """``invoke`` arguments of :meth:`feedback_path` and :meth:`afeedback_path`."""
         if not isinstance(payload, LearningPathFeedbackPayload):
             payload = LearningPathFeedbackPayload.model_validate(payload)
-        raw_output = self.invoke(payload.model_dump(), task_prompt=task_prompt)
-        validated_output = LearnerFeedback.model_validate(raw_output)
-        return validated_output.model_dump()
-
-    def feedback_content(self, payload: LearningContentFeedbackPayload | Mapping[str, Any] | str):
-        task_prompt = learner_feedback_simulator_task_prompt_content
+        return {
+            "input_dict": payload.model_dump(),
+            "task_prompt": learner_feedback_simulator_task_prompt_path,
+            "output_schema": LearnerFeedback,
+        }
+
+    def _content_request(self, payload: LearningContentFeedbackPayload | Mapping[str, Any] | str) -> dict:
+        """``invoke`` arguments of :meth:`feedback_content` and :meth:`afeedback_content`."""
         if not isinstance(payload, LearningContentFeedbackPayload):
             payload = LearningContentFeedbackPayload.model_validate(payload)
-        raw_output = self.invoke(payload.model_dump(), task_prompt=task_prompt)
-        validated_output = LearnerFeedback.model_validate(raw_output)
-        return validated_output.model_dump()
+        return {
+            "input_dict": payload.model_dump(),
+            "task_prompt": learner_feedback_simulator_task_prompt_content,
+            "output_schema": LearnerFeedback,
+        }
+
+    def feedback_path(self, payload: LearningPathFeedbackPayload | Mapping[str, Any] | str):
+        return self.run_task(self._path_request(payload))
+
+    def feedback_content(self, payload: LearningContentFeedbackPayload | Mapping[str, Any] | str):
+        return self.run_task(self._content_request(payload))
+
+    async def afeedback_path(self, payload: LearningPathFeedbackPayload | Mapping[str, Any] | str):
+        return await self.arun_task(self._path_request(payload))
+
+    async def afeedback_content(self, payload: LearningContentFeedbackPayload | Mapping[str, Any] | str):
+        return await self.arun_task(self._content_request(payload))
 
 
 def simulate_path_feedback_with_llm(
@@ -66,11 +82,7 @@ def simulate_path_feedback_with_llm(
 ) -> dict:
     """Simulate learner feedback on a learning path."""
     simulator = LearnerFeedbackSimulator(llm)
-    payload = {
-        "learner_profile": learner_profile,
-        "learning_path": learning_path,
-    }
-    return simulator.feedback_path(payload)
+    return simulator.feedback_path({"learner_profile": learner_profile, "learning_path": learning_path})
 
 
 def simulate_content_feedback_with_llm(
@@ -80,8 +92,24 @@ def simulate_content_feedback_with_llm(
 ) -> dict:
     """Simulate learner feedback on learning content."""
     simulator = LearnerFeedbackSimulator(llm)
-    payload = {
-        "learner_profile": learner_profile,
-        "learning_content": learning_content,
-    }
-    return simulator.feedback_content(payload)
\ No newline at end of file
+    return simulator.feedback_content({"learner_profile": learner_profile, "learning_content": learning_content})
+
+
+async def asimulate_path_feedback_with_llm(
+    llm: Any,
+    learner_profile: Mapping[str, Any],
+    learning_path: Any,
+) -> dict:
+    """Async counterpart of :func:`simulate_path_feedback_with_llm`."""
+    simulator = LearnerFeedbackSimulator(llm)
+    return await simulator.afeedback_path({"learner_profile": learner_profile, "learning_path": learning_path})
+
+
+async def asimulate_content_feedback_with_llm(
+    llm: Any,
+    learner_profile: Mapping[str, Any],
+    learning_content: Any,
+) -> dict:
+    """Async counterpart of :func:`simulate_content_feedback_with_llm`."""
+    simulator = LearnerFeedbackSimulator(llm)
+    return await simulator.afeedback_content({"learner_profile": learner_profile, "learning_content": learning_content})
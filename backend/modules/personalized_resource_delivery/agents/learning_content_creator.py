@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Mapping, Optional
+from typing import Any, AsyncIterator, Mapping, Optional, Tuple
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -33,36 +33,77 @@ class LearningContentCreator(BaseAgent):
         super().__init__(model=model, system_prompt=learning_content_creator_system_prompt, jsonalize_output=True)
         self.search_rag_manager = search_rag_manager
 
-    def prepare_outline(self, payload: ContentBasePayload | Mapping[str, Any] | str):
+    def _outline_request(self, payload: ContentBasePayload | Mapping[str, Any] | str) -> dict:
+        """``invoke`` arguments of :meth:`prepare_outline` and :meth:`aprepare_outline`."""
         if not isinstance(payload, ContentBasePayload):
             payload = ContentBasePayload.model_validate(payload)
-        raw_output = self.invoke(payload.model_dump(), task_prompt=learning_content_creator_task_prompt_outline)
-        validated_output = ContentOutline.model_validate(raw_output)
-        return validated_output.model_dump()
+        return {
+            "input_dict": payload.model_dump(),
+            "task_prompt": learning_content_creator_task_prompt_outline,
+            "output_schema": ContentOutline,
+        }
 
-    def draft_section(self, payload: ContentDraftPayload | Mapping[str, Any] | str):
+    def _section_request(self, payload: ContentDraftPayload | Mapping[str, Any] | str) -> dict:
+        """``invoke`` arguments of :meth:`draft_section` and :meth:`adraft_section`."""
         if not isinstance(payload, ContentDraftPayload):
             payload = ContentDraftPayload.model_validate(payload)
-        raw_output = self.invoke(payload.model_dump(), task_prompt=learning_content_creator_task_prompt_draft)
-        validated_output = KnowledgeDraft.model_validate(raw_output)
-        return validated_output.model_dump()
+        return {
+            "input_dict": payload.model_dump(),
+            "task_prompt": learning_content_creator_task_prompt_draft,
+            "output_schema": KnowledgeDraft,
+        }
 
-    def create_content(self, payload: ContentBasePayload | Mapping[str, Any] | str):
+    def _content_request(self, payload: ContentBasePayload | Mapping[str, Any] | str) -> dict:
+        """``invoke`` arguments of :meth:`create_content` and :meth:`acreate_content`."""
         if not isinstance(payload, ContentBasePayload):
             payload = ContentBasePayload.model_validate(payload)
-        raw_output = self.invoke(payload.model_dump(), task_prompt=learning_content_creator_task_prompt_content)
-        validated_output = LearningContent.model_validate(raw_output)
-        return validated_output.model_dump()
+        return {
+            "input_dict": payload.model_dump(),
+            "task_prompt": learning_content_creator_task_prompt_content,
+            "output_schema": LearningContent,
+        }
 
+    def prepare_outline(self, payload: ContentBasePayload | Mapping[str, Any] | str):
+        return self.run_task(self._outline_request(payload))
 
-def prepare_content_outline_with_llm(llm, learner_profile, learning_path, learning_session, *, search_rag_manager: Optional[SearchRagManager] = None):
-    creator = LearningContentCreator(llm, search_rag_manager=search_rag_manager)
-    payload = {
+    def draft_section(self, payload: ContentDraftPayload | Mapping[str, Any] | str):
+        return self.run_task(self._section_request(payload))
+
+    def create_content(self, payload: ContentBasePayload | Mapping[str, Any] | str):
+        return self.run_task(self._content_request(payload))
+
+    async def aprepare_outline(self, payload: ContentBasePayload | Mapping[str, Any] | str):
+        return await self.arun_task(self._outline_request(payload))
+
+    async def adraft_section(self, payload: ContentDraftPayload | Mapping[str, Any] | str):
+        return await self.arun_task(self._section_request(payload))
+
+    async def acreate_content(self, payload: ContentBasePayload | Mapping[str, Any] | str):
+        return await self.arun_task(self._content_request(payload))
+
+def _unwrap_knowledge_points(explored):
+    """The explorer returns ``{"knowledge_points": [...]}``; the drafter and integrator take the list."""
+    if isinstance(explored, Mapping):
+        return explored.get("knowledge_points", [])
+    return explored
+
+
+def _content_payload(learner_profile, learning_path, learning_session) -> dict:
+    return {
         "learner_profile": learner_profile,
         "learning_path": learning_path,
         "learning_session": learning_session,
     }
-    return creator.prepare_outline(payload)
+
+
+def prepare_content_outline_with_llm(llm, learner_profile, learning_path, learning_session, *, search_rag_manager: Optional[SearchRagManager] = None):
+    creator = LearningContentCreator(llm, search_rag_manager=search_rag_manager)
+    return creator.prepare_outline(_content_payload(learner_profile, learning_path, learning_session))
+
+
+async def aprepare_content_outline_with_llm(llm, learner_profile, learning_path, learning_session, *, search_rag_manager: Optional[SearchRagManager] = None):
+    creator = LearningContentCreator(llm, search_rag_manager=search_rag_manager)
+    return await creator.aprepare_outline(_content_payload(learner_profile, learning_path, learning_session))
 
 
 def create_learning_content_with_llm(
@@ -86,9 +127,9 @@ def create_learning_content_with_llm(
     from .document_quiz_generator import generate_document_quizzes_with_llm
 
     if method_name == "genmentor":
-        knowledge_points = explore_knowledge_points_with_llm(
+        knowledge_points = _unwrap_knowledge_points(explore_knowledge_points_with_llm(
             llm, learner_profile, learning_path, learning_session
-        )
+        ))
         knowledge_drafts = draft_knowledge_points_with_llm(
             llm,
             learner_profile,
@@ -134,10 +175,131 @@ def create_learning_content_with_llm(
                 search_rag_manager=search_rag_manager,
             )
         outline = document_outline if isinstance(document_outline, dict) else document_outline
-        payload = {
-            "learner_profile": learner_profile,
-            "learning_path": learning_path,
-            "learning_session": learning_session,
-            "external_resources": "",
-        }
+        payload = {**_content_payload(learner_profile, learning_path, learning_session), "external_resources": ""}
         return creator.create_content(payload)
+
+
+async def astream_learning_content_with_llm(
+    llm,
+    learner_profile,
+    learning_path,
+    learning_session,
+    document_outline=None,
+    allow_parallel=True,
+    with_quiz=True,
+    max_workers=3,
+    use_search=True,
+    output_markdown=True,
+    method_name="genmentor",
+    *,
+    search_rag_manager: Optional[SearchRagManager] = None,
+    single_choice_count=3,
+    multiple_choice_count=0,
+    true_false_count=0,
+    short_answer_count=0,
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Run the content pipeline and yield ``(event, data)`` as each stage produces output.
+
+    For ``genmentor`` the events are ``knowledge_points``, one ``draft`` per
+    knowledge point in completion order (``{"index", "knowledge_point",
+    "draft"}``), ``document``, ``quizzes`` (only with *with_quiz*) and finally
+    ``done`` carrying the same content :func:`acreate_learning_content_with_llm`
+    returns. Other methods emit only ``done``.
+    """
+    from .goal_oriented_knowledge_explorer import aexplore_knowledge_points_with_llm
+    from .search_enhanced_knowledge_drafter import aiter_knowledge_point_drafts_with_llm
+    from .learning_document_integrator import aintegrate_learning_document_with_llm
+    from .document_quiz_generator import agenerate_document_quizzes_with_llm
+
+    if method_name == "genmentor":
+        knowledge_points = _unwrap_knowledge_points(await aexplore_knowledge_points_with_llm(
+            llm, learner_profile, learning_path, learning_session
+        ))
+        yield "knowledge_points", knowledge_points
+        knowledge_drafts = [None] * len(knowledge_points)
+        async for index, draft in aiter_knowledge_point_drafts_with_llm(
+            llm,
+            learner_profile,
+            learning_path,
+            learning_session,
+            knowledge_points,
+            allow_parallel=allow_parallel,
+            use_search=use_search,
+            max_workers=max_workers,
+            search_rag_manager=search_rag_manager,
+        ):
+            knowledge_drafts[index] = draft
+            yield "draft", {"index": index, "knowledge_point": knowledge_points[index], "draft": draft}
+        learning_document = await aintegrate_learning_document_with_llm(
+            llm,
+            learner_profile,
+            learning_path,
+            learning_session,
+            knowledge_points,
+            knowledge_drafts,
+            output_markdown=output_markdown,
+        )
+        yield "document", learning_document
+        learning_content = {"document": learning_document}
+        if with_quiz:
+            document_quiz = await agenerate_document_quizzes_with_llm(
+                llm,
+                learner_profile,
+                learning_document,
+                single_choice_count=single_choice_count,
+                multiple_choice_count=multiple_choice_count,
+                true_false_count=true_false_count,
+                short_answer_count=short_answer_count,
+            )
+            yield "quizzes", document_quiz
+            learning_content["quizzes"] = document_quiz
+        yield "done", learning_content
+    else:
+        creator = LearningContentCreator(llm, search_rag_manager=search_rag_manager)
+        if document_outline is None:
+            document_outline = await aprepare_content_outline_with_llm(
+                llm,
+                learner_profile,
+                learning_path,
+                learning_session,
+                search_rag_manager=search_rag_manager,
+            )
+        payload = {**_content_payload(learner_profile, learning_path, learning_session), "external_resources": ""}
+        yield "done", await creator.acreate_content(payload)
+
+
+async def acreate_learning_content_with_llm(
+    llm,
+    learner_profile,
+    learning_path,
+    learning_session,
+    document_outline=None,
+    allow_parallel=True,
+    with_quiz=True,
+    max_workers=3,
+    use_search=True,
+    output_markdown=True,
+    method_name="genmentor",
+    *,
+    search_rag_manager: Optional[SearchRagManager] = None,
+):
+    """Async counterpart of :func:`create_learning_content_with_llm`.
+
+    Runs :func:`astream_learning_content_with_llm` to completion.
+    """
+    async for event, data in astream_learning_content_with_llm(
+        llm,
+        learner_profile,
+        learning_path,
+        learning_session,
+        document_outline=document_outline,
+        allow_parallel=allow_parallel,
+        with_quiz=with_quiz,
+        max_workers=max_workers,
+        use_search=use_search,
+        output_markdown=output_markdown,
+        method_name=method_name,
+        search_rag_manager=search_rag_manager,
+    ):
+        if event == "done":
+            return data
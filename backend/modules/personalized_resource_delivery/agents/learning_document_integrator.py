@@ -37,31 +37,54 @@ class LearningDocumentIntegrator(BaseAgent):
     def __init__(self, model: Any):
         super().__init__(model=model, system_prompt=integrated_document_generator_system_prompt, jsonalize_output=True)
 
-    def integrate(self, payload: IntegratedDocPayload | Mapping[str, Any] | str):
+    def _integrate_request(self, payload: IntegratedDocPayload | Mapping[str, Any] | str) -> dict:
+        """``invoke`` arguments of :meth:`integrate` and :meth:`aintegrate`."""
         if not isinstance(payload, IntegratedDocPayload):
             payload = IntegratedDocPayload.model_validate(payload)
-        raw_output = self.invoke(payload.model_dump(), task_prompt=integrated_document_generator_task_prompt)
-        validated_output = DocumentStructure.model_validate(raw_output)
-        return validated_output.model_dump()
+        return {
+            "input_dict": payload.model_dump(),
+            "task_prompt": integrated_document_generator_task_prompt,
+            "output_schema": DocumentStructure,
+        }
+
+    def integrate(self, payload: IntegratedDocPayload | Mapping[str, Any] | str):
+        return self.run_task(self._integrate_request(payload))
 
+    async def aintegrate(self, payload: IntegratedDocPayload | Mapping[str, Any] | str):
+        return await self.arun_task(self._integrate_request(payload))
 
-def integrate_learning_document_with_llm(llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts, output_markdown=True):
+
+def _integrate_payload(learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts) -> dict:
     logger.info(f'Integrating learning document with {len(knowledge_points)} knowledge points and {len(knowledge_drafts)} drafts...')
-    input_dict = {
+    return {
         'learner_profile': learner_profile,
         'learning_path': learning_path,
         'learning_session': learning_session,
         'knowledge_points': knowledge_points,
         'knowledge_drafts': knowledge_drafts
     }
-    learning_document_integrator = LearningDocumentIntegrator(llm)
-    document_structure = learning_document_integrator.integrate(input_dict)
+
+
+def _integrated_document(document_structure, knowledge_points, knowledge_drafts, output_markdown):
     if not output_markdown:
         return document_structure
     logger.info('Preparing markdown document...')
     return prepare_markdown_document(document_structure, knowledge_points, knowledge_drafts)
 
 
+def integrate_learning_document_with_llm(llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts, output_markdown=True):
+    input_dict = _integrate_payload(learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts)
+    learning_document_integrator = LearningDocumentIntegrator(llm)
+    document_structure = learning_document_integrator.integrate(input_dict)
+    return _integrated_document(document_structure, knowledge_points, knowledge_drafts, output_markdown)
+
+
+async def aintegrate_learning_document_with_llm(llm, learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts, output_markdown=True):
+    input_dict = _integrate_payload(learner_profile, learning_path, learning_session, knowledge_points, knowledge_drafts)
+    learning_document_integrator = LearningDocumentIntegrator(llm)
+    document_structure = await learning_document_integrator.aintegrate(input_dict)
+    return _integrated_document(document_structure, knowledge_points, knowledge_drafts, output_markdown)
+
 def prepare_markdown_document(document_structure, knowledge_points, knowledge_drafts):
     """Render a markdown learning document from the integrated structure and drafts.
 
@@ -49,30 +49,82 @@ class LearningPathScheduler(BaseAgent):
             jsonalize_output=True,
         )
 
+    def _session_request(self, input_dict: Dict[str, Any]) -> JSONDict:
+        """``invoke`` arguments of :meth:`schedule_session` and :meth:`aschedule_session`."""
+        return {
+            "input_dict": SessionSchedulePayload(**input_dict).model_dump(),
+            "task_prompt": learning_path_scheduler_task_prompt_session,
+            "output_schema": LearningPath,
+        }
+
+    def _reflexion_request(self, input_dict: Dict[str, Any]) -> JSONDict:
+        """``invoke`` arguments of :meth:`reflexion` and :meth:`areflexion`."""
+        return {
+            "input_dict": LearningPathRefinementPayload(**input_dict).model_dump(),
+            "task_prompt": learning_path_scheduler_task_prompt_reflexion,
+            "output_schema": LearningPath,
+        }
+
+    def _reschedule_request(self, input_dict: Dict[str, Any]) -> JSONDict:
+        """``invoke`` arguments of :meth:`reschedule` and :meth:`areschedule`."""
+        return {
+            "input_dict": LearningPathReschedulePayload(**input_dict).model_dump(),
+            "task_prompt": learning_path_scheduler_task_prompt_reschedule,
+            "output_schema": LearningPath,
+        }
+
     def schedule_session(self, input_dict: Dict[str, Any]) -> JSONDict:
         """Schedule sessions based on learner profile and desired count."""
-        payload_dict = SessionSchedulePayload(**input_dict).model_dump()
-        task_prompt = learning_path_scheduler_task_prompt_session
-        raw_output = self.invoke(payload_dict, task_prompt=task_prompt)
-        validated_output = LearningPath.model_validate(raw_output)
-        return validated_output.model_dump()
+        return self.run_task(self._session_request(input_dict))
 
     def reflexion(self, input_dict: Dict[str, Any]) -> JSONDict:
         """Refine the learning path based on evaluator feedback."""
-        payload_dict = LearningPathRefinementPayload(**input_dict).model_dump()
-        task_prompt = learning_path_scheduler_task_prompt_reflexion
-        raw_output = self.invoke(payload_dict, task_prompt=task_prompt)
-        validated = LearningPath.model_validate(raw_output)
-        return validated.model_dump()
+        return self.run_task(self._reflexion_request(input_dict))
 
     def reschedule(self, input_dict: Dict[str, Any]) -> JSONDict:
         """Reschedule the learning path with optional new session_count/feedback."""
+        return self.run_task(self._reschedule_request(input_dict))
+
+    async def aschedule_session(self, input_dict: Dict[str, Any]) -> JSONDict:
+        """Async counterpart of :meth:`schedule_session`."""
+        return await self.arun_task(self._session_request(input_dict))
+
+    async def areflexion(self, input_dict: Dict[str, Any]) -> JSONDict:
+        """Async counterpart of :meth:`reflexion`."""
+        return await self.arun_task(self._reflexion_request(input_dict))
+
+    async def areschedule(self, input_dict: Dict[str, Any]) -> JSONDict:
+        """Async counterpart of :meth:`reschedule`."""
+        return await self.arun_task(self._reschedule_request(input_dict))
+
+
+
+def _schedule_payload(learner_profile: Mapping[str, Any], session_count: int) -> JSONDict:
+    return {
+        "learner_profile": learner_profile,
+        "session_count": session_count,
+    }
+
+
+def _reschedule_payload(
+    learning_path: Sequence[Any],
+    learner_profile: Mapping[str, Any],
+    session_count: Optional[int],
+    other_feedback: Optional[Union[str, Mapping[str, Any]]],
+) -> JSONDict:
+    return {
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
+        "session_count": session_count,
+        "other_feedback": other_feedback,
+    }
 
-        payload_dict = LearningPathReschedulePayload(**input_dict).model_dump()
-        task_prompt = learning_path_scheduler_task_prompt_reschedule
-        raw_output = self.invoke(payload_dict, task_prompt=task_prompt)
-        validated = LearningPath.model_validate(raw_output)
-        return validated.model_dump()
+
+def _refine_payload(learning_path: Sequence[Any], feedback: Mapping[str, Any]) -> JSONDict:
+    return {
+        "learning_path": learning_path,
+        "feedback": feedback,
+    }
 
 
 def schedule_learning_path_with_llm(
@@ -83,11 +135,7 @@ def schedule_learning_path_with_llm(
     """Convenience helper to create a scheduler and produce a new learning path."""
 
     learning_path_scheduler = LearningPathScheduler(llm)
-    payload_dict = {
-        "learner_profile": learner_profile,
-        "session_count": session_count,
-    }
-    return learning_path_scheduler.schedule_session(payload_dict)
+    return learning_path_scheduler.schedule_session(_schedule_payload(learner_profile, session_count))
 
 
 def reschedule_learning_path_with_llm(
@@ -103,12 +151,7 @@ def reschedule_learning_path_with_llm(
     """Convenience helper to reschedule an existing learning path via the scheduler."""
 
     learning_path_scheduler = LearningPathScheduler(llm)
-    payload_dict = {
-        "learner_profile": learner_profile,
-        "learning_path": learning_path,
-        "session_count": session_count,
-        "other_feedback": other_feedback,
-    }
+    payload_dict = _reschedule_payload(learning_path, learner_profile, session_count, other_feedback)
     return learning_path_scheduler.reschedule(payload_dict)
 
 
@@ -123,13 +166,44 @@ def refine_learning_path_with_llm(
     """Convenience helper around :meth:`LearningPathScheduler.reflexion`."""
 
     learning_path_scheduler = LearningPathScheduler(llm)
-    payload_dict = {
-        "learning_path": learning_path,
-        "feedback": feedback,
-    }
-    return learning_path_scheduler.reflexion(payload_dict)
+    return learning_path_scheduler.reflexion(_refine_payload(learning_path, feedback))
+
+
+async def aschedule_learning_path_with_llm(
+    llm: Any,
+    learner_profile: Mapping[str, Any],
+    session_count: int = 0,
+) -> JSONDict:
+    """Async counterpart of :func:`schedule_learning_path_with_llm`."""
+
+    learning_path_scheduler = LearningPathScheduler(llm)
+    return await learning_path_scheduler.aschedule_session(_schedule_payload(learner_profile, session_count))
+
+
+async def areschedule_learning_path_with_llm(
+    llm: Any,
+    learning_path: Sequence[Any],
+    learner_profile: Mapping[str, Any],
+    session_count: Optional[int] = None,
+    other_feedback: Optional[Union[str, Mapping[str, Any]]] = None,
+) -> JSONDict:
+    """Async counterpart of :func:`reschedule_learning_path_with_llm`."""
+
+    learning_path_scheduler = LearningPathScheduler(llm)
+    payload_dict = _reschedule_payload(learning_path, learner_profile, session_count, other_feedback)
+    return await learning_path_scheduler.areschedule(payload_dict)
 
 
+async def arefine_learning_path_with_llm(
+    llm: Any,
+    learning_path: Sequence[Any],
+    feedback: Mapping[str, Any],
+) -> JSONDict:
+    """Async counterpart of :func:`refine_learning_path_with_llm`."""
+
+    learning_path_scheduler = LearningPathScheduler(llm)
+    return await learning_path_scheduler.areflexion(_refine_payload(learning_path, feedback))
+
 __all__ = [
     "LearningPathScheduler",
     "LearningPathRefinementPayload",
@@ -138,4 +212,7 @@ __all__ = [
     "schedule_learning_path_with_llm",
     "refine_learning_path_with_llm",
     "reschedule_learning_path_with_llm",
+    "aschedule_learning_path_with_llm",
+    "arefine_learning_path_with_llm",
+    "areschedule_learning_path_with_llm",
 ]
\ No newline at end of file
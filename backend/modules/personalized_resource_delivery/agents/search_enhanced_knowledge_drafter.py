@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 import ast
-from typing import Any, Mapping, Optional, List
+import asyncio
+from typing import Any, AsyncIterator, List, Mapping, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor
 
 from pydantic import BaseModel, field_validator
 
-from base import BaseAgent
+from base import BaseAgent, resource_registry
 from base.search_rag import SearchRagManager, format_docs
 from modules.personalized_resource_delivery.prompts.search_enhanced_knowledge_drafter import (
     search_enhanced_knowledge_drafter_system_prompt,
@@ -42,14 +43,13 @@ class SearchEnhancedKnowledgeDrafter(BaseAgent):
 
     def __init__(self, model: Any, *, search_rag_manager: Optional[SearchRagManager] = None, use_search: bool = True):
         super().__init__(model=model, system_prompt=search_enhanced_knowledge_drafter_system_prompt, jsonalize_output=True)
-        self.search_rag_manager = search_rag_manager or SearchRagManager.from_config(default_config)
+        if search_rag_manager is None and use_search:
+            search_rag_manager = resource_registry.get_search_rag_manager(default_config)
+        self.search_rag_manager = search_rag_manager
         self.use_search = use_search
 
-    def draft(self, payload: KnowledgeDraftPayload | Mapping[str, Any] | str):
-        if not isinstance(payload, KnowledgeDraftPayload):
-            payload = KnowledgeDraftPayload.model_validate(payload)
-        data = payload.model_dump()
-        # Optionally enrich external resources using the search RAG manager
+    def _with_search_context(self, data: dict) -> dict:
+        """Optionally enrich external resources using the search RAG manager."""
         if self.use_search and self.search_rag_manager is not None:
             session = data.get("learning_session") or {}
             session_title = str(session.get("title", "")).strip() or "learning_session"
@@ -61,9 +61,35 @@ class SearchEnhancedKnowledgeDrafter(BaseAgent):
             if context:
                 ext = data.get("external_resources") or ""
                 data["external_resources"] = f"{ext}{context}"
-        raw_output = self.invoke(data, task_prompt=search_enhanced_knowledge_drafter_task_prompt)
-        validated_output = KnowledgeDraft.model_validate(raw_output)
-        return validated_output.model_dump()
+        return data
+
+    def _draft_request(self, payload: KnowledgeDraftPayload | Mapping[str, Any] | str) -> dict:
+        """``invoke`` arguments of :meth:`draft` and :meth:`adraft`; runs the (blocking) web search."""
+        if not isinstance(payload, KnowledgeDraftPayload):
+            payload = KnowledgeDraftPayload.model_validate(payload)
+        return {
+            "input_dict": self._with_search_context(payload.model_dump()),
+            "task_prompt": search_enhanced_knowledge_drafter_task_prompt,
+            "output_schema": KnowledgeDraft,
+        }
+
+    def draft(self, payload: KnowledgeDraftPayload | Mapping[str, Any] | str):
+        return self.run_task(self._draft_request(payload))
+
+    async def adraft(self, payload: KnowledgeDraftPayload | Mapping[str, Any] | str):
+        # web search and embedding are blocking; keep them off the event loop
+        return await self.arun_task(await asyncio.to_thread(self._draft_request, payload))
+
+
+def _draft_payload(learner_profile, learning_path, learning_session, knowledge_points, knowledge_point) -> dict:
+    return {
+        "learner_profile": learner_profile,
+        "learning_path": learning_path,
+        "learning_session": learning_session,
+        "knowledge_points": knowledge_points,
+        "knowledge_point": knowledge_point,
+    }
+
 
 def draft_knowledge_point_with_llm(
     llm,
@@ -78,13 +104,7 @@ def draft_knowledge_point_with_llm(
 ):
     """Draft a single knowledge point using the agent, optionally enriching with a SearchRagManager."""
     drafter = SearchEnhancedKnowledgeDrafter(llm, search_rag_manager=search_rag_manager, use_search=use_search)
-    payload = {
-        "learner_profile": learner_profile,
-        "learning_path": learning_path,
-        "learning_session": learning_session,
-        "knowledge_points": knowledge_points,
-        "knowledge_point": knowledge_point,
-    }
+    payload = _draft_payload(learner_profile, learning_path, learning_session, knowledge_points, knowledge_point)
     return drafter.draft(payload)
 
 
@@ -106,7 +126,7 @@ def draft_knowledge_points_with_llm(
     if isinstance(knowledge_points, str):
         knowledge_points = ast.literal_eval(knowledge_points)
     if search_rag_manager is None and use_search:
-        search_rag_manager = SearchRagManager.from_config(default_config)
+        search_rag_manager = resource_registry.get_search_rag_manager(default_config)
     def draft_one(kp):
         return draft_knowledge_point_with_llm(
             llm,
@@ -129,6 +149,110 @@ def draft_knowledge_points_with_llm(
         return results
 
 
+async def adraft_knowledge_point_with_llm(
+    llm,
+    learner_profile,
+    learning_path,
+    learning_session,
+    knowledge_points,
+    knowledge_point,
+    use_search: bool = True,
+    *,
+    search_rag_manager: Optional[SearchRagManager] = None,
+):
+    """Async counterpart of :func:`draft_knowledge_point_with_llm`."""
+    if search_rag_manager is None and use_search:
+        # the first call in a process loads the embedding model
+        search_rag_manager = await asyncio.to_thread(resource_registry.get_search_rag_manager, default_config)
+    drafter = SearchEnhancedKnowledgeDrafter(llm, search_rag_manager=search_rag_manager, use_search=use_search)
+    payload = _draft_payload(learner_profile, learning_path, learning_session, knowledge_points, knowledge_point)
+    return await drafter.adraft(payload)
+
+
+async def aiter_knowledge_point_drafts_with_llm(
+    llm,
+    learner_profile,
+    learning_path,
+    learning_session,
+    knowledge_points,
+    allow_parallel: bool = True,
+    use_search: bool = True,
+    max_workers: int = 8,
+    *,
+    search_rag_manager: Optional[SearchRagManager] = None,
+) -> AsyncIterator[Tuple[int, Any]]:
+    """Yield ``(index, draft)`` for each knowledge point as soon as its draft is ready.
+
+    Drafts arrive in completion order, not in the order of *knowledge_points*.
+    With *allow_parallel* at most *max_workers* drafts run at a time. Drafts
+    still running are cancelled if the consumer stops early.
+    """
+    if isinstance(learning_session, str):
+        learning_session = ast.literal_eval(learning_session)
+    if isinstance(knowledge_points, str):
+        knowledge_points = ast.literal_eval(knowledge_points)
+    if search_rag_manager is None and use_search:
+        # the first call in a process loads the embedding model
+        search_rag_manager = await asyncio.to_thread(resource_registry.get_search_rag_manager, default_config)
+    semaphore = asyncio.Semaphore(max_workers if allow_parallel else 1)
+
+    async def draft_one(index, kp):
+        async with semaphore:
+            return index, await adraft_knowledge_point_with_llm(
+                llm,
+                learner_profile,
+                learning_path,
+                learning_session,
+                knowledge_points,
+                kp,
+                use_search=use_search,
+                search_rag_manager=search_rag_manager,
+            )
+
+    tasks = [asyncio.create_task(draft_one(i, kp)) for i, kp in enumerate(knowledge_points)]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def adraft_knowledge_points_with_llm(
+    llm,
+    learner_profile,
+    learning_path,
+    learning_session,
+    knowledge_points,
+    allow_parallel: bool = True,
+    use_search: bool = True,
+    max_workers: int = 8,
+    *,
+    search_rag_manager: Optional[SearchRagManager] = None,
+):
+    """Async counterpart of :func:`draft_knowledge_points_with_llm`.
+
+    With *allow_parallel* the drafts run concurrently on the event loop, at
+    most *max_workers* at a time.
+    """
+    if isinstance(knowledge_points, str):
+        knowledge_points = ast.literal_eval(knowledge_points)
+    drafts: List[Any] = [None] * len(knowledge_points)
+    async for index, draft in aiter_knowledge_point_drafts_with_llm(
+        llm,
+        learner_profile,
+        learning_path,
+        learning_session,
+        knowledge_points,
+        allow_parallel=allow_parallel,
+        use_search=use_search,
+        max_workers=max_workers,
+        search_rag_manager=search_rag_manager,
+    ):
+        drafts[index] = draft
+    return drafts
+
+
 if __name__ == "__main__":
     from config.loader import default_config
     from base.llm_factory import LLMFactory
@@ -3,7 +3,9 @@ from __future__ import annotations
 from enum import Enum
 from typing import List, Sequence
 
-from pydantic import BaseModel, Field, RootModel, field_validator
+from pydantic import BaseModel, Field, RootModel, ValidationInfo, field_validator
+
+from utils.schema_repair import note_repair, repairing
 
 
 class Proficiency(str, Enum):
@@ -36,7 +38,10 @@ class LearningPath(BaseModel):
 
     @field_validator("learning_path")
     @classmethod
-    def limit_sessions(cls, v: List[SessionItem]) -> List[SessionItem]:
+    def limit_sessions(cls, v: List[SessionItem], info: ValidationInfo) -> List[SessionItem]:
+        if len(v) > 10 and repairing(info):
+            note_repair(info, f"learning_path: kept the first 10 of {len(v)} sessions")
+            v = v[:10]
         if not (1 <= len(v) <= 10):
             raise ValueError("Learning path must contain between 1 and 10 sessions.")
         return v
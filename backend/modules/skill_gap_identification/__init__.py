@@ -10,4 +10,7 @@ __all__ = [
 	"identify_skill_gap_with_llm",
 	"refine_learning_goal_with_llm",
 	"map_goal_to_skills_with_llm",
+	"aidentify_skill_gap_with_llm",
+	"arefine_learning_goal_with_llm",
+	"amap_goal_to_skills_with_llm",
 ]
\ No newline at end of file
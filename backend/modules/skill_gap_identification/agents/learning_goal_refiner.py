@@ -26,17 +26,37 @@ class LearningGoalRefiner(BaseAgent):
 	def __init__(self, model: Any) -> None:
 		super().__init__(model=model, system_prompt=learning_goal_refiner_system_prompt, jsonalize_output=True)
 
+	def _refine_request(self, input_dict: Mapping[str, Any]) -> JSONDict:
+		"""``invoke`` arguments of :meth:`refine_goal` and :meth:`arefine_goal`."""
+		return {
+			"input_dict": RefineGoalPayload(**input_dict).model_dump(),
+			"task_prompt": learning_goal_refiner_task_prompt,
+			"output_schema": RefinedLearningGoal,
+		}
+
 	def refine_goal(
 		self,
 		input_dict: Mapping[str, Any],
 	) -> JSONDict:
 		"""Refine a learner's goal using contextual learner information."""
 
-		payload_dict = RefineGoalPayload(**input_dict).model_dump()
-		task_prompt = learning_goal_refiner_task_prompt
-		raw_output = self.invoke(payload_dict, task_prompt=task_prompt)
-		validated = RefinedLearningGoal.model_validate(raw_output)
-		return validated.model_dump()
+		return self.run_task(self._refine_request(input_dict))
+
+	async def arefine_goal(
+		self,
+		input_dict: Mapping[str, Any],
+	) -> JSONDict:
+		"""Async counterpart of :meth:`refine_goal`."""
+
+		return await self.arun_task(self._refine_request(input_dict))
+
+
+def _refine_payload(learning_goal: str, learner_information: str) -> JSONDict:
+	return {
+		"learning_goal": learning_goal,
+		"learner_information": learner_information,
+	}
+
 
 def refine_learning_goal_with_llm(
 	llm: Any,
@@ -46,9 +66,15 @@ def refine_learning_goal_with_llm(
 	"""Refine a learner's goal using the provided LLM."""
 
 	refiner = LearningGoalRefiner(llm)
-	return refiner.refine_goal(
-		{
-			"learning_goal": learning_goal,
-			"learner_information": learner_information,
-		}
-	)
+	return refiner.refine_goal(_refine_payload(learning_goal, learner_information))
+
+
+async def arefine_learning_goal_with_llm(
+	llm: Any,
+	learning_goal: str,
+	learner_information: str = "",
+) -> JSONDict:
+	"""Async counterpart of :func:`refine_learning_goal_with_llm`."""
+
+	refiner = LearningGoalRefiner(llm)
+	return await refiner.arefine_goal(_refine_payload(learning_goal, learner_information))
@@ -31,16 +31,36 @@ class SkillGapIdentifier(BaseAgent):
             jsonalize_output=True,
         )
 
+    def _skill_gap_request(self, input_dict: Mapping[str, Any]) -> JSONDict:
+        """``invoke`` arguments of :meth:`identify_skill_gap` and :meth:`aidentify_skill_gap`."""
+        return {
+            "input_dict": SkillGapPayload(**input_dict).model_dump(),
+            "task_prompt": skill_gap_identifier_task_prompt,
+            "output_schema": SkillGaps,
+        }
+
     def identify_skill_gap(
         self,
         input_dict: Mapping[str, Any],
     ) -> JSONDict:
         """Identify knowledge gaps using learner information and expected skills."""
-        payload_dict = SkillGapPayload(**input_dict).model_dump()
-        task_prompt = skill_gap_identifier_task_prompt
-        raw_output = self.invoke(payload_dict, task_prompt=task_prompt)
-        validated = SkillGaps.model_validate(raw_output)
-        return validated.model_dump()
+        return self.run_task(self._skill_gap_request(input_dict))
+
+    async def aidentify_skill_gap(
+        self,
+        input_dict: Mapping[str, Any],
+    ) -> JSONDict:
+        """Async counterpart of :meth:`identify_skill_gap`."""
+        return await self.arun_task(self._skill_gap_request(input_dict))
+
+
+def _skill_gap_payload(learning_goal: str, learner_information: str, skill_requirements: JSONDict) -> JSONDict:
+    return {
+        "learning_goal": learning_goal,
+        "learner_information": learner_information,
+        "skill_requirements": skill_requirements,
+    }
+
 
 def identify_skill_gap_with_llm(
     llm: Any,
@@ -59,11 +79,28 @@ def identify_skill_gap_with_llm(
 
     skill_gap_identifier = SkillGapIdentifier(llm)
     skill_gaps = skill_gap_identifier.identify_skill_gap(
-        {
-            "learning_goal": learning_goal,
-            "learner_information": learner_information,
-            "skill_requirements": effective_requirements,
-        },
+        _skill_gap_payload(learning_goal, learner_information, effective_requirements)
+    )
+    return skill_gaps, effective_requirements
+
+
+async def aidentify_skill_gap_with_llm(
+    llm: Any,
+    learning_goal: str,
+    learner_information: str,
+    skill_requirements: Optional[Dict[str, Any]] = None,
+) -> Tuple[JSONDict, JSONDict]:
+    """Async counterpart of :func:`identify_skill_gap_with_llm`."""
+
+    if not skill_requirements:
+        mapper = SkillRequirementMapper(llm)
+        effective_requirements = await mapper.amap_goal_to_skill({"learning_goal": learning_goal})
+    else:
+        effective_requirements = skill_requirements
+
+    skill_gap_identifier = SkillGapIdentifier(llm)
+    skill_gaps = await skill_gap_identifier.aidentify_skill_gap(
+        _skill_gap_payload(learning_goal, learner_information, effective_requirements)
     )
     return skill_gaps, effective_requirements
 
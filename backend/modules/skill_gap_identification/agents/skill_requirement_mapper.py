@@ -29,15 +29,26 @@ class SkillRequirementMapper(BaseAgent):
 			jsonalize_output=True,
 		)
 
+	def _goal_request(self, input_dict: Mapping[str, Any]) -> JSONDict:
+		"""``invoke`` arguments of :meth:`map_goal_to_skill` and :meth:`amap_goal_to_skill`."""
+		return {
+			"input_dict": Goal2SkillPayload(**input_dict).model_dump(),
+			"task_prompt": skill_requirement_mapper_task_prompt,
+			"output_schema": SkillRequirements,
+		}
+
 	def map_goal_to_skill(self, input_dict: Mapping[str, Any]) -> JSONDict:
-		payload_dict = Goal2SkillPayload(**input_dict).model_dump()
-		task_prompt = skill_requirement_mapper_task_prompt
-		raw_output = self.invoke(payload_dict, task_prompt=task_prompt)
-		validated = SkillRequirements.model_validate(raw_output)
-		return validated.model_dump()
+		return self.run_task(self._goal_request(input_dict))
+
+	async def amap_goal_to_skill(self, input_dict: Mapping[str, Any]) -> JSONDict:
+		return await self.arun_task(self._goal_request(input_dict))
 
 
 def map_goal_to_skills_with_llm(llm: Any, learning_goal: str) -> JSONDict:
 	mapper = SkillRequirementMapper(llm)
 	return mapper.map_goal_to_skill({"learning_goal": learning_goal})
 
+
+async def amap_goal_to_skills_with_llm(llm: Any, learning_goal: str) -> JSONDict:
+	mapper = SkillRequirementMapper(llm)
+	return await mapper.amap_goal_to_skill({"learning_goal": learning_goal})
@@ -1,6 +1,8 @@
 from enum import Enum
 from typing import List
-from pydantic import BaseModel, Field, RootModel, field_validator
+from pydantic import BaseModel, Field, RootModel, ValidationInfo, field_validator
+
+from utils.schema_repair import note_repair, repairing
 
 
 
@@ -24,6 +26,22 @@ class Confidence(str, Enum):
 
 
 
+def _dedupe_and_cap(items, info: ValidationInfo, field: str, limit: int = 10):
+    """Repair mode: keep the first item per skill name (case-insensitive), then the first *limit*."""
+    seen, kept = set(), []
+    for item in items:
+        key = item.name.strip().lower()
+        if key not in seen:
+            seen.add(key)
+            kept.append(item)
+    if len(kept) < len(items):
+        note_repair(info, f"{field}: dropped {len(items) - len(kept)} duplicate skill name(s)")
+    if len(kept) > limit:
+        note_repair(info, f"{field}: kept the first {limit} of {len(kept)}")
+        kept = kept[:limit]
+    return kept
+
+
 class SkillRequirement(BaseModel):
     name: str = Field(..., description="Actionable, concise skill name.")
     required_level: LevelRequired
@@ -34,7 +52,9 @@ class SkillRequirements(BaseModel):
 
     @field_validator("skill_requirements")
     @classmethod
-    def validate_length_and_uniqueness(cls, v: List[SkillRequirement]):
+    def validate_length_and_uniqueness(cls, v: List[SkillRequirement], info: ValidationInfo):
+        if repairing(info):
+            v = _dedupe_and_cap(v, info, "skill_requirements")
         if not (1 <= len(v) <= 10):
             raise ValueError("Number of skill requirements must be within 1 to 10.")
         seen = set()
@@ -56,9 +76,12 @@ class SkillGap(BaseModel):
 
     @field_validator("reason")
     @classmethod
-    def limit_reason_words(cls, v: str) -> str:
+    def limit_reason_words(cls, v: str, info: ValidationInfo) -> str:
         words = v.split()
         if len(words) > 20:
+            if repairing(info):
+                note_repair(info, "reason: cut to 20 words")
+                return " ".join(words[:20])
             raise ValueError("Reason must be 20 words or fewer.")
         return v
 
@@ -84,7 +107,9 @@ class SkillGaps(BaseModel):
 
     @field_validator("skill_gaps")
     @classmethod
-    def limit_length_and_names(cls, v: List[SkillGap]):
+    def limit_length_and_names(cls, v: List[SkillGap], info: ValidationInfo):
+        if repairing(info):
+            v = _dedupe_and_cap(v, info, "skill_gaps")
         if not (1 <= len(v) <= 10):
             raise ValueError("Number of skill gaps must be within 1 to 10.")
         seen = set()
@@ -0,0 +1,140 @@
+"""Tests for the awaitable store facade used by the FastAPI endpoints.
+
+Run from the repo root:
+    python -m pytest backend/tests/test_async_store.py -v
+"""
+
+import sys
+import os
+import time
+import asyncio
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from utils import store, auth_store, async_store
+from utils.state_patch import StateVersionConflict
+
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def _isolate_stores(tmp_path, monkeypatch):
+    """Point both store modules at a temp directory and reset in-memory state."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    monkeypatch.setattr(store, "_DATA_DIR", data_dir)
+    monkeypatch.setattr(store, "_PROFILES_PATH", data_dir / "profiles.json")
+    monkeypatch.setattr(store, "_EVENTS_PATH", data_dir / "events.json")
+    monkeypatch.setattr(store, "_EVENTS_LOG_PATH", data_dir / "events.log")
+    monkeypatch.setattr(store, "_EVENTS_ARCHIVE_DIR", data_dir / "events_archive")
+    monkeypatch.setattr(store, "_USER_STATES_PATH", data_dir / "user_states.json")
+    monkeypatch.setattr(store, "_USER_STATE_VERSIONS_PATH", data_dir / "user_state_versions.json")
+    monkeypatch.setattr(store, "_profiles", {})
+    monkeypatch.setattr(store, "_profiles_by_user", {})
+    monkeypatch.setattr(store, "_events", {})
+    monkeypatch.setattr(store, "_events_evicted", {})
+    monkeypatch.setattr(store, "_user_states", {})
+    monkeypatch.setattr(store, "_user_state_versions", {})
+    monkeypatch.setattr(store, "_events_log_records", 0)
+    monkeypatch.setattr(store, "_file_stamps", {})
+    monkeypatch.setattr(store, "_events_log_ino", None)
+    monkeypatch.setattr(store, "_events_log_offset", 0)
+    monkeypatch.setattr(store, "_dirty_profiles", {})
+    monkeypatch.setattr(store, "_dirty_user_states", {})
+    monkeypatch.setattr(store, "_dirty_user_state_versions", {})
+    monkeypatch.setattr(store, "_pending_event_records", [])
+    monkeypatch.setattr(store, "_pending_mutations", 0)
+    monkeypatch.setattr(store, "_durability", "immediate")
+    monkeypatch.setattr(store, "_snapshot_format", "json")
+    monkeypatch.setattr(auth_store, "_DATA_DIR", data_dir)
+    monkeypatch.setattr(auth_store, "_USERS_PATH", data_dir / "users.json")
+    monkeypatch.setattr(auth_store, "_users", {})
+    monkeypatch.setattr(auth_store, "_users_stamp", None)
+    yield
+    async_store.shutdown()
+
+
+# ===================================================================
+# Same semantics as the sync store
+# ===================================================================
+
+class TestAsyncStore:
+    def test_profile_round_trip(self):
+        async def scenario():
+            await async_store.upsert_profile("alice", 0, {"goal": "Python"})
+            return await async_store.get_all_profiles_for_user("alice")
+
+        assert asyncio.run(scenario()) == {0: {"goal": "Python"}}
+        assert store.get_profile("alice", 0) == {"goal": "Python"}
+
+    def test_events_and_state(self):
+        async def scenario():
+            await async_store.append_event("alice", {"type": "a"})
+            version = await async_store.put_user_state("alice", {"v": 1})
+            await async_store.patch_user_state("alice", {"v": 2}, expected_version=version)
+            return await async_store.get_events("alice"), await async_store.get_user_state("alice")
+
+        assert asyncio.run(scenario()) == ([{"type": "a"}], {"v": 2})
+
+    def test_exceptions_propagate(self):
+        async def scenario():
+            await async_store.put_user_state("alice", {"v": 1})
+            await async_store.patch_user_state("alice", {"v": 2}, expected_version=0)
+
+        with pytest.raises(StateVersionConflict):
+            asyncio.run(scenario())
+
+    def test_auth_round_trip(self):
+        async def scenario():
+            await async_store.create_user("alice", "secret123")
+            with pytest.raises(ValueError):
+                await async_store.create_user("alice", "secret123")
+            return await async_store.verify_password("alice", "secret123")
+
+        assert asyncio.run(scenario()) is True
+
+    def test_patched_store_function_is_used(self, monkeypatch):
+        monkeypatch.setattr(store, "get_events", lambda user_id: ["patched", user_id])
+        assert asyncio.run(async_store.get_events("alice")) == ["patched", "alice"]
+
+
+# ===================================================================
+# Event loop stays free
+# ===================================================================
+
+class TestOffloading:
+    def test_runs_on_store_io_threads(self, monkeypatch):
+        seen = []
+        monkeypatch.setattr(store, "get_events", lambda user_id: seen.append(threading.current_thread().name))
+        asyncio.run(async_store.get_events("alice"))
+        assert seen[0].startswith("store-io")
+
+    def test_slow_write_does_not_block_loop(self, monkeypatch):
+        original = store.upsert_profile
+
+        def slow_upsert(*args):
+            time.sleep(0.3)
+            original(*args)
+
+        monkeypatch.setattr(store, "upsert_profile", slow_upsert)
+
+        async def scenario():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            await async_store.upsert_profile("alice", 0, {"goal": "Python"})
+            task.cancel()
+            return ticks
+
+        assert asyncio.run(scenario()) >= 10
+        assert store.get_profile("alice", 0) == {"goal": "Python"}
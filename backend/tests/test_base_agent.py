@@ -0,0 +1,515 @@
+"""Tests for BaseAgent's invocation paths, the compiled agent registry and the response caches.
+
+Uses LangChain's fake chat model, so no provider credentials are needed.
+
+Run from the repo root:
+    python -m pytest backend/tests/test_base_agent.py -v
+"""
+
+import sys
+import os
+import time
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel, FakeMessagesListChatModel
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel, Field, ValidationError
+from langchain_core.embeddings import Embeddings
+from base import BaseAgent, agent_registry, agent_stats, response_cache
+from base.semantic_cache import SemanticCache
+from utils.llm_output import ThinkStripper
+from modules.ai_chatbot_tutor import (
+    achat_with_tutor_with_llm,
+    astream_chat_with_tutor_with_llm,
+    chat_with_tutor_with_llm,
+)
+from modules.personalized_resource_delivery import (
+    asimulate_path_feedback_with_llm,
+    simulate_path_feedback_with_llm,
+)
+
+
+def _agent(responses, sleep=None, **kwargs):
+    return BaseAgent(FakeListChatModel(responses=responses, sleep=sleep), system_prompt="system", **kwargs)
+
+
+# ===================================================================
+# invoke / ainvoke
+# ===================================================================
+
+class TestInvoke:
+    def test_parses_json(self):
+        agent = _agent(['{"a": 1}'])
+        assert agent.invoke({"x": 1}, task_prompt="task {x}") == {"a": 1}
+
+    def test_text_output(self):
+        agent = _agent(["plain reply"], jsonalize_output=False)
+        assert agent.invoke({}, task_prompt="task") == "plain reply"
+
+    def test_retries_unparseable_json(self):
+        agent = _agent(["not json", '{"a": 2}'])
+        assert agent.invoke({}, task_prompt="task") == {"a": 2}
+
+    def test_raises_after_retries(self):
+        agent = _agent(["nope", "still nope"])
+        with pytest.raises(json.JSONDecodeError):
+            agent.invoke({}, task_prompt="task", max_retries=1)
+
+
+class TestAinvoke:
+    def test_parses_json(self):
+        agent = _agent(['{"a": 1}'])
+        assert asyncio.run(agent.ainvoke({"x": 1}, task_prompt="task {x}")) == {"a": 1}
+
+    def test_retries_unparseable_json(self):
+        agent = _agent(["not json", '{"a": 2}'])
+        assert asyncio.run(agent.ainvoke({}, task_prompt="task")) == {"a": 2}
+
+    def test_raises_after_retries(self):
+        agent = _agent(["nope", "still nope"])
+        with pytest.raises(json.JSONDecodeError):
+            asyncio.run(agent.ainvoke({}, task_prompt="task", max_retries=1))
+
+    def test_concurrent_calls_overlap(self):
+        agents = [_agent(['{"a": 1}'], sleep=0.3) for _ in range(4)]
+
+        async def run_all():
+            return await asyncio.gather(*(agent.ainvoke({}, task_prompt="task") for agent in agents))
+
+        start = time.perf_counter()
+        assert asyncio.run(run_all()) == [{"a": 1}] * 4
+        # four sequential calls would take 1.2s
+        assert time.perf_counter() - start < 0.9
+
+
+class TestAstream:
+    @staticmethod
+    def _collect(stream):
+        async def run():
+            return [chunk async for chunk in stream]
+        return asyncio.run(run())
+
+    def test_yields_incremental_chunks(self):
+        agent = _agent(["hello tutor"], jsonalize_output=False)
+        chunks = self._collect(agent.astream({}, task_prompt="task"))
+        assert len(chunks) > 1
+        assert "".join(chunks) == "hello tutor"
+
+    def test_drops_think_block(self):
+        agent = _agent(["<think>hmm</think>\nanswer"], jsonalize_output=False)
+        assert "".join(self._collect(agent.astream({}, task_prompt="task"))) == "answer"
+
+    def test_json_agent_refuses_to_stream(self):
+        with pytest.raises(ValueError):
+            self._collect(_agent(['{"a": 1}']).astream({}, task_prompt="task"))
+
+    def test_think_stripper_handles_split_tags(self):
+        stripper = ThinkStripper()
+        pieces = ["<th", "ink>plan", "ning</thi", "nk> vis", "ible <", "b>"]
+        assert "".join(stripper.feed(p) for p in pieces) + stripper.flush() == "visible <b>"
+
+
+# ===================================================================
+# Native structured output
+# ===================================================================
+
+class Draft(BaseModel):
+    title: str
+    content: str
+
+
+class _ToolCallingModel(FakeMessagesListChatModel):
+    """Fake chat model that accepts tool binding, like provider chat models."""
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def _tool_call(args, name="Draft"):
+    return AIMessage(content="", tool_calls=[{"name": name, "args": args, "id": "call-1"}])
+
+
+class TestStructuredOutput:
+    @pytest.fixture(autouse=True)
+    def _fresh_stats(self):
+        agent_stats.clear()
+        yield
+        agent_stats.clear()
+
+    def test_tool_call_is_returned_without_text_parsing(self):
+        agent = BaseAgent(_ToolCallingModel(responses=[_tool_call({"title": "t", "content": "c"})]), system_prompt="system")
+        assert agent.invoke({}, task_prompt="task", output_schema=Draft) == {"title": "t", "content": "c"}
+        assert asyncio.run(agent.ainvoke({}, task_prompt="task", output_schema=Draft)) == {"title": "t", "content": "c"}
+        counters = agent_stats.stats()["BaseAgent"]
+        assert counters["calls"] == counters["structured"] == 2
+        assert counters["retries"] == counters["fallbacks"] == 0
+
+    def test_falls_back_to_text_when_no_tool_call_comes(self):
+        model = _ToolCallingModel(responses=[AIMessage(content='{"title": "t", "content": "c"}')])
+        agent = BaseAgent(model, system_prompt="system")
+        assert agent.invoke({}, task_prompt="task", output_schema=Draft) == {"title": "t", "content": "c"}
+        assert agent_stats.stats()["BaseAgent"]["fallbacks"] == 1
+
+    def test_invalid_tool_call_falls_back_to_text(self):
+        model = _ToolCallingModel(responses=[_tool_call({"title": "t"})])
+        agent = BaseAgent(model, system_prompt="system")
+        # the structured call gives up, and the text path gets the (empty) tool-call message
+        with pytest.raises(json.JSONDecodeError):
+            agent.invoke({}, task_prompt="task", output_schema=Draft, max_retries=0)
+        assert agent_stats.stats()["BaseAgent"]["fallbacks"] == 1
+
+    def test_programming_errors_are_not_retried_as_text(self):
+        class _BrokenModel(_ToolCallingModel):
+            calls: int = 0
+
+            def _generate(self, *args, **kwargs):
+                self.calls += 1
+                raise TypeError("bug in the client")
+
+        model = _BrokenModel(responses=[])
+        with pytest.raises(TypeError):
+            BaseAgent(model, system_prompt="system").invoke({}, task_prompt="task", output_schema=Draft)
+        assert model.calls == 1
+        assert agent_stats.stats()["BaseAgent"]["fallbacks"] == 0
+
+    def test_models_without_tool_calling_parse_text(self):
+        agent = _agent(['{"title": "t", "content": "c"}'])
+        assert agent.invoke({}, task_prompt="task", output_schema=Draft) == {"title": "t", "content": "c"}
+        assert agent_stats.stats()["BaseAgent"]["structured"] == 0
+
+    def test_can_be_disabled(self, monkeypatch):
+        model = _ToolCallingModel(responses=[AIMessage(content='{"title": "t", "content": "c"}')])
+        agent = BaseAgent(model, system_prompt="system", structured_output=False)
+        assert agent.invoke({}, task_prompt="task", output_schema=Draft) == {"title": "t", "content": "c"}
+        monkeypatch.setattr(BaseAgent, "structured_output_enabled", False)
+        assert BaseAgent(model, system_prompt="system")._structured_schema(Draft) is None
+        assert agent_stats.stats()["BaseAgent"]["fallbacks"] == 0
+
+    def test_retries_and_failures_are_counted(self):
+        _agent(["nope", '{"a": 2}']).invoke({}, task_prompt="task")
+        with pytest.raises(json.JSONDecodeError):
+            _agent(["nope", "still nope"]).invoke({}, task_prompt="task", max_retries=1)
+        counters = agent_stats.stats()["BaseAgent"]
+        assert counters["calls"] == 2
+        assert counters["retries"] == 2
+        assert counters["failures"] == 1
+        assert counters["retries_per_call"] == 1.0
+
+
+# ===================================================================
+# Repair of output that fails schema validation
+# ===================================================================
+
+class Rated(BaseModel):
+    title: str = Field(..., max_length=10)
+    score: int = Field(..., ge=1, le=5)
+    tags: list = Field(default_factory=list, max_length=2)
+
+
+class Scored(Draft):
+    score: int = Field(..., ge=1)
+
+
+class TestValidationRepair:
+    @pytest.fixture(autouse=True)
+    def _fresh_stats(self):
+        agent_stats.clear()
+        yield
+        agent_stats.clear()
+
+    def test_bounds_and_lengths_are_fixed_without_another_call(self):
+        agent = _agent(['{"title": "far too long a title", "score": 9, "tags": ["a", "b", "c"]}'])
+        result = agent.invoke({}, task_prompt="task", output_schema=Rated)
+        assert result == {"title": "far too lo", "score": 5, "tags": ["a", "b"]}
+        counters = agent_stats.stats()["BaseAgent"]
+        assert counters["repaired"] == 1
+        assert counters["retries"] == 0
+
+    def test_valid_output_is_returned_unchanged(self):
+        agent = _agent(['{"title": "ok", "score": 3, "extra": true}'])
+        assert agent.invoke({}, task_prompt="task", output_schema=Rated) == {"title": "ok", "score": 3, "extra": True}
+        assert agent_stats.stats()["BaseAgent"]["repaired"] == 0
+
+    def test_retry_asks_only_for_failing_fields(self):
+        llm = FakeListChatModel(responses=['{"title": "ok", "score": "high", "tags": ["a"]}', '{"score": 4}'])
+        agent = BaseAgent(llm, system_prompt="system", jsonalize_output=True)
+        assert agent.invoke({}, task_prompt="task", output_schema=Rated) == {"title": "ok", "score": 4, "tags": ["a"]}
+        assert agent_stats.stats()["BaseAgent"]["retries"] == 1
+
+    def test_feedback_names_the_failing_path(self):
+        prompts = []
+        llm = FakeListChatModel(responses=['{"title": "ok", "score": "high"}', '{"score": 2}'])
+        agent = BaseAgent(llm, system_prompt="system", jsonalize_output=True)
+        original = agent._retry_prompt
+        agent._retry_prompt = lambda *args: prompts.append(args[2]) or original(*args)
+        agent.invoke({}, task_prompt="task", output_schema=Rated)
+        assert "`score`" in prompts[0] and '"high"' in prompts[0]
+        assert "`title`" not in prompts[0]
+
+    def test_raises_when_retries_run_out(self):
+        agent = _agent(['{"title": "ok"}', '{"title": "still no score"}'])
+        with pytest.raises(ValidationError):
+            agent.invoke({}, task_prompt="task", output_schema=Rated, max_retries=1)
+        assert agent_stats.stats()["BaseAgent"]["failures"] == 1
+
+    def test_tool_call_arguments_are_repaired(self):
+        model = _ToolCallingModel(responses=[_tool_call({"title": "t", "content": "c", "score": 0}, name="Scored")])
+        agent = BaseAgent(model, system_prompt="system")
+        assert agent.invoke({}, task_prompt="task", output_schema=Scored) == {"title": "t", "content": "c", "score": 1}
+        assert agent_stats.stats()["BaseAgent"]["structured"] == 1
+
+
+# ===================================================================
+# async *_with_llm helpers
+# ===================================================================
+
+class TestAsyncHelpers:
+    FEEDBACK = '{"feedback": {"progression": "ok", "engagement": "ok", "personalization": "ok"}, "suggestions": {"progression": "", "engagement": "", "personalization": ""}}'
+
+    def test_matches_sync_helper(self):
+        llm = FakeListChatModel(responses=[self.FEEDBACK])
+        expected = simulate_path_feedback_with_llm(llm, {"name": "alice"}, [])
+        result = asyncio.run(asimulate_path_feedback_with_llm(llm, {"name": "alice"}, []))
+        assert result == expected
+
+
+class TestRunTask:
+    REQUEST = {"input_dict": {"topic": "loops"}, "task_prompt": "draft {topic}", "output_schema": Draft}
+    REPLY = '{"title": "Loops", "content": "for and while", "extra": 1}'
+
+    def test_sync_and_async_agree(self):
+        sync_llm = FakeListChatModel(responses=[self.REPLY])
+        async_llm = FakeListChatModel(responses=[self.REPLY])
+        sync_agent = BaseAgent(sync_llm, system_prompt="system", jsonalize_output=True)
+        async_agent = BaseAgent(async_llm, system_prompt="system", jsonalize_output=True)
+        assert sync_agent.run_task(self.REQUEST) == asyncio.run(async_agent.arun_task(self.REQUEST))
+
+    def test_result_is_validated_against_the_schema(self):
+        agent = _agent([self.REPLY])
+        assert agent.run_task(self.REQUEST) == {"title": "Loops", "content": "for and while"}
+
+    def test_without_schema_the_reply_is_returned_as_is(self):
+        agent = _agent(["plain reply"], jsonalize_output=False)
+        assert asyncio.run(agent.arun_task({"input_dict": {}, "task_prompt": "task"})) == "plain reply"
+
+
+# ===================================================================
+# Compiled agent registry
+# ===================================================================
+
+class TestAgentRegistry:
+    @pytest.fixture(autouse=True)
+    def _empty_registry(self):
+        agent_registry.clear()
+        yield
+        agent_registry.clear()
+
+    def test_agents_share_compiled_graph(self):
+        llm = FakeListChatModel(responses=['{"a": 1}'])
+        first = BaseAgent(llm, system_prompt="system")
+        second = BaseAgent(llm, system_prompt="system")
+        assert first._agent is second._agent
+        assert agent_registry.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+    def test_different_model_or_prompt_builds_new_graph(self):
+        llm = FakeListChatModel(responses=['{"a": 1}'])
+        base = BaseAgent(llm, system_prompt="system")._agent
+        assert BaseAgent(llm, system_prompt="other")._agent is not base
+        assert BaseAgent(FakeListChatModel(responses=['{"a": 1}']), system_prompt="system")._agent is not base
+
+    def test_set_prompts_switches_graph(self):
+        llm = FakeListChatModel(responses=['{"a": 1}'])
+        agent = BaseAgent(llm, system_prompt="system")
+        before = agent._agent
+        agent.set_prompts(system_prompt="other")
+        assert agent._agent is not before
+        assert BaseAgent(llm, system_prompt="other")._agent is agent._agent
+
+    def test_shared_graph_is_thread_safe(self):
+        llm = FakeListChatModel(responses=['{"a": 1}'], sleep=0.05)
+        agents = [BaseAgent(llm, system_prompt="system") for _ in range(8)]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda agent: agent.invoke({}, task_prompt="task"), agents))
+        assert results == [{"a": 1}] * 8
+        assert agent_registry.stats()["misses"] == 1
+
+
+# ===================================================================
+# Persistent response cache
+# ===================================================================
+
+class _GreedyModel(FakeListChatModel):
+    temperature: float = 0
+
+
+def _cached_agent(responses, **kwargs):
+    return BaseAgent(_GreedyModel(responses=responses), system_prompt="system", cache_responses=True, **kwargs)
+
+
+class TestResponseCache:
+    @pytest.fixture(autouse=True)
+    def _cache_in_tmp(self, tmp_path):
+        response_cache.configure({"llm_cache": {"path": str(tmp_path / "llm_cache.db"), "agents": ["Mapper"]}})
+        response_cache._agent_stats.clear()
+        yield
+        response_cache.configure({})
+
+    def test_disabled_by_default(self):
+        agent = _agent(['{"a": 1}', '{"a": 2}'])
+        assert agent.invoke({}, task_prompt="task") == {"a": 1}
+        assert agent.invoke({}, task_prompt="task") == {"a": 2}
+
+    def test_repeated_call_is_served_from_cache(self):
+        agent = _cached_agent(['{"a": 1}', '{"a": 2}'])
+        assert agent.invoke({"x": 1}, task_prompt="task {x}") == {"a": 1}
+        assert agent.invoke({"x": 1}, task_prompt="task {x}") == {"a": 1}
+        assert asyncio.run(agent.ainvoke({"x": 1}, task_prompt="task {x}")) == {"a": 1}
+        assert response_cache.stats()["agents"]["BaseAgent"] == {"hits": 2, "misses": 1, "hit_ratio": 2 / 3}
+
+    def test_different_prompt_misses(self):
+        agent = _cached_agent(['{"a": 1}', '{"a": 2}'])
+        assert agent.invoke({"x": 1}, task_prompt="task {x}") == {"a": 1}
+        assert agent.invoke({"x": 2}, task_prompt="task {x}") == {"a": 2}
+        other = BaseAgent(_GreedyModel(responses=['{"a": 3}']), system_prompt="other", cache_responses=True)
+        assert other.invoke({"x": 1}, task_prompt="task {x}") == {"a": 3}
+
+    def test_enabled_through_config(self):
+        class Mapper(BaseAgent):
+            name = "Mapper"
+
+        agent = Mapper(_GreedyModel(responses=['{"a": 1}', '{"a": 2}']), system_prompt="system")
+        agent.invoke({}, task_prompt="task")
+        assert agent.invoke({}, task_prompt="task") == {"a": 1}
+        assert response_cache.stats()["agents"]["Mapper"]["hits"] == 1
+
+    def test_sampling_models_are_not_cached(self):
+        class Sampling:
+            temperature = 0.7
+
+        assert response_cache.is_deterministic(_GreedyModel(responses=["x"]))
+        assert not response_cache.is_deterministic(Sampling())
+
+    def test_unset_temperature_is_not_cached(self):
+        assert not response_cache.is_deterministic(FakeListChatModel(responses=["x"]))
+        agent = _agent(['{"a": 1}', '{"a": 2}'], cache_responses=True)
+        agent.invoke({}, task_prompt="task")
+        assert agent.invoke({}, task_prompt="task") == {"a": 2}
+
+    def test_failed_parse_is_not_cached(self):
+        agent = _cached_agent(["nope", '{"a": 1}'])
+        with pytest.raises(json.JSONDecodeError):
+            agent.invoke({}, task_prompt="task", max_retries=0)
+        assert agent.invoke({}, task_prompt="task", max_retries=0) == {"a": 1}
+
+
+# ===================================================================
+# Semantic tutor answer cache
+# ===================================================================
+
+class _KeywordEmbeddings(Embeddings):
+    """Embeds text as counts of a few keywords, so similarity is predictable."""
+
+    WORDS = ("python", "list", "dict", "loop", "class")
+
+    def embed_query(self, text):
+        text = text.lower()
+        return [float(text.count(word)) for word in self.WORDS] + [0.1]
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+
+PROFILE = {
+    "learning_goal": "Learn Python",
+    "cognitive_status": {"overall_progress": 10},
+    "learning_preferences": {"content_style": "Concrete", "activity_type": "Hands-on"},
+}
+
+
+def _ask(llm, cache, question, profile=PROFILE, **kwargs):
+    messages = [{"role": "user", "content": question}]
+    return chat_with_tutor_with_llm(llm, messages, profile, answer_cache=cache, **kwargs)
+
+
+class _NamedModel(FakeListChatModel):
+    model_name: str = ""
+
+
+class TestSemanticCache:
+    @pytest.fixture()
+    def cache(self):
+        return SemanticCache(_KeywordEmbeddings(), similarity_threshold=0.95, max_entries=10)
+
+    def test_similar_question_is_answered_from_cache(self, cache):
+        llm = FakeListChatModel(responses=["first answer", "second answer"])
+        assert _ask(llm, cache, "What is a Python list?") == "first answer"
+        assert _ask(llm, cache, "what's a python list??") == "first answer"
+        assert cache.stats()["hits"] == 1
+
+    def test_unrelated_question_misses(self, cache):
+        llm = FakeListChatModel(responses=["first answer", "second answer"])
+        _ask(llm, cache, "What is a Python list?")
+        assert _ask(llm, cache, "How does a dict loop work?") == "second answer"
+
+    def test_different_profile_bucket_misses(self, cache):
+        llm = FakeListChatModel(responses=["first answer", "second answer"])
+        _ask(llm, cache, "What is a Python list?")
+        other = {**PROFILE, "cognitive_status": {"overall_progress": 90}}
+        assert _ask(llm, cache, "What is a Python list?", profile=other) == "second answer"
+
+    def test_different_model_misses(self, cache):
+        _ask(_NamedModel(model_name="model-a", responses=["first answer"]), cache, "What is a Python list?")
+        other = _NamedModel(model_name="model-b", responses=["second answer"])
+        assert _ask(other, cache, "What is a Python list?") == "second answer"
+
+    def test_search_setting_is_part_of_the_bucket(self, cache):
+        llm = FakeListChatModel(responses=["first answer", "second answer"])
+        _ask(llm, cache, "What is a Python list?", use_search=False)
+        assert _ask(llm, cache, "What is a Python list?", use_search=True) == "second answer"
+
+    def test_embedder_failure_is_a_miss(self, cache, monkeypatch):
+        def fail(text):
+            raise RuntimeError("embedder down")
+
+        monkeypatch.setattr(cache, "embed", fail)
+        llm = FakeListChatModel(responses=["first answer", "second answer"])
+        assert _ask(llm, cache, "What is a Python list?") == "first answer"
+        assert _ask(llm, cache, "What is a Python list?") == "second answer"
+
+    def test_bypass_flag(self, cache):
+        llm = FakeListChatModel(responses=["first answer", "second answer"])
+        _ask(llm, cache, "What is a Python list?")
+        assert _ask(llm, cache, "What is a Python list?", use_cache=False) == "second answer"
+
+    def test_async_chat_uses_cache(self, cache):
+        llm = FakeListChatModel(responses=["first answer", "second answer"])
+        messages = [{"role": "user", "content": "What is a Python list?"}]
+        first = asyncio.run(achat_with_tutor_with_llm(llm, messages, PROFILE, answer_cache=cache))
+        second = asyncio.run(achat_with_tutor_with_llm(llm, messages, PROFILE, answer_cache=cache))
+        assert first == second == "first answer"
+
+    def test_eviction_and_expiry(self):
+        cache = SemanticCache(_KeywordEmbeddings(), max_entries=2, ttl_seconds=0.2)
+        for word in ("python", "list", "dict"):
+            cache.put("bucket", cache.embed(word), word)
+        assert cache.stats()["entries"] == 2
+        assert cache.get("bucket", cache.embed("python")) is None
+        assert cache.get("bucket", cache.embed("dict")) == "dict"
+        time.sleep(0.3)
+        assert cache.get("bucket", cache.embed("dict")) is None
+        assert cache.stats()["entries"] == 0
+
+    def test_streamed_reply_is_cached(self, cache):
+        llm = FakeListChatModel(responses=["first answer", "second answer"])
+        messages = [{"role": "user", "content": "What is a Python list?"}]
+
+        async def stream():
+            return [c async for c in astream_chat_with_tutor_with_llm(llm, messages, PROFILE, answer_cache=cache)]
+
+        assert "".join(asyncio.run(stream())) == "first answer"
+        assert asyncio.run(stream()) == ["first answer"]
@@ -0,0 +1,132 @@
+"""Tests for the streamed content-generation pipeline.
+
+A fake chat model answers each pipeline agent by its system prompt, so no
+provider credentials are needed.
+
+Run from the repo root:
+    python -m pytest backend/tests/test_content_pipeline.py -v
+"""
+
+import sys
+import os
+import asyncio
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from modules.personalized_resource_delivery import (
+    acreate_learning_content_with_llm,
+    aiter_knowledge_point_drafts_with_llm,
+    astream_learning_content_with_llm,
+)
+from modules.personalized_resource_delivery.prompts.document_quiz_generator import document_quiz_generator_system_prompt
+from modules.personalized_resource_delivery.prompts.goal_oriented_knowledge_explorer import goal_oriented_knowledge_explorer_system_prompt
+from modules.personalized_resource_delivery.prompts.learning_document_integrator import integrated_document_generator_system_prompt
+from modules.personalized_resource_delivery.prompts.search_enhanced_knowledge_drafter import search_enhanced_knowledge_drafter_system_prompt
+
+
+KNOWLEDGE_POINTS = [
+    {"name": "Slow Point", "type": "foundational"},
+    {"name": "Fast Point", "type": "practical"},
+]
+# seconds each draft takes; the second one finishes first
+DRAFT_DELAYS = {"Slow Point": 0.3, "Fast Point": 0.05}
+
+
+class _PipelineModel(BaseChatModel):
+    """Replies according to which pipeline agent (system prompt) is calling."""
+
+    @property
+    def _llm_type(self) -> str:
+        return "pipeline-fake"
+
+    def _reply(self, messages):
+        system, prompt = messages[0].content, messages[-1].content
+        if system == goal_oriented_knowledge_explorer_system_prompt:
+            return {"knowledge_points": KNOWLEDGE_POINTS}, 0
+        if system == search_enhanced_knowledge_drafter_system_prompt:
+            selected = prompt.split("**Selected Knowledge Point for Drafting**:")[1]
+            name = next(name for name in DRAFT_DELAYS if name in selected)
+            return {"title": name, "content": f"About {name}."}, DRAFT_DELAYS[name]
+        if system == integrated_document_generator_system_prompt:
+            return {"title": "Doc", "overview": "Overview.", "summary": "Summary."}, 0
+        if system == document_quiz_generator_system_prompt:
+            return {"single_choice_questions": [{"question": "Q?", "options": ["a", "b"], "correct_option": 0}]}, 0
+        raise AssertionError("unexpected agent")
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        reply, _ = self._reply(messages)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=json.dumps(reply)))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        reply, delay = self._reply(messages)
+        await asyncio.sleep(delay)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=json.dumps(reply)))])
+
+
+def _stream(**kwargs):
+    async def run():
+        return [
+            item async for item in astream_learning_content_with_llm(
+                _PipelineModel(), {"name": "alice"}, [], {"title": "Session"},
+                use_search=False, search_rag_manager=object(), **kwargs,
+            )
+        ]
+    return asyncio.run(run())
+
+
+# ===================================================================
+# astream_learning_content_with_llm
+# ===================================================================
+
+class TestContentStream:
+    def test_emits_every_stage_in_order(self):
+        events = [event for event, _ in _stream()]
+        assert events == ["knowledge_points", "draft", "draft", "document", "quizzes", "done"]
+
+    def test_drafts_arrive_as_they_finish(self):
+        drafts = [data for event, data in _stream() if event == "draft"]
+        assert [d["index"] for d in drafts] == [1, 0]
+        assert drafts[0]["knowledge_point"]["name"] == "Fast Point"
+        assert drafts[0]["draft"]["title"] == "Fast Point"
+
+    def test_done_matches_non_streaming_result(self):
+        done = _stream()[-1][1]
+        expected = asyncio.run(acreate_learning_content_with_llm(
+            _PipelineModel(), {"name": "alice"}, [], {"title": "Session"},
+            use_search=False, search_rag_manager=object(),
+        ))
+        assert done == expected
+        # drafts are integrated in knowledge point order, not completion order
+        assert done["document"].index("Slow Point") < done["document"].index("Fast Point")
+        assert len(done["quizzes"]["single_choice_questions"]) == 1
+
+    def test_without_quiz(self):
+        events = [event for event, _ in _stream(with_quiz=False)]
+        assert "quizzes" not in events
+        assert events[-1] == "done"
+
+
+# ===================================================================
+# aiter_knowledge_point_drafts_with_llm
+# ===================================================================
+
+class TestDraftIterator:
+    def test_stopping_early_cancels_remaining_drafts(self):
+        async def first_only():
+            drafts = aiter_knowledge_point_drafts_with_llm(
+                _PipelineModel(), {"name": "alice"}, [], {"title": "Session"}, KNOWLEDGE_POINTS,
+                use_search=False, search_rag_manager=object(),
+            )
+            first = await drafts.__anext__()
+            await drafts.aclose()
+            others = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            await asyncio.sleep(0.01)
+            return first, others
+
+        first, others = asyncio.run(first_only())
+        assert first[0] == 1
+        assert others and all(t.cancelled() for t in others)
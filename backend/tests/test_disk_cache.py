@@ -0,0 +1,81 @@
+"""Tests for the SQLite-backed DiskCache shared by the response caches.
+
+Run from the repo root:
+    python -m pytest backend/tests/test_disk_cache.py -v
+"""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from utils.disk_cache import DiskCache
+
+
+@pytest.fixture()
+def cache_path(tmp_path):
+    return tmp_path / "cache.db"
+
+
+class TestDiskCache:
+    def test_set_and_get(self, cache_path):
+        cache = DiskCache(cache_path)
+        assert cache.get("k") is None
+        cache.set("k", b"value")
+        assert cache.get("k") == b"value"
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_ratio"] == 0.5
+
+    def test_persists_across_instances(self, cache_path):
+        DiskCache(cache_path).set("k", b"value")
+        assert DiskCache(cache_path).get("k") == b"value"
+
+    def test_entries_expire(self, cache_path):
+        cache = DiskCache(cache_path, ttl_seconds=0.2)
+        cache.set("short", b"1")
+        cache.set("long", b"2", ttl_seconds=60)
+        time.sleep(0.3)
+        assert cache.get("short") is None
+        assert cache.get("long") == b"2"
+
+    def test_evicts_least_recently_read_entry(self, cache_path):
+        cache = DiskCache(cache_path, max_entries=2)
+        cache.set("a", b"1")
+        time.sleep(0.01)
+        cache.set("b", b"2")
+        time.sleep(0.01)
+        cache.get("a")
+        time.sleep(0.01)
+        cache.set("c", b"3")
+        assert cache.get("b") is None
+        assert cache.get("a") == b"1"
+        assert cache.get("c") == b"3"
+        assert cache.stats()["evictions"] == 1
+
+    def test_byte_bound(self, cache_path):
+        cache = DiskCache(cache_path, max_bytes=10)
+        cache.set("a", b"x" * 6)
+        time.sleep(0.01)
+        cache.set("b", b"y" * 6)
+        assert cache.get("a") is None
+        assert cache.stats()["bytes"] == 6
+
+    def test_batch_get_and_set(self, cache_path):
+        cache = DiskCache(cache_path, max_entries=2)
+        cache.set_many({"a": b"1", "b": b"2", "c": b"3"})
+        assert cache.stats()["entries"] == 2
+        assert cache.get_many(["b", "c", "missing", "c"]) == {"b": b"2", "c": b"3"}
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+
+    def test_delete_and_clear(self, cache_path):
+        cache = DiskCache(cache_path)
+        cache.set("a", b"1")
+        cache.set("b", b"2")
+        cache.delete("a")
+        assert cache.get("a") is None
+        cache.clear()
+        assert cache.stats()["entries"] == 0
@@ -0,0 +1,167 @@
+"""Tests for the disk-backed embedding cache (CachedEmbeddings).
+
+Run from the repo root:
+    python -m pytest backend/tests/test_embedder_factory.py -v
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+from tokenizers import Tokenizer, models, pre_tokenizers
+from base.embedder_factory import CachedEmbeddings, OnnxEmbeddings
+from utils.disk_cache import DiskCache
+
+
+class _RecordingEmbeddings(Embeddings):
+    """Embeds text as [length, vowel count, 0.5]; records every batch it receives."""
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_documents(self, texts):
+        self.batches.append(list(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text):
+        self.batches.append([text])
+        return self._vector(text)
+
+    @staticmethod
+    def _vector(text):
+        return [float(len(text)), float(sum(c in "aeiou" for c in text)), 0.5]
+
+
+@pytest.fixture
+def inner():
+    return _RecordingEmbeddings()
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "embeddings.db"
+
+
+def _cached(inner, cache_path, **cache_kwargs):
+    return CachedEmbeddings(inner, DiskCache(cache_path, **cache_kwargs), model_name="test-model")
+
+
+class TestCachedEmbeddings:
+    def test_known_texts_skip_the_model(self, inner, cache_path):
+        embedder = _cached(inner, cache_path)
+        first = embedder.embed_documents(["alpha", "beta"])
+        assert embedder.embed_documents(["beta", "alpha"]) == first[::-1]
+        assert inner.batches == [["alpha", "beta"]]
+        assert embedder.stats()["hit_ratio"] == 0.5
+
+    def test_only_missing_texts_are_embedded_in_one_batch(self, inner, cache_path):
+        embedder = _cached(inner, cache_path)
+        embedder.embed_documents(["alpha"])
+        vectors = embedder.embed_documents(["gamma", "alpha", "delta", "gamma"])
+        assert inner.batches[-1] == ["gamma", "delta"]
+        assert vectors[0] == vectors[3] == [5.0, 2.0, 0.5]
+
+    def test_queries_are_cached_apart_from_documents(self, inner, cache_path):
+        embedder = _cached(inner, cache_path)
+        embedder.embed_documents(["what is a loop"])
+        assert embedder.embed_query("what is a loop") == [14.0, 5.0, 0.5]
+        embedder.embed_query("what is a loop")
+        assert inner.batches == [["what is a loop"], ["what is a loop"]]
+
+    def test_vectors_persist_across_instances(self, inner, cache_path):
+        _cached(inner, cache_path).embed_query("persisted")
+        assert _cached(inner, cache_path).embed_query("persisted") == [9.0, 3.0, 0.5]
+        assert len(inner.batches) == 1
+
+    def test_other_model_misses(self, inner, cache_path):
+        cache = DiskCache(cache_path)
+        CachedEmbeddings(inner, cache, model_name="a").embed_query("text")
+        CachedEmbeddings(inner, cache, model_name="b").embed_query("text")
+        assert len(inner.batches) == 2
+
+    def test_cache_is_size_bounded(self, inner, cache_path):
+        embedder = _cached(inner, cache_path, max_entries=3)
+        embedder.embed_documents([f"text {i}" for i in range(10)])
+        assert embedder.stats()["entries"] == 3
+
+
+class TestFromConfig:
+    def test_wraps_with_configured_cache(self, inner, cache_path):
+        config = {"embedding_cache": {"path": str(cache_path), "max_entries": 5}}
+        embedder = CachedEmbeddings.from_config(config, inner, model_name="m")
+        assert isinstance(embedder, CachedEmbeddings)
+        assert embedder.cache.path == cache_path
+        assert embedder.cache.max_entries == 5
+
+    def test_disabled_returns_the_model_itself(self, inner):
+        assert CachedEmbeddings.from_config({"embedding_cache": {"enabled": False}}, inner, model_name="m") is inner
+
+
+# ===================================================================
+# OnnxEmbeddings (batching, padding and pooling around the session)
+# ===================================================================
+
+VOCAB = {"[PAD]": 0, "[CLS]": 1, "a": 2, "b": 3, "c": 4, "d": 5}
+
+
+def _tokenizer():
+    tokenizer = Tokenizer(models.WordLevel(VOCAB, unk_token="[PAD]"))
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    return tokenizer
+
+
+class _Input:
+    def __init__(self, name):
+        self.name = name
+
+
+class _FakeSession:
+    """Stands in for an onnxruntime session: token state = [token id, 1]."""
+
+    def __init__(self, inputs=("input_ids", "attention_mask"), pooled=False):
+        self.inputs = inputs
+        self.pooled = pooled
+        self.feeds = []
+
+    def get_inputs(self):
+        return [_Input(name) for name in self.inputs]
+
+    def run(self, output_names, feeds):
+        self.feeds.append(feeds)
+        ids = feeds["input_ids"].astype(np.float32)
+        states = np.stack([ids, np.ones_like(ids)], axis=-1)
+        return [states.mean(axis=1) if self.pooled else states]
+
+
+class TestOnnxEmbeddings:
+    def test_mean_pooling_ignores_padding(self):
+        embedder = OnnxEmbeddings(_FakeSession(), _tokenizer())
+        alone = embedder.embed_query("a b")
+        batched = embedder.embed_documents(["a b c d", "a b"])
+        assert alone == [2.5, 1.0]
+        assert batched == [[3.5, 1.0], alone]
+
+    def test_batches_group_similar_lengths(self):
+        session = _FakeSession()
+        embedder = OnnxEmbeddings(session, _tokenizer(), batch_size=2)
+        vectors = embedder.embed_documents(["a b c d", "a", "b c d", "c"])
+        assert [feeds["input_ids"].shape for feeds in session.feeds] == [(2, 1), (2, 4)]
+        assert vectors == [[3.5, 1.0], [2.0, 1.0], [4.0, 1.0], [4.0, 1.0]]
+
+    def test_cls_pooling_and_normalization(self):
+        embedder = OnnxEmbeddings(_FakeSession(), _tokenizer(), pooling="cls", normalize=True)
+        vector = embedder.embed_query("c a")
+        assert vector == pytest.approx([4 / 17 ** 0.5, 1 / 17 ** 0.5])
+
+    def test_feeds_only_the_inputs_the_model_declares(self):
+        session = _FakeSession(inputs=("input_ids", "attention_mask", "token_type_ids"))
+        OnnxEmbeddings(session, _tokenizer()).embed_query("a")
+        assert set(session.feeds[0]) == {"input_ids", "attention_mask", "token_type_ids"}
+
+    def test_pooled_output_is_used_as_is(self):
+        embedder = OnnxEmbeddings(_FakeSession(pooled=True), _tokenizer())
+        assert embedder.embed_query("a b") == [2.5, 1.0]
@@ -0,0 +1,103 @@
+"""Tests for the pooled chat clients in LLMFactory.
+
+Run from the repo root:
+    python -m pytest backend/tests/test_llm_factory.py -v
+"""
+
+import sys
+import os
+import gc
+import time
+import weakref
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from base import agent_registry, llm_factory
+from base.llm_factory import LLMFactory
+
+
+# ---------------------------------------------------------------------------
+# Fixtures – replace client construction and reset the pool
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def _fake_clients(monkeypatch):
+    """Record every client build instead of calling init_chat_model."""
+    built = []
+
+    def fake_init_chat_model(**kwargs):
+        client = object()
+        built.append((kwargs, client))
+        return client
+
+    monkeypatch.setattr(llm_factory, "init_chat_model", fake_init_chat_model)
+    monkeypatch.setattr(LLMFactory, "_pool", llm_factory.OrderedDict())
+    monkeypatch.setattr(LLMFactory, "pool_max_size", 16)
+    monkeypatch.setattr(LLMFactory, "pool_idle_seconds", 3600.0)
+    monkeypatch.setattr(LLMFactory, "pool_hits", 0)
+    monkeypatch.setattr(LLMFactory, "pool_misses", 0)
+    monkeypatch.setattr(LLMFactory, "pool_evictions", 0)
+    return built
+
+
+class TestClientPool:
+    def test_same_parameters_reuse_client(self, _fake_clients):
+        first = LLMFactory.get(model="gpt-4o", model_provider="openai")
+        second = LLMFactory.get(model="gpt-4o", model_provider="openai")
+        assert first is second
+        assert len(_fake_clients) == 1
+        assert LLMFactory.pool_stats() == {"size": 1, "hits": 1, "misses": 1, "evictions": 0}
+
+    def test_key_includes_model_base_url_and_temperature(self, _fake_clients):
+        base = LLMFactory.get(model="gpt-4o", model_provider="openai")
+        assert LLMFactory.get(model="gpt-4o-mini", model_provider="openai") is not base
+        assert LLMFactory.get(model="gpt-4o", model_provider="openai", temperature=0.5) is not base
+        assert LLMFactory.get(model="gpt-4o", model_provider="openai", base_url="http://vllm:8000") is not base
+        assert LLMFactory.get(model="gpt-4o", model_provider="openai", api_key="sk-other") is not base
+        assert len(_fake_clients) == 5
+
+    def test_least_recently_used_client_is_evicted(self, _fake_clients, monkeypatch):
+        monkeypatch.setattr(LLMFactory, "pool_max_size", 2)
+        a = LLMFactory.get(model="a", model_provider="openai")
+        LLMFactory.get(model="b", model_provider="openai")
+        assert LLMFactory.get(model="a", model_provider="openai") is a
+        LLMFactory.get(model="c", model_provider="openai")
+        # "b" was least recently used
+        assert LLMFactory.get(model="a", model_provider="openai") is a
+        LLMFactory.get(model="b", model_provider="openai")
+        assert len(_fake_clients) == 4
+        assert LLMFactory.pool_stats()["evictions"] == 2
+
+    def test_idle_clients_are_dropped(self, monkeypatch):
+        monkeypatch.setattr(LLMFactory, "pool_idle_seconds", 0.2)
+        first = LLMFactory.get(model="a", model_provider="openai")
+        assert LLMFactory.get(model="a", model_provider="openai") is first
+        time.sleep(0.3)
+        assert LLMFactory.get(model="a", model_provider="openai") is not first
+
+    def test_evicted_clients_release_their_compiled_agents(self, monkeypatch):
+        monkeypatch.setattr(llm_factory, "init_chat_model", lambda **kwargs: FakeListChatModel(responses=["ok"]))
+        monkeypatch.setattr(LLMFactory, "pool_max_size", 1)
+        agent_registry.clear()
+        client = LLMFactory.get(model="a", model_provider="openai")
+        agent_registry.get_agent(client, system_prompt="system")
+        released = weakref.ref(client)
+        del client
+        other = LLMFactory.get(model="b", model_provider="openai")
+        agent_registry.get_agent(other, system_prompt="system")
+        gc.collect()
+        assert released() is None
+        assert agent_registry.stats()["size"] == 1
+        LLMFactory.clear_pool()
+        assert agent_registry.stats()["size"] == 0
+
+    def test_credentials_are_not_kept_in_plain_text(self):
+        LLMFactory.get(model="a", model_provider="openai", api_key="sk-secret")
+        assert "sk-secret" not in repr(list(LLMFactory._pool))
+
+    def test_configure_pool(self):
+        LLMFactory.configure_pool({"llm": {"pool_size": 3, "pool_idle_seconds": 10}})
+        assert LLMFactory.pool_max_size == 3
+        assert LLMFactory.pool_idle_seconds == 10.0
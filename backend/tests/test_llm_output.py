@@ -0,0 +1,90 @@
+"""Tests for parsing LLM replies (utils/llm_output.py).
+
+Run from the repo root:
+    python -m pytest backend/tests/test_llm_output.py -v
+"""
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from utils.llm_output import JsonExtractor, convert_json_output, extract_think_and_result
+
+
+def _feed_in_chunks(text, size):
+    extractor = JsonExtractor()
+    for i in range(0, len(text), size):
+        extractor.feed(text[i:i + size])
+    return extractor.close()
+
+
+# ===================================================================
+# convert_json_output
+# ===================================================================
+
+class TestConvertJsonOutput:
+    def test_plain_and_fenced(self):
+        assert convert_json_output('{"a": 1}') == {"a": 1}
+        assert convert_json_output('```json\n{"a": 1}\n```') == {"a": 1}
+        assert convert_json_output('```\n[1, 2]\n```') == [1, 2]
+
+    def test_invalid_escapes_are_kept_literally(self):
+        assert convert_json_output(r'{"math": "\alpha + \S", "ok": "\u00e9\n"}') == {"math": r"\alpha + \S", "ok": "é\n"}
+
+    def test_surrounding_text_and_think_blocks_are_skipped(self):
+        reply = '<think>draft {"a": 0}</think>Sure, see [1]: {"a": [1, {"b": "}"}]} Hope {this} helps'
+        assert convert_json_output(reply) == {"a": [1, {"b": "}"}]}
+
+    def test_unclosed_think_block_is_scanned(self):
+        assert convert_json_output('<think>unclosed {"a": 1}') == {"a": 1}
+        assert convert_json_output('<think>a</think><think>b {x} {"a": 1}') == {"a": 1}
+
+    def test_braces_in_prose_before_the_value(self):
+        assert convert_json_output('Use {name} here: {"name": "x"}') == {"name": "x"}
+
+    def test_raw_newlines_inside_strings(self):
+        assert convert_json_output('{"text": "line one\nline two"}') == {"text": "line one\nline two"}
+
+    def test_incomplete_value_raises(self):
+        with pytest.raises(json.JSONDecodeError):
+            convert_json_output('{"a": [1, 2')
+        with pytest.raises(json.JSONDecodeError):
+            convert_json_output("no json here")
+
+
+# ===================================================================
+# JsonExtractor on streamed chunks
+# ===================================================================
+
+class TestJsonExtractor:
+    REPLY = '<think>plan {x}</think>\n```json\n{"title": "a \\"quoted\\" \\frac", "path": "C:\\dir", "u": "\\u00e9"}\n```'
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 7])
+    def test_chunk_boundaries_do_not_matter(self, size):
+        assert _feed_in_chunks(self.REPLY, size) == convert_json_output(self.REPLY)
+
+    @pytest.mark.parametrize("size", [1, 4])
+    def test_unclosed_think_block_is_scanned(self, size):
+        assert _feed_in_chunks('<think>unclosed {"a": 1}', size) == {"a": 1}
+
+    def test_reports_completion_and_ignores_later_chunks(self):
+        extractor = JsonExtractor()
+        assert not extractor.feed('{"a": ')
+        assert extractor.feed('1} and then')
+        assert extractor.feed(" {more}")
+        assert extractor.close() == {"a": 1}
+
+
+# ===================================================================
+# extract_think_and_result
+# ===================================================================
+
+class TestExtractThink:
+    def test_first_block_and_remaining_text(self):
+        assert extract_think_and_result("<think> a </think>res<think>b</think>ult ") == ("a", "result")
+
+    def test_unclosed_block_is_left_in_place(self):
+        assert extract_think_and_result("<think>open") == ("", "<think>open")
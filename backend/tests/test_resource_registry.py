@@ -0,0 +1,114 @@
+"""Tests for the process-wide retrieval resources (base/resource_registry.py).
+
+Component builders are replaced with recorders, so no embedding model is
+loaded and no vectorstore is opened.
+
+Run from the repo root:
+    python -m pytest backend/tests/test_resource_registry.py -v
+"""
+
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from base import resource_registry
+from base.search_rag import SearchRagManager
+from base.searcher_factory import SearchRunner
+from modules.personalized_resource_delivery.agents.search_enhanced_knowledge_drafter import SearchEnhancedKnowledgeDrafter
+
+CONFIG = {
+    "embedder": {"provider": "huggingface", "model_name": "mini"},
+    "vectorstore": {"collection_name": "notes"},
+    "search": {"provider": "duckduckgo"},
+    "rag": {"chunk_size": 500},
+}
+
+
+@pytest.fixture(autouse=True)
+def _recorded_builds(monkeypatch):
+    """Count component builds; each build returns a fresh object."""
+    builds = []
+
+    def recorder(kind, delay=0.0):
+        def build(*args, **kwargs):
+            time.sleep(delay)
+            builds.append(kind)
+            return object()
+        return build
+
+    monkeypatch.setattr(SearchRagManager, "create_embedder", staticmethod(recorder("embedder", delay=0.05)))
+    monkeypatch.setattr(SearchRagManager, "create_vectorstore", staticmethod(recorder("vectorstore")))
+    monkeypatch.setattr(SearchRunner, "from_config", staticmethod(recorder("search_runner")))
+    resource_registry.clear()
+    yield builds
+    resource_registry.clear()
+
+
+class TestResourceRegistry:
+    def test_components_are_built_once_per_process(self, _recorded_builds):
+        first = resource_registry.get_search_rag_manager(CONFIG)
+        second = resource_registry.get_search_rag_manager(dict(CONFIG))
+        assert first is second
+        assert first.embedder is resource_registry.get_embedder(CONFIG)
+        assert first.vectorstore is resource_registry.get_vectorstore(CONFIG)
+        assert first.search_runner is resource_registry.get_search_runner(CONFIG)
+        assert sorted(_recorded_builds) == ["embedder", "search_runner", "vectorstore"]
+        assert first.max_retrieval_results == 5
+
+    def test_other_collection_shares_the_embedder(self, _recorded_builds):
+        base = resource_registry.get_search_rag_manager(CONFIG)
+        other = resource_registry.get_search_rag_manager({**CONFIG, "vectorstore": {"collection_name": "other"}})
+        assert other is not base
+        assert other.embedder is base.embedder
+        assert other.vectorstore is not base.vectorstore
+        assert _recorded_builds.count("embedder") == 1
+        assert _recorded_builds.count("vectorstore") == 2
+
+    def test_concurrent_first_requests_build_once(self, _recorded_builds):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            embedders = list(pool.map(lambda _: resource_registry.get_embedder(CONFIG), range(8)))
+        assert all(embedder is embedders[0] for embedder in embedders)
+        assert _recorded_builds == ["embedder"]
+        assert resource_registry.stats() == {"size": 1, "hits": 7, "misses": 1}
+
+    def test_clear_resets_builds_in_flight(self, _recorded_builds, monkeypatch):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_build():
+            started.set()
+            release.wait(5)
+            return "stale"
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            in_flight = pool.submit(resource_registry._shared, "thing", {}, slow_build)
+            assert started.wait(5)
+            resource_registry.clear()
+            assert resource_registry._building == {}
+            # A new caller builds at once instead of waiting on the old build.
+            assert resource_registry._shared("thing", {}, lambda: "fresh") == "fresh"
+            release.set()
+            assert in_flight.result(5) == "stale"
+        assert resource_registry._shared("thing", {}, lambda: "rebuilt") == "fresh"
+        assert resource_registry._building == {}
+
+
+class TestDrafterUsesRegistry:
+    def test_default_manager_is_shared(self, _recorded_builds, monkeypatch):
+        from modules.personalized_resource_delivery.agents import search_enhanced_knowledge_drafter as drafter_module
+        monkeypatch.setattr(drafter_module, "default_config", CONFIG)
+        llm = FakeListChatModel(responses=["{}"])
+        first = SearchEnhancedKnowledgeDrafter(llm)
+        second = SearchEnhancedKnowledgeDrafter(llm)
+        assert first.search_rag_manager is second.search_rag_manager
+        assert _recorded_builds.count("embedder") == 1
+
+    def test_nothing_is_built_without_search(self, _recorded_builds):
+        drafter = SearchEnhancedKnowledgeDrafter(FakeListChatModel(responses=["{}"]), use_search=False)
+        assert drafter.search_rag_manager is None
+        assert _recorded_builds == []
@@ -0,0 +1,113 @@
+"""Tests for content-addressed ingestion in SearchRagManager and collection compaction.
+
+Uses an in-memory Chroma collection and a counting embedder, so no embedding
+model is loaded.
+
+Run from the repo root:
+    python -m pytest backend/tests/test_search_rag.py -v
+"""
+
+import sys
+import os
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from base.search_rag import SearchRagManager, chunk_id
+from base.vectorstore_compaction import compact_collection
+
+
+class _CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.embedded = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), 1.0]
+
+
+@pytest.fixture
+def embedder():
+    return _CountingEmbeddings()
+
+
+@pytest.fixture
+def vectorstore(embedder):
+    store = Chroma(collection_name=f"test-{uuid.uuid4().hex}", embedding_function=embedder)
+    yield store
+    store.delete_collection()
+
+
+def _page(text="Gradient descent follows the slope.", source="https://example.com/gd"):
+    return Document(page_content=text, metadata={"source": source})
+
+
+# ===================================================================
+# SearchRagManager.add_documents
+# ===================================================================
+
+class TestContentAddressedIngestion:
+    def test_same_page_is_stored_once(self, embedder, vectorstore):
+        manager = SearchRagManager(embedder, vectorstore=vectorstore)
+        assert manager.add_documents([_page(), _page("Other page.")]) == 2
+        for _ in range(5):
+            assert manager.add_documents([_page(), _page("Other page.")]) == 0
+        assert vectorstore._collection.count() == 2
+        assert embedder.embedded == 2
+
+    def test_ids_ignore_whitespace_but_not_source(self):
+        assert chunk_id(_page("a  b\n c")) == chunk_id(_page(" a b c "))
+        assert chunk_id(_page(source="https://a")) != chunk_id(_page(source="https://b"))
+
+    def test_repeats_within_one_batch_are_embedded_once(self, embedder, vectorstore):
+        manager = SearchRagManager(embedder, vectorstore=vectorstore)
+        assert manager.add_documents([_page(), _page("Gradient  descent follows the slope.")]) == 1
+        assert embedder.embedded == 1
+
+    def test_only_new_chunks_are_embedded(self, embedder, vectorstore):
+        manager = SearchRagManager(embedder, vectorstore=vectorstore)
+        manager.add_documents([_page()])
+        assert manager.add_documents([_page(), _page("New page.")]) == 1
+        assert embedder.embedded == 2
+        assert vectorstore._collection.count() == 2
+
+
+# ===================================================================
+# compact_collection
+# ===================================================================
+
+class TestCompaction:
+    def _legacy_fill(self, vectorstore, pages):
+        # before content IDs every ingestion used fresh random IDs
+        vectorstore.add_documents(pages, ids=[uuid.uuid4().hex for _ in pages])
+
+    def test_duplicates_removed_and_kept_records_rekeyed(self, embedder, vectorstore):
+        self._legacy_fill(vectorstore, [_page(), _page(), _page("Other."), _page()])
+        counts = compact_collection(vectorstore._collection, batch_size=2)
+        assert counts == {"records": 4, "unique": 2, "removed": 2, "rekeyed": 2}
+        stored = set(vectorstore.get(include=[])["ids"])
+        assert stored == {chunk_id(_page()), chunk_id(_page("Other."))}
+
+        # compacted records are recognised by later ingestion, and nothing is re-embedded
+        embedded = embedder.embedded
+        assert SearchRagManager(embedder, vectorstore=vectorstore).add_documents([_page()]) == 0
+        assert embedder.embedded == embedded
+
+    def test_record_already_under_its_content_id_is_kept(self, vectorstore):
+        self._legacy_fill(vectorstore, [_page()])
+        vectorstore.add_documents([_page()], ids=[chunk_id(_page())])
+        counts = compact_collection(vectorstore._collection)
+        assert counts["removed"] == 1 and counts["rekeyed"] == 0
+        assert vectorstore.get(include=[])["ids"] == [chunk_id(_page())]
+
+    def test_dry_run_changes_nothing(self, vectorstore):
+        self._legacy_fill(vectorstore, [_page(), _page()])
+        assert compact_collection(vectorstore._collection, dry_run=True)["removed"] == 1
+        assert vectorstore._collection.count() == 2
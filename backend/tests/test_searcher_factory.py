@@ -0,0 +1,126 @@
+"""Tests for the web search result cache in SearchRunner.
+
+A fake searcher stands in for the provider and page loading is patched, so
+no network access is needed.
+
+Run from the repo root:
+    python -m pytest backend/tests/test_searcher_factory.py -v
+"""
+
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from langchain_core.documents import Document
+from base.searcher_factory import SearchRunner, WebDocumentLoader, normalize_query
+from utils.disk_cache import DiskCache
+
+
+class _FakeSearcher:
+    """Returns two hits per query; records every query it receives."""
+
+    def __init__(self):
+        self.queries = []
+
+    def results(self, query, max_results=5):
+        self.queries.append(query)
+        return [
+            {"title": f"{query} {i}", "link": f"https://example.com/{i}", "snippet": f"snippet {i}"}
+            for i in range(2)
+        ]
+
+
+@pytest.fixture(autouse=True)
+def loaded_pages(monkeypatch):
+    loads = []
+
+    def load(urls, loader_type="web"):
+        loads.append(list(urls))
+        return [Document(page_content=f"page at {url}", metadata={"source": url}) for url in urls]
+
+    monkeypatch.setattr(WebDocumentLoader, "invoke", staticmethod(load))
+    return loads
+
+
+@pytest.fixture
+def searcher():
+    return _FakeSearcher()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(tmp_path / "search.db")
+
+
+def _runner(searcher, cache, provider="duckduckgo", ttl_seconds=None):
+    return SearchRunner(searcher, provider=provider, cache=cache, cache_ttl_seconds=ttl_seconds)
+
+
+# ===================================================================
+# SearchRunner.invoke with a cache
+# ===================================================================
+
+class TestSearchCache:
+    def test_repeated_query_skips_provider_and_page_loads(self, searcher, cache, loaded_pages):
+        runner = _runner(searcher, cache)
+        first = runner.invoke("Python Basics loops")
+        second = runner.invoke("  python basics   LOOPS ")
+        assert searcher.queries == ["Python Basics loops"]
+        assert len(loaded_pages) == 1
+        assert second == first
+        assert second[0].document.metadata == {"source": "https://example.com/0", "source_type": "web_search", "title": "Python Basics loops 0"}
+        assert runner.stats()["hits"] == 1
+
+    def test_results_persist_across_runners(self, searcher, cache, tmp_path):
+        _runner(searcher, cache).invoke("recursion")
+        _runner(searcher, DiskCache(tmp_path / "search.db")).invoke("recursion")
+        assert searcher.queries == ["recursion"]
+
+    def test_provider_and_result_count_are_part_of_the_key(self, searcher, cache):
+        _runner(searcher, cache, provider="duckduckgo").invoke("recursion")
+        _runner(searcher, cache, provider="brave").invoke("recursion")
+        SearchRunner(searcher, max_search_results=3, provider="brave", cache=cache).invoke("recursion")
+        assert len(searcher.queries) == 3
+
+    def test_expired_results_are_fetched_again(self, searcher, cache):
+        runner = _runner(searcher, cache, ttl_seconds=0.05)
+        runner.invoke("recursion")
+        time.sleep(0.1)
+        runner.invoke("recursion")
+        assert len(searcher.queries) == 2
+
+    def test_searches_without_loaded_pages_are_not_cached(self, searcher, cache, monkeypatch):
+        monkeypatch.setattr(WebDocumentLoader, "invoke", staticmethod(lambda urls, loader_type="web": []))
+        runner = _runner(searcher, cache)
+        runner.invoke("recursion")
+        runner.invoke("recursion")
+        assert len(searcher.queries) == 2
+
+    def test_without_cache_every_query_reaches_provider(self, searcher):
+        runner = SearchRunner(searcher)
+        runner.invoke("recursion")
+        runner.invoke("recursion")
+        assert len(searcher.queries) == 2
+        assert runner.stats() is None
+
+    def test_normalize_query(self):
+        assert normalize_query(" Gradient\tDescent \n basics ") == "gradient descent basics"
+
+
+class TestCreateCache:
+    def test_provider_ttl_overrides_default(self, tmp_path):
+        config = {"search_cache": {
+            "path": str(tmp_path / "s.db"),
+            "ttl_seconds": 60,
+            "provider_ttl_seconds": {"duckduckgo": 600},
+            "max_entries": 7,
+        }}
+        cache, ttl = SearchRunner.create_cache(config, "duckduckgo")
+        assert ttl == 600 and cache.max_entries == 7
+        assert SearchRunner.create_cache(config, "serper")[1] == 60
+
+    def test_disabled(self):
+        assert SearchRunner.create_cache({"search_cache": {"enabled": False}}, "duckduckgo") == (None, None)
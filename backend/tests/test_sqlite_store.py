@@ -0,0 +1,247 @@
+"""Tests for the SQLite storage engine behind store.py and auth_store.py.
+
+Run from the repo root:
+    python -m pytest backend/tests/test_sqlite_store.py -v
+"""
+
+import sys
+import os
+import sqlite3
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+from utils import store, auth_store, sqlite_store
+from utils.state_patch import StateVersionConflict
+
+
+# ---------------------------------------------------------------------------
+# Fixtures – configure both modules with a SQLite engine in a temp directory
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def _sqlite_backend(tmp_path, monkeypatch):
+    """Select the sqlite backend and make sure no JSON state leaks in."""
+    monkeypatch.setattr(sqlite_store, "_instances", {})
+    monkeypatch.setattr(store, "_engine", None)
+    monkeypatch.setattr(store, "_durability", "immediate")
+    monkeypatch.setattr(store, "_snapshot_format", "json")
+    monkeypatch.setattr(auth_store, "_engine", None)
+    monkeypatch.setattr(store, "_profiles", {})
+    monkeypatch.setattr(store, "_events", {})
+    monkeypatch.setattr(store, "_user_states", {})
+    monkeypatch.setattr(auth_store, "_users", {})
+    config = {"storage": {"backend": "sqlite", "sqlite_path": str(tmp_path / "genmentor.db")}}
+    store.configure(config)
+    auth_store.configure(config)
+    store.load()
+    auth_store.load()
+    return tmp_path / "genmentor.db"
+
+
+class TestConfigure:
+    def test_both_modules_share_one_engine(self):
+        assert store._engine is auth_store._engine
+
+    def test_json_backend_clears_engine(self):
+        store.configure({"storage": {"backend": "json"}})
+        assert store._engine is None
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError, match="Unsupported storage backend"):
+            store.configure({"storage": {"backend": "redis"}})
+
+    def test_user_cache_requires_sqlite(self):
+        with pytest.raises(ValueError, match="requires storage.backend: sqlite"):
+            store.configure({"storage": {"backend": "json", "cache_users": 100}})
+        assert sqlite_store.engine_from_config({"storage": {"backend": "json", "cache_users": None}}) is None
+
+    def test_unset_user_cache_defaults_to_1000(self, tmp_path):
+        config = {"storage": {"backend": "sqlite", "sqlite_path": str(tmp_path / "other.db"), "cache_users": None}}
+        assert sqlite_store.engine_from_config(config).cache_users == 1000
+
+    def test_database_uses_wal(self, _sqlite_backend):
+        conn = sqlite3.connect(_sqlite_backend)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+class TestSQLiteProfiles:
+    def test_upsert_and_get_profile(self):
+        store.upsert_profile("alice", 0, {"goal": "Python"})
+        assert store.get_profile("alice", 0) == {"goal": "Python"}
+        assert store._profiles == {}
+
+    def test_upsert_overwrites_existing(self):
+        store.upsert_profile("alice", 0, {"v": 1})
+        store.upsert_profile("alice", 0, {"v": 2})
+        assert store.get_profile("alice", 0) == {"v": 2}
+
+    def test_get_all_profiles_for_user(self):
+        store.upsert_profile("alice", 1, {"goal": "Rust"})
+        store.upsert_profile("alice", 0, {"goal": "Python"})
+        store.upsert_profile("bob", 0, {"goal": "Go"})
+
+        assert store.get_all_profiles_for_user("alice") == {
+            0: {"goal": "Python"},
+            1: {"goal": "Rust"},
+        }
+
+    def test_survives_new_engine(self, _sqlite_backend):
+        store.upsert_profile("alice", 0, {"goal": "Python"})
+        engine = sqlite_store.SQLiteStore(_sqlite_backend)
+        assert engine.get_profile("alice", 0) == {"goal": "Python"}
+
+
+class TestSQLiteEvents:
+    def test_append_and_get_events(self):
+        store.append_event("alice", {"type": "a", "ts": "2026-01-01T00:00:00"})
+        store.append_event("alice", {"type": "b", "ts": "2026-01-01T00:00:01"})
+        assert [e["type"] for e in store.get_events("alice")] == ["a", "b"]
+
+    def test_events_capped_at_200(self):
+        for i in range(210):
+            store.append_event("alice", {"i": i})
+        events = store.get_events("alice")
+        assert len(events) == 200
+        assert events[0]["i"] == 10
+
+    def test_history_beyond_cap_is_queryable(self):
+        for i in range(205):
+            store.append_event("alice", {"i": i, "event_type": "click", "ts": f"2026-01-01T00:{i // 60:02d}:{i % 60:02d}"})
+        assert len(store.get_events("alice")) == 200
+        assert [e["i"] for e in store.query_events("alice")] == list(range(205))
+        window = store.query_events("alice", start="2026-01-01T00:00:10", end="2026-01-01T00:00:12")
+        assert [e["i"] for e in window] == [10, 11]
+
+    def test_cap_is_per_user(self):
+        for i in range(201):
+            store.append_event("alice", {"i": i})
+        store.append_event("bob", {"i": 0})
+        assert len(store.get_events("bob")) == 1
+
+
+class TestSQLiteUserState:
+    def test_put_get_delete(self):
+        store.put_user_state("alice", {"theme": "dark"})
+        assert store.get_user_state("alice") == {"theme": "dark"}
+        store.delete_user_state("alice")
+        assert store.get_user_state("alice") is None
+
+    def test_patch_with_versions(self):
+        assert store.put_user_state("alice", {"a": 1, "b": 2}) == 1
+        assert store.patch_user_state("alice", {"a": 3}, ["b"], expected_version=1) == 2
+        assert store.get_user_state("alice") == {"a": 3}
+        assert store.get_user_state_version("alice") == 2
+        with pytest.raises(StateVersionConflict):
+            store.patch_user_state("alice", {"a": 4}, expected_version=1)
+
+    def test_version_column_added_to_old_database(self, tmp_path):
+        path = tmp_path / "old.db"
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE user_states (user_id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+        conn.execute("INSERT INTO user_states VALUES ('alice', '{}')")
+        conn.commit()
+
+        engine = sqlite_store.SQLiteStore(path)
+        assert engine.get_user_state_version("alice") == 0
+        assert engine.patch_user_state("alice", {"v": 1}, expected_version=0) == 1
+
+    def test_delete_all_user_data(self):
+        store.upsert_profile("alice", 0, {"goal": "Python"})
+        store.append_event("alice", {"type": "click"})
+        store.put_user_state("alice", {"theme": "dark"})
+        store.upsert_profile("bob", 0, {"goal": "Go"})
+
+        store.delete_all_user_data("alice")
+
+        assert store.get_all_profiles_for_user("alice") == {}
+        assert store.get_events("alice") == []
+        assert store.get_user_state("alice") is None
+        assert store.get_profile("bob", 0) == {"goal": "Go"}
+
+
+class TestSQLiteAuthStore:
+    def test_create_and_verify(self):
+        auth_store.create_user("alice", "secret123")
+        assert auth_store.verify_password("alice", "secret123") is True
+        assert auth_store.verify_password("alice", "wrongpass") is False
+        assert auth_store._users == {}
+
+    def test_duplicate_user_raises(self):
+        auth_store.create_user("alice", "secret123")
+        with pytest.raises(ValueError, match="already exists"):
+            auth_store.create_user("alice", "otherpass")
+
+    def test_delete_user(self):
+        auth_store.create_user("alice", "secret123")
+        assert auth_store.delete_user("alice") is True
+        assert auth_store.get_user("alice") is None
+        assert auth_store.delete_user("alice") is False
+
+
+class TestImportRecords:
+    def test_import_json_backend_state(self):
+        engine = store._engine
+        engine.import_records(
+            profiles={"alice:0": {"goal": "Python"}},
+            events={"alice": [{"type": "click", "ts": "2026-01-01T00:00:00"}]},
+            user_states={"alice": {"theme": "dark"}},
+            users={"alice": {"username": "alice", "password_hash": "x"}},
+        )
+        assert store.get_profile("alice", 0) == {"goal": "Python"}
+        assert store.get_events("alice")[0]["type"] == "click"
+        assert store.get_user_state("alice") == {"theme": "dark"}
+        assert auth_store.get_user("alice")["password_hash"] == "x"
+
+    def test_user_state_versions_are_kept(self):
+        store._engine.import_records({}, {}, {"alice": {"theme": "dark"}, "bob": {}}, {}, user_state_versions={"alice": 7})
+        assert store.get_user_state_version("alice") == 7
+        assert store.get_user_state_version("bob") == 0
+        assert store.patch_user_state("alice", {"theme": "light"}, expected_version=7) == 8
+
+
+class TestUserCache:
+    @pytest.fixture()
+    def engine(self, _sqlite_backend):
+        return sqlite_store.SQLiteStore(_sqlite_backend, cache_users=2)
+
+    def test_repeated_read_is_a_hit(self, engine):
+        engine.put_user_state("alice", {"v": 1})
+        assert engine.get_user_state("alice") == {"v": 1}
+        assert engine.get_user_state_version("alice") == 1
+        assert engine.cache_info() == {"hits": 1, "misses": 1, "users": 1}
+
+    def test_write_invalidates_user(self, engine):
+        engine.upsert_profile("alice", 0, {"goal": "Python"})
+        assert engine.get_all_profiles_for_user("alice") == {0: {"goal": "Python"}}
+        engine.upsert_profile("alice", 1, {"goal": "Rust"})
+        assert engine.get_profile("alice", 1) == {"goal": "Rust"}
+        engine.append_event("alice", {"type": "click"})
+        engine.get_events("alice")
+        engine.delete_all_user_data("alice")
+        assert engine.get_events("alice") == []
+        assert engine.get_profile("alice", 0) is None
+
+    def test_least_recently_used_user_is_evicted(self, engine):
+        for user in ("alice", "bob", "carol"):
+            engine.put_user_state(user, {"user": user})
+            engine.get_user_state(user)
+        assert list(engine._cache) == ["bob", "carol"]
+        engine.get_user_state("bob")
+        engine.get_user_state("alice")
+        assert list(engine._cache) == ["bob", "alice"]
+
+    def test_write_from_other_process_clears_cache(self, engine, _sqlite_backend):
+        engine.put_user_state("alice", {"v": 1})
+        assert engine.get_user_state("alice") == {"v": 1}
+        # a second engine has its own write connection, like another worker
+        other = sqlite_store.SQLiteStore(_sqlite_backend)
+        other.put_user_state("alice", {"v": 2})
+        assert engine.get_user_state("alice") == {"v": 2}
+        assert engine.get_user_state_version("alice") == 2
+
+    def test_disabled_cache_reads_through(self, _sqlite_backend):
+        engine = sqlite_store.SQLiteStore(_sqlite_backend)
+        engine.put_user_state("alice", {"v": 1})
+        engine.get_user_state("alice")
+        assert engine.cache_info() == {"hits": 0, "misses": 0, "users": 0}
@@ -7,6 +7,7 @@ Run from the repo root:
 import sys
 import os
 import json
+import threading
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
@@ -26,10 +27,27 @@ def _isolate_store(tmp_path, monkeypatch):
     monkeypatch.setattr(store, "_DATA_DIR", data_dir)
     monkeypatch.setattr(store, "_PROFILES_PATH", data_dir / "profiles.json")
     monkeypatch.setattr(store, "_EVENTS_PATH", data_dir / "events.json")
+    monkeypatch.setattr(store, "_EVENTS_LOG_PATH", data_dir / "events.log")
+    monkeypatch.setattr(store, "_EVENTS_ARCHIVE_DIR", data_dir / "events_archive")
+    monkeypatch.setattr(store, "_events_log_records", 0)
+    monkeypatch.setattr(store, "_file_stamps", {})
+    monkeypatch.setattr(store, "_events_log_ino", None)
+    monkeypatch.setattr(store, "_events_log_offset", 0)
+    monkeypatch.setattr(store, "_dirty_profiles", {})
+    monkeypatch.setattr(store, "_dirty_user_states", {})
+    monkeypatch.setattr(store, "_dirty_user_state_versions", {})
+    monkeypatch.setattr(store, "_pending_event_records", [])
+    monkeypatch.setattr(store, "_pending_mutations", 0)
+    monkeypatch.setattr(store, "_durability", "immediate")
+    monkeypatch.setattr(store, "_snapshot_format", "json")
     monkeypatch.setattr(store, "_profiles", {})
+    monkeypatch.setattr(store, "_profiles_by_user", {})
     monkeypatch.setattr(store, "_events", {})
+    monkeypatch.setattr(store, "_events_evicted", {})
     monkeypatch.setattr(store, "_USER_STATES_PATH", data_dir / "user_states.json")
+    monkeypatch.setattr(store, "_USER_STATE_VERSIONS_PATH", data_dir / "user_state_versions.json")
     monkeypatch.setattr(store, "_user_states", {})
+    monkeypatch.setattr(store, "_user_state_versions", {})
 
 
 @pytest.fixture(autouse=True)
@@ -40,6 +58,7 @@ def _isolate_auth_store(tmp_path, monkeypatch):
     monkeypatch.setattr(auth_store, "_DATA_DIR", data_dir)
     monkeypatch.setattr(auth_store, "_USERS_PATH", data_dir / "users.json")
     monkeypatch.setattr(auth_store, "_users", {})
+    monkeypatch.setattr(auth_store, "_users_stamp", None)
 
 
 # ===================================================================
@@ -95,6 +114,25 @@ class TestProfilePersistence:
         store.load()
         assert store.get_profile("alice", 0)["goal"] == "Python"
 
+    def test_index_rebuilt_on_load(self):
+        store._PROFILES_PATH.write_text(
+            json.dumps({"alice:0": {"g": 0}, "alice:draft": {"g": "d"}, "bob:0": {"g": 0}}),
+            encoding="utf-8",
+        )
+        store.load()
+        assert store.get_all_profiles_for_user("alice") == {0: {"g": 0}, "draft": {"g": "d"}}
+        assert store.get_all_profiles_for_user("bob") == {0: {"g": 0}}
+
+    def test_index_does_not_match_other_users_by_prefix(self):
+        store.upsert_profile("al", 0, {"goal": "Python"})
+        store.upsert_profile("al:ice", 0, {"goal": "Rust"})
+        assert store.get_all_profiles_for_user("al") == {0: {"goal": "Python"}}
+
+    def test_returned_mapping_is_a_copy(self):
+        store.upsert_profile("alice", 0, {"goal": "Python"})
+        store.get_all_profiles_for_user("alice")[1] = {"goal": "Rust"}
+        assert store.get_all_profiles_for_user("alice") == {0: {"goal": "Python"}}
+
 
 # ===================================================================
 # store.py – event persistence
@@ -129,9 +167,15 @@ class TestEventPersistence:
     def test_events_persisted_to_disk(self):
         store.append_event("alice", {"type": "click"})
 
-        raw = json.loads(store._EVENTS_PATH.read_text(encoding="utf-8"))
-        assert "alice" in raw
-        assert raw["alice"][0]["type"] == "click"
+        lines = store._EVENTS_LOG_PATH.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 1
+        record = json.loads(lines[0])
+        assert record["user_id"] == "alice"
+        assert record["event"]["type"] == "click"
+
+    def test_append_does_not_rewrite_snapshot(self):
+        store.append_event("alice", {"type": "click"})
+        assert not store._EVENTS_PATH.exists()
 
     def test_load_restores_events_from_disk(self):
         store.append_event("alice", {"type": "click"})
@@ -149,6 +193,378 @@ class TestEventPersistence:
         assert store.get_events("alice")[0]["type"] == "a"
 
 
+# ===================================================================
+# store.py – event log compaction and crash recovery
+# ===================================================================
+
+class TestEventLog:
+    def test_compaction_folds_log_into_snapshot(self, monkeypatch):
+        monkeypatch.setattr(store, "_EVENTS_COMPACT_EVERY", 5)
+        for i in range(7):
+            store.append_event("alice", {"i": i})
+
+        raw = json.loads(store._EVENTS_PATH.read_text(encoding="utf-8"))
+        assert [e["i"] for e in raw["alice"]] == [0, 1, 2, 3, 4]
+        assert len(store._EVENTS_LOG_PATH.read_text(encoding="utf-8").splitlines()) == 2
+
+        store._events.clear()
+        store.load()
+        assert [e["i"] for e in store.get_events("alice")] == list(range(7))
+
+    def test_compact_events_empties_log(self):
+        store.append_event("alice", {"type": "a"})
+        store.compact_events()
+
+        assert not store._EVENTS_LOG_PATH.exists()
+        store._events.clear()
+        store.load()
+        assert store.get_events("alice") == [{"type": "a"}]
+
+    def test_replay_respects_cap(self):
+        for i in range(210):
+            store.append_event("alice", {"i": i})
+        store._events.clear()
+        store.load()
+        events = store.get_events("alice")
+        assert len(events) == 200
+        assert events[0]["i"] == 10
+
+    def test_delete_survives_reload(self):
+        store.append_event("alice", {"type": "a"})
+        store.delete_all_user_data("alice")
+        store.append_event("alice", {"type": "b"})
+
+        store._events.clear()
+        store.load()
+        assert store.get_events("alice") == [{"type": "b"}]
+
+    def test_torn_trailing_line_is_dropped(self):
+        store.append_event("alice", {"type": "a"})
+        with open(store._EVENTS_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write('{"op": "append", "user_id": "alice", "ev')
+
+        store._events.clear()
+        store.load()
+        assert store.get_events("alice") == [{"type": "a"}]
+
+        # the next append starts on a clean line
+        store.append_event("alice", {"type": "b"})
+        store._events.clear()
+        store.load()
+        assert [e["type"] for e in store.get_events("alice")] == ["a", "b"]
+
+    def test_legacy_snapshot_is_loaded(self):
+        store._EVENTS_PATH.write_text(json.dumps({"alice": [{"type": "old"}]}), encoding="utf-8")
+        store.load()
+        store.append_event("alice", {"type": "new"})
+
+        store._events.clear()
+        store.load()
+        assert [e["type"] for e in store.get_events("alice")] == ["old", "new"]
+
+    def test_recover_crash_before_snapshot_installed(self):
+        store.append_event("alice", {"type": "a"})
+        # crash after rotating the log but before renaming the temp snapshot
+        store._events_tmp_path().write_text("{}", encoding="utf-8")
+        store._EVENTS_LOG_PATH.rename(store._events_old_log_path())
+
+        store._events.clear()
+        store.load()
+        assert store.get_events("alice") == [{"type": "a"}]
+        assert not store._events_old_log_path().exists()
+        assert not store._events_tmp_path().exists()
+
+    def test_recover_crash_after_snapshot_installed(self):
+        store.append_event("alice", {"type": "a"})
+        # crash after installing the snapshot but before removing the old log
+        store._EVENTS_PATH.write_text(json.dumps({"alice": [{"type": "a"}]}), encoding="utf-8")
+        store._EVENTS_LOG_PATH.rename(store._events_old_log_path())
+
+        store._events.clear()
+        store.load()
+        assert store.get_events("alice") == [{"type": "a"}]
+        assert not store._events_old_log_path().exists()
+
+
+# ===================================================================
+# Tiered events: hot window + compressed archive
+# ===================================================================
+
+class TestEventArchive:
+    @pytest.fixture(autouse=True)
+    def _small_window(self, monkeypatch):
+        monkeypatch.setattr(store, "_EVENTS_MAX_PER_USER", 3)
+        monkeypatch.setattr(store, "_EVENTS_COMPACT_EVERY", 1000)
+
+    def _log(self, user_id, n, start=0, event_type="click"):
+        for i in range(start, start + n):
+            store.append_event(user_id, {"i": i, "event_type": event_type, "ts": f"2026-01-01T00:00:{i:02d}"})
+
+    def test_compaction_moves_overflow_to_archive(self):
+        self._log("alice", 10)
+        store.compact_events()
+
+        assert [e["i"] for e in store.get_events("alice")] == [7, 8, 9]
+        assert store._archive_path("alice").exists()
+        assert [e["i"] for e in store.query_events("alice")] == list(range(10))
+
+    def test_unarchived_overflow_is_queryable(self):
+        self._log("alice", 5)
+        assert not store._archive_path("alice").exists()
+        assert [e["i"] for e in store.query_events("alice")] == list(range(5))
+
+    def test_archive_appends_across_compactions(self):
+        self._log("alice", 5)
+        store.compact_events()
+        self._log("alice", 5, start=5)
+        store.compact_events()
+
+        store._events.clear()
+        store.load()
+        assert [e["i"] for e in store.query_events("alice")] == list(range(10))
+
+    def test_reload_does_not_archive_twice(self):
+        self._log("alice", 6)
+        store._events.clear()
+        store.load()
+        store.compact_events()
+        store.compact_events()
+        assert [e["i"] for e in store.query_events("alice")] == list(range(6))
+
+    def test_filters_by_time_and_type(self):
+        self._log("alice", 6)
+        self._log("alice", 2, start=6, event_type="quiz")
+        store.compact_events()
+
+        window = store.query_events("alice", start="2026-01-01T00:00:02", end="2026-01-01T00:00:05")
+        assert [e["i"] for e in window] == [2, 3, 4]
+        assert [e["i"] for e in store.query_events("alice", event_type="quiz")] == [6, 7]
+        aware = store.query_events("alice", start="2026-01-01T00:00:06+00:00")
+        assert [e["i"] for e in aware] == [6, 7]
+
+    def test_query_is_lazy(self):
+        self._log("alice", 6)
+        store.compact_events()
+        events = store.query_events("alice")
+        assert next(events)["i"] == 0
+
+    def test_delete_removes_archive(self):
+        self._log("alice", 6)
+        store.compact_events()
+        store.delete_all_user_data("alice")
+
+        assert not store._archive_path("alice").exists()
+        assert list(store.query_events("alice")) == []
+
+    def test_interrupted_compaction_rolls_archive_back(self):
+        self._log("alice", 6)
+        store.compact_events()
+        self._log("alice", 2, start=6)
+        # crash after archiving the overflow but before the snapshot was installed
+        with store._lock:
+            evicted = store._take_evicted()
+        store._archive_events(evicted)
+        store._events_tmp_path().write_text("{}", encoding="utf-8")
+
+        store._events.clear()
+        store.load()
+        assert not store._archive_journal_path().exists()
+        assert [e["i"] for e in store.query_events("alice")] == list(range(8))
+        store.compact_events()
+        assert [e["i"] for e in store.query_events("alice")] == list(range(8))
+
+    def test_user_ids_are_safe_file_names(self):
+        self._log("../bob", 5)
+        store.compact_events()
+        assert store._archive_path("../bob").parent == store._EVENTS_ARCHIVE_DIR
+        assert len(list(store.query_events("../bob"))) == 5
+
+
+# ===================================================================
+# Group commit (storage.durability: grouped)
+# ===================================================================
+
+class TestGroupedDurability:
+    @pytest.fixture(autouse=True)
+    def _grouped(self, monkeypatch):
+        monkeypatch.setattr(store, "_durability", "grouped")
+        monkeypatch.setattr(store, "_flush_interval_ms", 60_000)
+        monkeypatch.setattr(store, "_flush_max_pending", 1000)
+        monkeypatch.setattr(store, "_flusher", None)
+        yield
+        store.close()
+
+    def test_configure_reads_durability(self, monkeypatch):
+        monkeypatch.delenv("WEB_CONCURRENCY", raising=False)
+        store.configure({"storage": {"durability": "grouped", "flush_interval_ms": 50, "flush_max_pending": 7}})
+        assert (store._durability, store._flush_interval_ms, store._flush_max_pending) == ("grouped", 50, 7)
+
+    def test_configure_refuses_grouped_with_several_workers(self, monkeypatch, caplog):
+        monkeypatch.setenv("WEB_CONCURRENCY", "2")
+        store.configure({"storage": {"durability": "grouped"}})
+        assert store._durability == "immediate"
+        assert "not safe with 2 workers" in caplog.text
+
+    def test_configure_rejects_unknown_durability(self):
+        with pytest.raises(ValueError, match="Unsupported storage durability"):
+            store.configure({"storage": {"durability": "eventually"}})
+
+    def test_writes_stay_in_memory_until_flush(self):
+        store.upsert_profile("alice", 0, {"goal": "Python"})
+        store.append_event("alice", {"type": "a"})
+
+        assert store.get_profile("alice", 0) == {"goal": "Python"}
+        assert not store._PROFILES_PATH.exists()
+        assert not store._EVENTS_LOG_PATH.exists()
+
+        store.flush()
+        assert json.loads(store._PROFILES_PATH.read_text(encoding="utf-8")) == {"alice:0": {"goal": "Python"}}
+        assert len(store._EVENTS_LOG_PATH.read_text(encoding="utf-8").splitlines()) == 1
+
+    def test_batch_is_written_once(self, monkeypatch):
+        writes = []
+        original = store._atomic_write
+        monkeypatch.setattr(store, "_atomic_write", lambda path, data: (writes.append(path), original(path, data)))
+
+        for g in range(20):
+            store.upsert_profile("alice", g, {"g": g})
+        store.flush()
+
+        assert writes == [store._PROFILES_PATH]
+        assert len(json.loads(store._PROFILES_PATH.read_text(encoding="utf-8"))) == 20
+
+    def test_pending_threshold_wakes_flusher(self, monkeypatch):
+        monkeypatch.setattr(store, "_flush_max_pending", 5)
+        for i in range(5):
+            store.append_event("alice", {"i": i})
+
+        for _ in range(200):
+            if not store._pending_event_records:
+                break
+            threading.Event().wait(0.01)
+        assert len(store._EVENTS_LOG_PATH.read_text(encoding="utf-8").splitlines()) == 5
+
+    def test_interval_flushes(self, monkeypatch):
+        monkeypatch.setattr(store, "_flush_interval_ms", 20)
+        store.upsert_profile("alice", 0, {"v": 1})
+
+        for _ in range(200):
+            if store._PROFILES_PATH.exists():
+                break
+            threading.Event().wait(0.01)
+        assert json.loads(store._PROFILES_PATH.read_text(encoding="utf-8")) == {"alice:0": {"v": 1}}
+
+    def test_put_user_state_is_committed_before_returning(self):
+        assert store.put_user_state("alice", {"v": 1}) == 1
+        assert json.loads(store._USER_STATES_PATH.read_text(encoding="utf-8")) == {"alice": {"v": 1}}
+        assert json.loads(store._USER_STATE_VERSIONS_PATH.read_text(encoding="utf-8")) == {"alice": 1}
+
+    def test_put_does_not_overwrite_another_workers_patch(self):
+        store.put_user_state("alice", {"v": 1})
+        # another worker commits a patch: version 2 on disk
+        store._USER_STATES_PATH.write_text(json.dumps({"alice": {"v": 2}}), encoding="utf-8")
+        store._USER_STATE_VERSIONS_PATH.write_text(json.dumps({"alice": 2}), encoding="utf-8")
+
+        assert store.put_user_state("alice", {"v": 3}) == 3
+        assert json.loads(store._USER_STATE_VERSIONS_PATH.read_text(encoding="utf-8")) == {"alice": 3}
+
+    def test_close_flushes_pending(self):
+        store.upsert_profile("alice", 0, {"goal": "Python"})
+        store.delete_user_state("bob")
+        store.close()
+
+        assert store._flusher is None
+        store._profiles.clear()
+        store.load()
+        assert store.get_profile("alice", 0) == {"goal": "Python"}
+
+    def test_pending_writes_survive_reload(self):
+        store.upsert_profile("alice", 0, {"goal": "Python"})
+        store.append_event("alice", {"type": "a"})
+        # another worker's flush makes the files look stale
+        store._PROFILES_PATH.write_text(json.dumps({"bob:0": {"goal": "Go"}}), encoding="utf-8")
+
+        store.load()
+        assert store.get_profile("alice", 0) == {"goal": "Python"}
+        assert store.get_profile("bob", 0) == {"goal": "Go"}
+        assert store.get_events("alice") == [{"type": "a"}]
+
+    def test_failed_flush_keeps_changes_pending(self, monkeypatch):
+        store.upsert_profile("alice", 0, {"goal": "Python"})
+
+        def fail(path, data):
+            raise OSError("disk full")
+
+        original = store._atomic_write
+        monkeypatch.setattr(store, "_atomic_write", fail)
+        with pytest.raises(OSError):
+            store.flush()
+        assert "alice:0" in store._dirty_profiles
+
+        monkeypatch.setattr(store, "_atomic_write", original)
+        store.flush()
+        assert "alice:0" in json.loads(store._PROFILES_PATH.read_text(encoding="utf-8"))
+
+
+class TestSnapshotFormat:
+    def test_configure_rejects_unknown_format(self):
+        with pytest.raises(ValueError, match="Unsupported snapshot format"):
+            store.configure({"storage": {"snapshot_format": "pickle"}})
+
+    def test_msgpack_snapshots_round_trip(self, monkeypatch):
+        monkeypatch.setattr(store, "_snapshot_format", "msgpack")
+        store.upsert_profile("alice", 0, {"goal": "Python", "skills": ["a", "b"]})
+        store.put_user_state("alice", {"document_caches": {"0-1-0": "# Intro"}})
+        store.append_event("alice", {"type": "a"})
+        store.compact_events()
+
+        for path in (store._PROFILES_PATH, store._USER_STATES_PATH, store._EVENTS_PATH):
+            assert path.read_bytes().startswith(b"\x28\xb5\x2f\xfd")
+
+        store._profiles.clear()
+        store._user_states.clear()
+        store._events.clear()
+        store.load()
+        assert store.get_profile("alice", 0) == {"goal": "Python", "skills": ["a", "b"]}
+        assert store.get_user_state("alice") == {"document_caches": {"0-1-0": "# Intro"}}
+        assert store.get_events("alice") == [{"type": "a"}]
+
+    def test_json_files_migrate_transparently(self, monkeypatch):
+        store.upsert_profile("alice", 0, {"goal": "Python"})
+        store.put_user_state("alice", {"v": 1})
+
+        monkeypatch.setattr(store, "_snapshot_format", "msgpack")
+        store._profiles.clear()
+        store.load()
+        assert store.get_profile("alice", 0) == {"goal": "Python"}
+
+        store.upsert_profile("bob", 0, {"goal": "Go"})
+        assert store._PROFILES_PATH.read_bytes().startswith(b"\x28\xb5\x2f\xfd")
+        # untouched snapshots stay JSON until their next write
+        assert json.loads(store._USER_STATES_PATH.read_text(encoding="utf-8")) == {"alice": {"v": 1}}
+
+        monkeypatch.setattr(store, "_snapshot_format", "json")
+        store._profiles.clear()
+        store.load()
+        store.upsert_profile("carol", 0, {"goal": "Rust"})
+        assert set(json.loads(store._PROFILES_PATH.read_text(encoding="utf-8"))) == {"alice:0", "bob:0", "carol:0"}
+
+
+class TestSnapshotSafety:
+    def test_write_leaves_no_temp_file(self):
+        store.upsert_profile("alice", 0, {"goal": "Python"})
+        assert [p.name for p in store._DATA_DIR.iterdir() if p.name.endswith(".tmp")] == []
+
+    def test_corrupt_snapshot_is_preserved(self):
+        store._PROFILES_PATH.write_text("{not json", encoding="utf-8")
+        store.load()
+        assert store._profiles == {}
+
+        store.upsert_profile("alice", 0, {"goal": "Python"})
+        backup = store._PROFILES_PATH.with_name("profiles.json.corrupt")
+        assert backup.read_text(encoding="utf-8") == "{not json"
+
+
 # ===================================================================
 # auth_store.py – user creation and password verification
 # ===================================================================
@@ -237,6 +653,8 @@ class TestDeleteAllUserData:
         assert store.get_profile("alice", 0) is None
         assert store.get_profile("alice", 1) is None
         assert store.get_profile("bob", 0) == {"goal": "Go"}
+        assert store.get_all_profiles_for_user("alice") == {}
+        assert json.loads(store._PROFILES_PATH.read_text(encoding="utf-8")) == {"bob:0": {"goal": "Go"}}
 
     def test_delete_all_user_data_removes_events(self):
         store.append_event("alice", {"type": "click"})
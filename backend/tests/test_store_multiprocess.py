@@ -0,0 +1,181 @@
+"""Tests for sharing the JSON store between several worker processes.
+
+Each test drives real child processes against the same data directory, the
+way ``uvicorn --workers N`` would.
+
+Run from the repo root:
+    python -m pytest backend/tests/test_store_multiprocess.py -v
+"""
+
+import sys
+import os
+import json
+import subprocess
+import textwrap
+
+BACKEND_DIR = os.path.join(os.path.dirname(__file__), "..")
+sys.path.insert(0, BACKEND_DIR)
+
+import pytest
+from utils import store, auth_store
+
+
+# ---------------------------------------------------------------------------
+# Fixtures / helpers
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Point both store modules at a shared temp directory."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    monkeypatch.setattr(store, "_DATA_DIR", data_dir)
+    monkeypatch.setattr(store, "_PROFILES_PATH", data_dir / "profiles.json")
+    monkeypatch.setattr(store, "_EVENTS_PATH", data_dir / "events.json")
+    monkeypatch.setattr(store, "_EVENTS_LOG_PATH", data_dir / "events.log")
+    monkeypatch.setattr(store, "_EVENTS_ARCHIVE_DIR", data_dir / "events_archive")
+    monkeypatch.setattr(store, "_USER_STATES_PATH", data_dir / "user_states.json")
+    monkeypatch.setattr(store, "_USER_STATE_VERSIONS_PATH", data_dir / "user_state_versions.json")
+    monkeypatch.setattr(store, "_profiles", {})
+    monkeypatch.setattr(store, "_profiles_by_user", {})
+    monkeypatch.setattr(store, "_events", {})
+    monkeypatch.setattr(store, "_events_evicted", {})
+    monkeypatch.setattr(store, "_user_states", {})
+    monkeypatch.setattr(store, "_user_state_versions", {})
+    monkeypatch.setattr(store, "_events_log_records", 0)
+    monkeypatch.setattr(store, "_file_stamps", {})
+    monkeypatch.setattr(store, "_events_log_ino", None)
+    monkeypatch.setattr(store, "_events_log_offset", 0)
+    monkeypatch.setattr(store, "_dirty_profiles", {})
+    monkeypatch.setattr(store, "_dirty_user_states", {})
+    monkeypatch.setattr(store, "_dirty_user_state_versions", {})
+    monkeypatch.setattr(store, "_pending_event_records", [])
+    monkeypatch.setattr(store, "_pending_mutations", 0)
+    monkeypatch.setattr(store, "_durability", "immediate")
+    monkeypatch.setattr(store, "_snapshot_format", "json")
+    monkeypatch.setattr(auth_store, "_DATA_DIR", data_dir)
+    monkeypatch.setattr(auth_store, "_USERS_PATH", data_dir / "users.json")
+    monkeypatch.setattr(auth_store, "_users", {})
+    monkeypatch.setattr(auth_store, "_users_stamp", None)
+    return data_dir
+
+
+def _worker(data_dir, body):
+    """Return a child process running *body* against *data_dir*."""
+    script = textwrap.dedent(f"""
+        import sys
+        from pathlib import Path
+        sys.path.insert(0, {os.path.abspath(BACKEND_DIR)!r})
+        from utils import store, auth_store
+        d = Path({str(data_dir)!r})
+        store._DATA_DIR = d
+        store._PROFILES_PATH = d / "profiles.json"
+        store._EVENTS_PATH = d / "events.json"
+        store._EVENTS_LOG_PATH = d / "events.log"
+        store._EVENTS_ARCHIVE_DIR = d / "events_archive"
+        store._USER_STATES_PATH = d / "user_states.json"
+        store._USER_STATE_VERSIONS_PATH = d / "user_state_versions.json"
+        auth_store._DATA_DIR = d
+        auth_store._USERS_PATH = d / "users.json"
+        store.load()
+        auth_store.load()
+    """) + textwrap.dedent(body)
+    return subprocess.Popen([sys.executable, "-c", script])
+
+
+def _run(data_dir, body):
+    proc = _worker(data_dir, body)
+    assert proc.wait(timeout=60) == 0
+
+
+# ===================================================================
+# Concurrent writers
+# ===================================================================
+
+class TestConcurrentWriters:
+    def test_profile_writers_do_not_lose_updates(self, data_dir):
+        procs = [
+            _worker(data_dir, f"""
+                for g in range(15):
+                    store.upsert_profile("user{n}", g, {{"n": {n}, "g": g}})
+            """)
+            for n in range(4)
+        ]
+        assert all(p.wait(timeout=60) == 0 for p in procs)
+
+        raw = json.loads(store._PROFILES_PATH.read_text(encoding="utf-8"))
+        assert len(raw) == 60
+
+    def test_event_writers_interleave_whole_lines(self, data_dir):
+        procs = [
+            _worker(data_dir, f"""
+                for i in range(50):
+                    store.append_event("shared", {{"worker": {n}, "i": i}})
+            """)
+            for n in range(4)
+        ]
+        assert all(p.wait(timeout=60) == 0 for p in procs)
+
+        store.load()
+        events = store.get_events("shared")
+        assert len(events) == 200
+        for n in range(4):
+            assert [e["i"] for e in events if e["worker"] == n] == list(range(50))
+
+    def test_user_registration_across_processes(self, data_dir):
+        procs = [
+            _worker(data_dir, f"auth_store.create_user('user{n}', 'secret{n}')")
+            for n in range(3)
+        ]
+        assert all(p.wait(timeout=60) == 0 for p in procs)
+
+        for n in range(3):
+            assert auth_store.verify_password(f"user{n}", f"secret{n}") is True
+
+
+# ===================================================================
+# Cache invalidation
+# ===================================================================
+
+class TestReadsStayFresh:
+    def test_profile_written_elsewhere_is_visible(self, data_dir):
+        store.load()
+        assert store.get_profile("alice", 0) is None
+
+        _run(data_dir, 'store.upsert_profile("alice", 0, {"goal": "Python"})')
+
+        assert store.get_profile("alice", 0) == {"goal": "Python"}
+
+    def test_events_written_elsewhere_are_replayed(self, data_dir):
+        store.append_event("alice", {"i": 0})
+
+        _run(data_dir, 'store.append_event("alice", {"i": 1})')
+
+        assert [e["i"] for e in store.get_events("alice")] == [0, 1]
+        store.append_event("alice", {"i": 2})
+        assert [e["i"] for e in store.get_events("alice")] == [0, 1, 2]
+
+    def test_compaction_elsewhere_is_picked_up(self, data_dir):
+        store.append_event("alice", {"i": 0})
+
+        _run(data_dir, """
+            store.append_event("alice", {"i": 1})
+            store.compact_events()
+            store.append_event("alice", {"i": 2})
+        """)
+
+        assert [e["i"] for e in store.get_events("alice")] == [0, 1, 2]
+
+    def test_user_state_deleted_elsewhere(self, data_dir):
+        store.put_user_state("alice", {"v": 1})
+
+        _run(data_dir, 'store.delete_all_user_data("alice")')
+
+        assert store.get_user_state("alice") is None
+
+    def test_user_deleted_elsewhere(self, data_dir):
+        auth_store.create_user("alice", "secret123")
+
+        _run(data_dir, 'auth_store.delete_user("alice")')
+
+        assert auth_store.get_user("alice") is None
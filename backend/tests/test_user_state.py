@@ -12,6 +12,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 import pytest
 from utils import store
+from utils.state_patch import StateVersionConflict
 
 
 # ---------------------------------------------------------------------------
@@ -26,10 +27,27 @@ def _isolate_store(tmp_path, monkeypatch):
     monkeypatch.setattr(store, "_DATA_DIR", data_dir)
     monkeypatch.setattr(store, "_PROFILES_PATH", data_dir / "profiles.json")
     monkeypatch.setattr(store, "_EVENTS_PATH", data_dir / "events.json")
+    monkeypatch.setattr(store, "_EVENTS_LOG_PATH", data_dir / "events.log")
+    monkeypatch.setattr(store, "_EVENTS_ARCHIVE_DIR", data_dir / "events_archive")
+    monkeypatch.setattr(store, "_events_log_records", 0)
+    monkeypatch.setattr(store, "_file_stamps", {})
+    monkeypatch.setattr(store, "_events_log_ino", None)
+    monkeypatch.setattr(store, "_events_log_offset", 0)
+    monkeypatch.setattr(store, "_dirty_profiles", {})
+    monkeypatch.setattr(store, "_dirty_user_states", {})
+    monkeypatch.setattr(store, "_dirty_user_state_versions", {})
+    monkeypatch.setattr(store, "_pending_event_records", [])
+    monkeypatch.setattr(store, "_pending_mutations", 0)
+    monkeypatch.setattr(store, "_durability", "immediate")
+    monkeypatch.setattr(store, "_snapshot_format", "json")
     monkeypatch.setattr(store, "_USER_STATES_PATH", data_dir / "user_states.json")
+    monkeypatch.setattr(store, "_USER_STATE_VERSIONS_PATH", data_dir / "user_state_versions.json")
     monkeypatch.setattr(store, "_profiles", {})
+    monkeypatch.setattr(store, "_profiles_by_user", {})
     monkeypatch.setattr(store, "_events", {})
+    monkeypatch.setattr(store, "_events_evicted", {})
     monkeypatch.setattr(store, "_user_states", {})
+    monkeypatch.setattr(store, "_user_state_versions", {})
 
 
 # ===================================================================
@@ -130,6 +148,52 @@ class TestUserStateStore:
         assert store.get_user_state("alice") == state
 
 
+# ===================================================================
+# store.py – versioned patches
+# ===================================================================
+
+class TestUserStatePatch:
+    def test_versions_start_at_zero_and_increment(self):
+        assert store.get_user_state_version("alice") == 0
+        assert store.put_user_state("alice", {"v": 1}) == 1
+        assert store.patch_user_state("alice", {"v": 2}) == 2
+        assert store.get_user_state_version("alice") == 2
+
+    def test_patch_merges_top_level_keys(self):
+        store.put_user_state("alice", {"goals": [], "document_caches": {"a": "x"}, "logged_in": True})
+        store.patch_user_state("alice", {"goals": [{"id": 0}]}, ["logged_in"])
+        assert store.get_user_state("alice") == {"goals": [{"id": 0}], "document_caches": {"a": "x"}}
+
+    def test_patch_creates_missing_state(self):
+        assert store.patch_user_state("alice", {"v": 1}, expected_version=0) == 1
+        assert store.get_user_state("alice") == {"v": 1}
+
+    def test_stale_version_conflicts(self):
+        store.put_user_state("alice", {"v": 1})
+        store.patch_user_state("alice", {"v": 2}, expected_version=1)
+        with pytest.raises(StateVersionConflict) as exc:
+            store.patch_user_state("alice", {"v": 3}, expected_version=1)
+        assert exc.value.current_version == 2
+        assert store.get_user_state("alice") == {"v": 2}
+
+    def test_patch_is_persisted_with_version(self, monkeypatch):
+        monkeypatch.setattr(store, "_durability", "grouped")
+        monkeypatch.setattr(store, "_flusher", None)
+        store.patch_user_state("alice", {"v": 1})
+
+        raw = json.loads(store._USER_STATES_PATH.read_text(encoding="utf-8"))
+        assert raw == {"alice": {"v": 1}}
+        store._user_states.clear()
+        store._user_state_versions.clear()
+        store.load()
+        assert store.get_user_state_version("alice") == 1
+
+    def test_delete_resets_version(self):
+        store.put_user_state("alice", {"v": 1})
+        store.delete_user_state("alice")
+        assert store.get_user_state_version("alice") == 0
+
+
 # ===================================================================
 # API endpoints (FastAPI TestClient)
 # ===================================================================
@@ -151,7 +215,7 @@ class TestUserStateAPI:
         state = {"goals": [], "logged_in": True}
         put_resp = client.put("/user-state/alice", json={"state": state})
         assert put_resp.status_code == 200
-        assert put_resp.json() == {"ok": True}
+        assert put_resp.json() == {"ok": True, "version": 1}
 
         get_resp = client.get("/user-state/alice")
         assert get_resp.status_code == 200
@@ -202,3 +266,19 @@ class TestUserStateAPI:
 
         get_resp = client.get("/user-state/alice")
         assert get_resp.json()["state"] == state
+
+    def test_patch_sends_only_changed_keys(self, client):
+        client.put("/user-state/alice", json={"state": {"goals": [], "logged_in": True}})
+        resp = client.patch("/user-state/alice", json={"set": {"goals": [1]}, "unset": ["logged_in"], "version": 1})
+        assert resp.status_code == 200
+        assert resp.json() == {"ok": True, "version": 2}
+
+        get_resp = client.get("/user-state/alice").json()
+        assert get_resp == {"state": {"goals": [1]}, "version": 2}
+
+    def test_patch_stale_version_returns_409(self, client):
+        client.put("/user-state/alice", json={"state": {"v": 1}})
+        client.patch("/user-state/alice", json={"set": {"v": 2}, "version": 1})
+        resp = client.patch("/user-state/alice", json={"set": {"v": 3}, "version": 1})
+        assert resp.status_code == 409
+        assert resp.json()["detail"]["version"] == 2
@@ -0,0 +1,82 @@
+"""Awaitable facade over :mod:`utils.store` and :mod:`utils.auth_store`.
+
+The store functions do blocking file/SQLite I/O and take thread locks, and
+password hashing is CPU-bound; calling them from an ``async def`` endpoint
+stalls the event loop for every in-flight request. The coroutines here run
+the same functions on a dedicated thread pool, so semantics (return values,
+exceptions, locking and durability) are exactly those of the sync modules.
+
+Usage::
+
+    from utils import async_store
+    await async_store.upsert_profile(user_id, goal_id, profile)
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from types import ModuleType
+from typing import Any, Callable, Optional
+
+from utils import auth_store, store
+
+# Store calls are short and mostly serialized by the store's own locks; a
+# small pool keeps them off the loop without competing with the default
+# executor that runs the LLM helpers.
+_IO_THREADS = 4
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=_IO_THREADS, thread_name_prefix="store-io")
+    return _executor
+
+
+async def run(fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking store call on the store I/O pool and await its result."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), functools.partial(fn, *args, **kwargs))
+
+
+def shutdown():
+    """Wait for queued store calls and stop the pool. Call on app shutdown."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def _offload(module: ModuleType, name: str):
+    # look the function up at call time so reconfiguration and test patches apply
+    sync_fn = getattr(module, name)
+
+    @functools.wraps(sync_fn)
+    async def wrapper(*args, **kwargs):
+        return await run(getattr(module, name), *args, **kwargs)
+
+    return wrapper
+
+
+# --------------- utils.store ---------------
+
+upsert_profile = _offload(store, "upsert_profile")
+get_profile = _offload(store, "get_profile")
+get_all_profiles_for_user = _offload(store, "get_all_profiles_for_user")
+append_event = _offload(store, "append_event")
+get_events = _offload(store, "get_events")
+get_user_state = _offload(store, "get_user_state")
+get_user_state_version = _offload(store, "get_user_state_version")
+put_user_state = _offload(store, "put_user_state")
+patch_user_state = _offload(store, "patch_user_state")
+delete_user_state = _offload(store, "delete_user_state")
+delete_all_user_data = _offload(store, "delete_all_user_data")
+
+# --------------- utils.auth_store ---------------
+
+create_user = _offload(auth_store, "create_user")
+verify_password = _offload(auth_store, "verify_password")
+get_user = _offload(auth_store, "get_user")
+delete_user = _offload(auth_store, "delete_user")
@@ -1,43 +1,114 @@
-"""JSON file-backed persistence for user credentials."""
+"""JSON file-backed persistence for user credentials.
+
+Safe to share between worker processes: writes hold an exclusive ``flock`` on
+``data/.auth_store.lock`` and replace ``users.json`` atomically, and reads
+reload the file when another process has changed it.
+
+The whole file is parsed on first use. With ``storage.backend: sqlite``
+users are kept in the shared :class:`utils.sqlite_store.SQLiteStore`
+instead (see :func:`configure`) and are looked up one row at a time.
+"""
 
 import json
+import os
 import threading
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple, Union
 
 import bcrypt
+from omegaconf import DictConfig
+
+from utils.file_lock import locked
+from utils.sqlite_store import engine_from_config
 
 _DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 _USERS_PATH = _DATA_DIR / "users.json"
 
 _lock = threading.Lock()
 _users: Dict[str, Dict[str, Any]] = {}
+# (path, st_ino, st_mtime_ns, st_size) of users.json as last read or written
+_users_stamp: Optional[Tuple[str, int, int, int]] = None
 
+# SQLiteStore when storage.backend is "sqlite"; None for users.json
+_engine = None
 
-def load():
-    """Read persisted user data from disk into memory. Call once at startup."""
-    global _users
-    _DATA_DIR.mkdir(parents=True, exist_ok=True)
+
+def configure(config: Union[DictConfig, Dict[str, Any]]):
+    """Select the storage engine from the ``storage`` section of the app config."""
+    global _engine
+    _engine = engine_from_config(config)
+
+
+def _locked():
+    return locked(_lock, _DATA_DIR / ".auth_store.lock")
+
+
+def _stamp() -> Optional[Tuple[str, int, int, int]]:
+    try:
+        st = _USERS_PATH.stat()
+    except FileNotFoundError:
+        return (str(_USERS_PATH), 0, 0, 0)
+    return (str(_USERS_PATH), st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _reload():
+    global _users, _users_stamp
+    _users_stamp = _stamp()
     if _USERS_PATH.exists():
         try:
             _users = json.loads(_USERS_PATH.read_text(encoding="utf-8"))
         except Exception:
             _users = {}
+    else:
+        _users = {}
+
+
+def _refresh():
+    """Reload users.json if another process replaced it since we last saw it."""
+    if _users_stamp != _stamp():
+        with _locked():
+            if _users_stamp != _stamp():
+                _reload()
+
+
+def load():
+    """Read persisted user data from disk into memory. Call once at startup."""
+    if _engine is not None:
+        return
+    _DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with _locked():
+        _reload()
 
 
 def _flush():
+    global _users_stamp
     _DATA_DIR.mkdir(parents=True, exist_ok=True)
-    _USERS_PATH.write_text(
-        json.dumps(_users, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    tmp_path = _USERS_PATH.with_name(_USERS_PATH.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(json.dumps(_users, ensure_ascii=False, indent=2))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, _USERS_PATH)
+    _users_stamp = _stamp()
 
 
 def create_user(username: str, password: str) -> Dict[str, Any]:
     """Hash password with bcrypt and store. Raises ValueError if user exists."""
-    with _lock:
-        if username in _users:
+    if _engine is not None:
+        if _engine.get_user(username) is not None:
             raise ValueError("User already exists")
         hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+        user = {"username": username, "password_hash": hashed.decode("utf-8")}
+        _engine.create_user(username, user)
+        return user
+    if get_user(username) is not None:
+        raise ValueError("User already exists")
+    hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt())
+    with _locked():
+        if _users_stamp != _stamp():
+            _reload()
+        if username in _users:
+            raise ValueError("User already exists")
         _users[username] = {"username": username, "password_hash": hashed.decode("utf-8")}
         _flush()
         return _users[username]
@@ -45,7 +116,7 @@ def create_user(username: str, password: str) -> Dict[str, Any]:
 
 def verify_password(username: str, password: str) -> bool:
     """Check password against stored bcrypt hash."""
-    user = _users.get(username)
+    user = get_user(username)
     if not user:
         return False
     return bcrypt.checkpw(
@@ -54,11 +125,18 @@ def verify_password(username: str, password: str) -> bool:
 
 
 def get_user(username: str) -> Optional[Dict[str, Any]]:
+    if _engine is not None:
+        return _engine.get_user(username)
+    _refresh()
     return _users.get(username)
 
 
 def delete_user(username: str) -> bool:
-    with _lock:
+    if _engine is not None:
+        return _engine.delete_user(username)
+    with _locked():
+        if _users_stamp != _stamp():
+            _reload()
         removed = _users.pop(username, None)
         _flush()
         return removed is not None
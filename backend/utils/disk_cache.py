@@ -0,0 +1,154 @@
+"""Size-bounded on-disk key/value cache with TTL and LRU eviction.
+
+Backed by a single SQLite file in WAL mode, so several worker processes can
+share one cache. Values are opaque bytes; callers encode them (usually with
+:func:`utils.serialization.encode_record`). Expired entries are treated as
+misses and removed lazily; once the cache exceeds ``max_entries`` or
+``max_bytes`` the least recently read entries are evicted.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Mapping, Optional, Union
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+class DiskCache:
+    """Thread-safe persistent cache; one instance per file is enough per process."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_entries: int = 10_000,
+        max_bytes: int = 256 * 2**20,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[bytes]:
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[1] is not None and row[1] <= now:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: bytes, ttl_seconds: Optional[float] = None) -> None:
+        """Store *value*; *ttl_seconds* overrides the cache-wide TTL for this entry."""
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires = now + ttl if ttl else None
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), expires, now),
+            )
+            self._evict(now)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """The stored values among *keys*, read in one transaction; absent keys are left out."""
+        now = time.time()
+        found: Dict[str, bytes] = {}
+        with self._lock, self._conn:
+            for key in dict.fromkeys(keys):
+                row = self._conn.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+                if row is not None and (row[1] is None or row[1] > now):
+                    found[key] = row[0]
+                else:
+                    self.misses += 1
+                    if row is not None:
+                        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._conn.executemany("UPDATE entries SET accessed = ? WHERE key = ?", [(now, key) for key in found])
+            self.hits += len(found)
+        return found
+
+    def set_many(self, items: Mapping[str, bytes], ttl_seconds: Optional[float] = None) -> None:
+        """Store all *items* in one transaction, evicting once at the end."""
+        now = time.time()
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires = now + ttl if ttl else None
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                [(key, value, len(value), expires, now) for key, value in items.items()],
+            )
+            self._evict(now)
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def _evict(self, now: float) -> None:
+        conn = self._conn
+        self.evictions += conn.execute(
+            "DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,)
+        ).rowcount
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+        # walk from the least recently read entry until both bounds hold
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany("DELETE FROM entries WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,50 @@
+"""Time and event-type filters for behavior-event range queries.
+
+Shared by the JSON store and the SQLite engine so both answer
+``query_events`` identically. Bounds accept ISO-8601 strings or datetimes;
+timezone-aware values are compared in UTC.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Union
+
+Timestamp = Union[str, datetime, None]
+
+
+def parse_ts(value: Timestamp) -> Optional[datetime]:
+    """Return *value* as a naive UTC datetime, or None if it is missing or unparseable."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def event_matches(
+    event: Dict[str, Any],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    event_type: Optional[str] = None,
+) -> bool:
+    """True if *event* has *event_type* and a ``ts`` in ``[start, end)``.
+
+    *start* and *end* must already be normalized with :func:`parse_ts`.
+    Events without a parseable timestamp never match a time bound.
+    """
+    if event_type is not None and event.get("event_type") != event_type:
+        return False
+    if start is None and end is None:
+        return True
+    ts = parse_ts(event.get("ts"))
+    if ts is None:
+        return False
+    if start is not None and ts < start:
+        return False
+    if end is not None and ts >= end:
+        return False
+    return True
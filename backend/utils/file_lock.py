@@ -0,0 +1,30 @@
+"""Exclusive locks shared by the threads of this process and by other processes."""
+
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+@contextmanager
+def locked(thread_lock: threading.Lock, lock_path: Path):
+    """Hold *thread_lock* and an ``flock`` on *lock_path* for the duration of the block.
+
+    The lock is not reentrant: code running inside the block must not try to
+    acquire it again.
+    """
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(lock_path, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
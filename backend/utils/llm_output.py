@@ -1,6 +1,21 @@
 import re
 import json
-from typing import Dict, Any
+from typing import Any, Dict
+
+# Bump whenever parsing changes what a given LLM reply turns into; cached
+# responses (base.response_cache) are keyed by it.
+PARSER_VERSION = 3
+
+_THINK_OPEN, _THINK_CLOSE = "<think>", "</think>"
+# what matters while looking for a value, inside it, and inside one of its strings
+_BEFORE_VALUE = re.compile(r"<think>|[{\[]")
+_IN_VALUE = re.compile(r'["{}\[\]]')
+_IN_STRING = re.compile(r'["\\]')
+# the only text allowed before a top-level array: whitespace and a code fence opener
+_ARRAY_LEAD = re.compile(r"\s*(?:```[A-Za-z]*\s*)?\Z")
+_INVALID_ESCAPE = re.compile(r'\\(?!["/bfnrt]|u[0-9a-fA-F]{4})')
+# strict=False accepts raw newlines and tabs inside strings
+_DECODER = json.JSONDecoder(strict=False)
 
 
 def _fix_invalid_escapes(s: str) -> str:
@@ -11,52 +26,188 @@ def _fix_invalid_escapes(s: str) -> str:
     json.loads to fail.  This helper doubles those backslashes so the
     literal text is preserved.
     """
-    return re.sub(
-        r'\\(?!["\\/bfnrtu])',
-        r'\\\\',
-        s,
-    )
+    # Splitting on escaped backslashes first (pairs from the left, as JSON reads
+    # them) leaves only single backslashes, which the lookahead can judge.
+    return "\\\\".join(_INVALID_ESCAPE.sub(r"\\\\", part) for part in s.split("\\\\"))
+
+
+def _decode_value(text: str, start: int) -> Any:
+    """Decode the JSON value opening at ``text[start]``; anything after it is ignored.
+
+    On a JSONDecodeError, ``pos`` is where decoding gave up, so a caller
+    looking for the next candidate can continue from there.
+    """
+    try:
+        return _DECODER.raw_decode(text, start)[0]
+    except json.JSONDecodeError as exc:
+        if "escape" not in exc.msg:
+            raise
+    try:
+        return _DECODER.raw_decode(_fix_invalid_escapes(text[start:]))[0]
+    except json.JSONDecodeError as exc:
+        raise json.JSONDecodeError(exc.msg, text, start + 1) from exc
+
+
+def _value_starts(text: str):
+    """Indices where the reply's JSON value may open, outside ``<think>`` blocks.
+
+    A ``<think>`` that is never closed (the model ran out of budget) hides
+    nothing: the text after it is scanned as visible. A top-level array only
+    counts when nothing but whitespace or a fence opener precedes it, so
+    bracketed prose such as ``[1]`` is skipped.
+    """
+    pos = visible_from = 0
+    while True:
+        match = _BEFORE_VALUE.search(text, pos)
+        if match is None:
+            return
+        pos = match.end()
+        if match.group() == _THINK_OPEN:
+            close = text.find(_THINK_CLOSE, pos)
+            if close != -1:
+                pos = visible_from = close + len(_THINK_CLOSE)
+        elif match.group() == "{" or _ARRAY_LEAD.match(text, visible_from, match.start()):
+            pos = yield match.start()
+
+
+def _partial_suffix(text: str, token: str) -> int:
+    """Length of the longest end of *text* that could be the start of *token*."""
+    for size in range(min(len(text), len(token) - 1), 0, -1):
+        if token.startswith(text[-size:]):
+            return size
+    return 0
 
 
 def convert_json_output(output: str) -> Dict[str, Any]:
     """
     Convert raw JSON output from the LLM into structured format.
 
+    The value is located in one scan that skips ``<think>`` blocks, code
+    fences and leading prose, then decoded once from its opening bracket;
+    trailing text is never read. Invalid escapes (LaTeX) are kept literally.
+    A candidate that does not decode, such as ``{braces}`` in prose, is
+    skipped and the scan continues where decoding gave up.
+
     Args:
         output: The JSON output from the LLM
 
     Returns:
         Structured JSON output
     """
-    output = output.strip()
-    if output.startswith("```json"):
-        output = output[7:].strip()
-    if output.endswith("```"):
-        output = output[:-3].strip()
-    if output.endswith("```json"):
-        output = output[:-7].strip()
-    try:
-        # Attempt to parse the output as JSON
-        return json.loads(output)
-    except json.JSONDecodeError:
-        pass
-    # Fix invalid escape sequences and retry
-    fixed = _fix_invalid_escapes(output)
-    try:
-        return json.loads(fixed)
-    except json.JSONDecodeError:
-        pass
-    # Try to extract JSON object from the output string
-    start_idx = output.find('{')
-    end_idx = output.rfind('}') + 1
-    if start_idx != -1 and end_idx != 0:
-        json_str = output[start_idx:end_idx]
+    starts = _value_starts(output)
+    resume = None
+    while True:
+        try:
+            start = starts.send(resume)
+        except StopIteration:
+            raise json.JSONDecodeError("No valid JSON found in response", output, 0) from None
         try:
-            return json.loads(json_str)
-        except json.JSONDecodeError:
-            json_str = _fix_invalid_escapes(json_str)
-            return json.loads(json_str)
-    raise json.JSONDecodeError("No valid JSON found in response", output, 0)
+            return _decode_value(output, start)
+        except json.JSONDecodeError as exc:
+            resume = max(exc.pos, start + 1)
+
+
+class JsonExtractor:
+    """Incremental counterpart of :func:`convert_json_output` for streamed text.
+
+    ``feed`` tracks strings and bracket nesting across chunks, skipping
+    ``<think>`` blocks even when a tag is split, and returns True as soon as
+    the value's closing bracket arrives. The value is then decoded once, the
+    same way :func:`convert_json_output` does; later chunks are ignored.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0  # next index to scan
+        self._visible_from = 0  # index after the last </think>
+        self._in_think = False
+        self._start = -1  # index of the value's opening bracket, -1 while looking for it
+        self._depth = 0
+        self._in_string = False
+        self._done = False
+        self._value: Any = None
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, chunk: str) -> bool:
+        """Scan *chunk*; True once the value is complete."""
+        if not self._done:
+            self._buffer += chunk
+            self._scan()
+        return self._done
+
+    def close(self) -> Any:
+        """The decoded value; raises JSONDecodeError if none was completed."""
+        if not self._done and self._in_think:
+            # the reply ended inside a <think> block, so it holds the only candidates
+            self._value = convert_json_output(self._buffer)
+            self._done = True
+        if not self._done:
+            raise json.JSONDecodeError("No valid JSON found in response", self._buffer, max(self._start, 0))
+        return self._value
+
+    def _scan(self) -> None:
+        buf = self._buffer
+        while not self._done:
+            if self._in_think:
+                idx = buf.find(_THINK_CLOSE, self._pos)
+                if idx == -1:
+                    self._pos = max(self._pos, len(buf) - len(_THINK_CLOSE) + 1)
+                    return
+                self._pos = self._visible_from = idx + len(_THINK_CLOSE)
+                self._in_think = False
+            elif self._start < 0:
+                match = _BEFORE_VALUE.search(buf, self._pos)
+                if match is None:
+                    self._pos = max(self._pos, len(buf) - _partial_suffix(buf, _THINK_OPEN))
+                    return
+                self._pos = match.end()
+                if match.group() == _THINK_OPEN:
+                    self._in_think = True
+                elif match.group() == "{" or _ARRAY_LEAD.match(buf, self._visible_from, match.start()):
+                    self._start = match.start()
+                    self._depth = 1
+            elif self._in_string:
+                match = _IN_STRING.search(buf, self._pos)
+                if match is None:
+                    self._pos = len(buf)
+                    return
+                if match.group() == "\\":
+                    if match.end() == len(buf):
+                        self._pos = match.start()  # the escaped character is in the next chunk
+                        return
+                    self._pos = match.end() + 1
+                    continue
+                self._in_string = False
+                self._pos = match.end()
+            else:
+                match = _IN_VALUE.search(buf, self._pos)
+                if match is None:
+                    self._pos = len(buf)
+                    return
+                self._pos = match.end()
+                char = match.group()
+                if char == '"':
+                    self._in_string = True
+                elif char in "{[":
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._decode()
+
+    def _decode(self) -> None:
+        try:
+            self._value = _decode_value(self._buffer, self._start)
+            self._done = True
+        except json.JSONDecodeError as exc:
+            # not JSON after all; keep looking after the point where decoding gave up
+            self._pos = max(exc.pos, self._start + 1)
+            self._start = -1
+            self._in_string = False
+
 
 def get_text_from_response(response):
     """Extract text from the response object."""
@@ -67,11 +218,75 @@ def get_text_from_response(response):
     return response['choices'][0]['text']
 
 def extract_think_and_result(info):
-    "Extract think and result content from the response info."""
-    think_match = re.search(r"<think>(.*?)</think>", info, re.DOTALL)
-    think_content = think_match.group(1).strip() if think_match else ''
-    result_content = re.sub(r"<think>.*?</think>", "", info, flags=re.DOTALL).strip()
-    return think_content, result_content
+    """Extract think and result content from the response info.
+
+    Returns the first ``<think>`` block's content and the text outside all
+    complete think blocks, found in one scan.
+    """
+    think_content, parts, pos = None, [], 0
+    while True:
+        start = info.find(_THINK_OPEN, pos)
+        end = info.find(_THINK_CLOSE, start + len(_THINK_OPEN)) if start != -1 else -1
+        if end == -1:
+            break
+        parts.append(info[pos:start])
+        if think_content is None:
+            think_content = info[start + len(_THINK_OPEN):end].strip()
+        pos = end + len(_THINK_CLOSE)
+    parts.append(info[pos:])
+    return think_content or '', "".join(parts).strip()
+
+
+class ThinkStripper:
+    """Incremental counterpart of :func:`extract_think_and_result` for streamed text.
+
+    ``feed`` returns the visible part of each chunk; text inside
+    ``<think>...</think>`` is dropped even when a tag is split across chunks.
+    Leading whitespace of the visible reply is dropped as well.
+    """
+
+    OPEN, CLOSE = "<think>", "</think>"
+
+    def __init__(self):
+        self._buffer = ""
+        self._in_think = False
+        self._started = False
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        visible = []
+        while self._buffer:
+            if self._in_think:
+                idx = self._buffer.find(self.CLOSE)
+                if idx == -1:
+                    # keep just enough to recognise a split closing tag
+                    self._buffer = self._buffer[-(len(self.CLOSE) - 1):]
+                    break
+                self._buffer = self._buffer[idx + len(self.CLOSE):]
+                self._in_think = False
+                continue
+            idx = self._buffer.find(self.OPEN)
+            if idx != -1:
+                visible.append(self._buffer[:idx])
+                self._buffer = self._buffer[idx + len(self.OPEN):]
+                self._in_think = True
+                continue
+            keep = _partial_suffix(self._buffer, self.OPEN)
+            visible.append(self._buffer[:len(self._buffer) - keep])
+            self._buffer = self._buffer[len(self._buffer) - keep:]
+            break
+        return self._emit("".join(visible))
+
+    def flush(self) -> str:
+        rest = "" if self._in_think else self._buffer
+        self._buffer = ""
+        return self._emit(rest)
+
+    def _emit(self, text: str) -> str:
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        return text
 
 
 def preprocess_response(response, only_text=True, exclude_think=False, json_output=False):
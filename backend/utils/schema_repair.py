@@ -0,0 +1,158 @@
+"""Repair of LLM output that parses as JSON but fails schema validation.
+
+Two stages, cheapest first:
+
+1. Deterministic fixes, without another LLM call. Values outside a ``ge``/``le``
+   bound are clamped and over-long lists or strings are truncated to their
+   ``max_length``. Validators written for this module fix what they know how
+   to fix instead of raising while :func:`repairing` is true, for example
+   dropping duplicate names or cutting a list down to its maximum.
+2. Fragment feedback. :func:`feedback_prompt` describes only the failing fields
+   and their values. The LLM answers with replacements for those fields, which
+   :func:`apply_patch` merges into the document, so the rest of the reply is
+   not generated again.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from pydantic import BaseModel, ValidationError, ValidationInfo, create_model, model_validator
+
+_FRAGMENT_CHARS = 300
+
+
+def repairing(info: ValidationInfo) -> bool:
+    """True while :func:`repair_output` validates; validators may then fix instead of raise."""
+    return bool(info.context and info.context.get("repair"))
+
+
+def note_repair(info: ValidationInfo, message: str) -> None:
+    """Record a fix made by a validator, for logging by the caller."""
+    if info.context is not None:
+        info.context.setdefault("repairs", []).append(message)
+
+
+def path_of(loc: Sequence[Any]) -> str:
+    return ".".join(str(part) for part in loc)
+
+
+def _parent(document: Any, loc: Sequence[Any]) -> Tuple[Any, Any]:
+    """The container holding ``loc`` and the key into it; raises LookupError/TypeError if absent."""
+    node = document
+    for part in loc[:-1]:
+        node = node[int(part) if isinstance(node, list) else part]
+    last = loc[-1]
+    return node, int(last) if isinstance(node, list) else last
+
+
+def _fix(document: Any, error: Dict[str, Any]) -> Optional[str]:
+    """Apply a generic fix for one pydantic error; returns a description, or None if unfixable."""
+    kind, loc, ctx = error["type"], error["loc"], error.get("ctx") or {}
+    if not loc:
+        return None
+    try:
+        parent, key = _parent(document, loc)
+        value = parent[key]
+    except (LookupError, TypeError, ValueError):
+        return None
+    if kind == "greater_than_equal":
+        parent[key] = ctx["ge"]
+    elif kind == "less_than_equal":
+        parent[key] = ctx["le"]
+    elif kind in ("too_long", "string_too_long") and isinstance(value, (list, str)):
+        parent[key] = value[: ctx["max_length"]]
+    else:
+        return None
+    return f"{path_of(loc)}: {error['msg']}"
+
+
+def repair_output(schema: Type[BaseModel], data: Any, max_passes: int = 3) -> Tuple[Any, List[str]]:
+    """Return ``(data, fixes)`` where *data* validates against *schema*.
+
+    *data* comes back unchanged with no fixes when it is already valid.
+    Otherwise the repaired copy is returned as JSON-compatible data. Raises
+    the last ValidationError when the remaining errors cannot be fixed
+    deterministically.
+    """
+    try:
+        schema.model_validate(data)
+        return data, []
+    except ValidationError:
+        pass
+    document = copy.deepcopy(data)
+    context: Dict[str, Any] = {"repair": True, "repairs": []}
+    for _ in range(max_passes):
+        try:
+            validated = schema.model_validate(document, context=context)
+            return validated.model_dump(mode="json"), context["repairs"]
+        except ValidationError as exc:
+            error = exc
+        fixes = [fix for fix in (_fix(document, e) for e in error.errors()) if fix]
+        if not fixes:
+            break
+        context["repairs"].extend(fixes)
+    raise error
+
+
+def feedback_prompt(error: ValidationError) -> str:
+    """Correction request naming only the failing fields and their current values."""
+    lines = []
+    for item in error.errors():
+        fragment = json.dumps(item.get("input"), ensure_ascii=False, default=str)
+        if len(fragment) > _FRAGMENT_CHARS:
+            fragment = fragment[:_FRAGMENT_CHARS] + "..."
+        lines.append(f"- `{path_of(item['loc']) or '(root)'}`: {item['msg'].rstrip('.')}. Current value: {fragment}")
+    return (
+        "Your JSON parsed, but these fields failed validation:\n"
+        + "\n".join(lines)
+        + "\n\nReturn ONLY a JSON object that maps each listed path to its corrected value, "
+        'e.g. {"items.2.reason": "..."}. Do not repeat the rest of the document.'
+    )
+
+
+def apply_patch(document: Any, patch: Dict[str, Any]) -> Any:
+    """Copy of *document* with each ``"a.0.b"`` path in *patch* set to its value."""
+    document = copy.deepcopy(document)
+    for path, value in patch.items():
+        if path in ("", "(root)"):
+            document = value
+            continue
+        try:
+            parent, key = _parent(document, path.split("."))
+            parent[key] = value
+        except (LookupError, TypeError, ValueError):
+            # the reply used an unknown path; a top-level key is still a valid replacement
+            if isinstance(document, dict) and "." not in path:
+                document[path] = value
+    return document
+
+
+_repairing_models: Dict[type, Type[BaseModel]] = {}
+
+
+def repairing_model(schema: Type[BaseModel]) -> Type[BaseModel]:
+    """Subclass of *schema* (same name) that falls back to :func:`repair_output` when validation fails.
+
+    Used as the structured-output schema so deterministic fixes also apply to
+    tool-call arguments, which are validated inside the agent graph.
+    """
+    model = _repairing_models.get(schema)
+    if model is None:
+
+        def _repair(cls, data, handler):
+            try:
+                return handler(data)
+            except ValidationError:
+                return handler(repair_output(schema, data)[0])
+
+        model = create_model(
+            schema.__name__,
+            __base__=schema,
+            __doc__=schema.__doc__,
+            __validators__={"_repair": model_validator(mode="wrap")(_repair)},
+        )
+        _repairing_models[schema] = model
+    return model
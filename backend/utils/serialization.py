@@ -0,0 +1,84 @@
+"""Encoders for store snapshots, log records and compressed archives.
+
+Snapshots are written either as JSON (``orjson``, indented so the files stay
+readable) or as msgpack compressed with zstd. :func:`decode_snapshot` tells
+the two apart by the zstd frame magic, so a data directory written in one
+format is read transparently after switching ``storage.snapshot_format`` and
+is rewritten in the new format on the next flush.
+"""
+
+from typing import Any, BinaryIO, Iterable, Iterator
+
+import orjson
+import ormsgpack
+import zstandard
+
+SNAPSHOT_FORMATS = ("json", "msgpack")
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_ZSTD_LEVEL = 3
+
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+_MSGPACK_OPTIONS = ormsgpack.OPT_NON_STR_KEYS
+
+
+def encode_snapshot(obj: Any, fmt: str = "json") -> bytes:
+    if fmt == "json":
+        return orjson.dumps(obj, option=_JSON_OPTIONS)
+    if fmt == "msgpack":
+        packed = ormsgpack.packb(obj, option=_MSGPACK_OPTIONS)
+        return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(packed)
+    raise ValueError(f"Unsupported snapshot format: {fmt}")
+
+
+def decode_snapshot(data: bytes) -> Any:
+    if data.startswith(_ZSTD_MAGIC):
+        return ormsgpack.unpackb(zstandard.ZstdDecompressor().decompress(data))
+    return orjson.loads(data)
+
+
+def encode_record(obj: Any) -> bytes:
+    """One compact JSON line (without the newline) for an append-only log."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+
+def decode_record(line: bytes) -> Any:
+    return orjson.loads(line)
+
+
+_ARCHIVE_READ_SIZE = 1 << 16
+
+
+def compress_records(records: Iterable[Any]) -> bytes:
+    """One zstd frame of JSON lines. Frames can be appended to an archive file."""
+    lines = b"".join(encode_record(record) + b"\n" for record in records)
+    return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(lines)
+
+
+def iter_compressed_records(f: BinaryIO, limit: int) -> Iterator[Any]:
+    """Stream records from the first *limit* bytes of a file of appended frames.
+
+    *limit* should fall on a frame boundary (the file size observed while
+    no append was in progress). Only one read buffer of decompressed data is
+    held in memory at a time.
+    """
+    dctx = zstandard.ZstdDecompressor()
+    dobj = dctx.decompressobj()
+    partial = b""
+    remaining = limit
+    while remaining > 0:
+        chunk = f.read(min(_ARCHIVE_READ_SIZE, remaining))
+        if not chunk:
+            break
+        remaining -= len(chunk)
+        while chunk:
+            partial += dobj.decompress(chunk)
+            *lines, partial = partial.split(b"\n")
+            for line in lines:
+                if line:
+                    yield decode_record(line)
+            if dobj.eof:
+                chunk = dobj.unused_data
+                dobj = dctx.decompressobj()
+            else:
+                chunk = b""
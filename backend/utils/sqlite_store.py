@@ -0,0 +1,394 @@
+"""SQLite storage engine for learner data and user credentials.
+
+Drop-in backend for :mod:`utils.store` and :mod:`utils.auth_store`, selected
+with ``storage.backend: sqlite`` in the Hydra config. Every record lives in an
+indexed table and is read on demand, so memory use does not grow with the
+number of users and each write touches a single row. Nothing is read at
+startup; with ``storage.cache_users`` the decoded data of recently active
+users is kept in a bounded LRU so repeated reads skip the query and JSON
+parsing.
+"""
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from omegaconf import DictConfig
+
+from utils.config import ensure_config_dict
+from utils.event_query import Timestamp, event_matches, parse_ts
+from utils.state_patch import apply_state_patch
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    user_id TEXT NOT NULL,
+    goal_id INTEGER NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (user_id, goal_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    ts TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_user_ts ON events (user_id, ts);
+CREATE INDEX IF NOT EXISTS idx_events_user_id ON events (user_id, id);
+
+CREATE TABLE IF NOT EXISTS user_states (
+    user_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+_instances: Dict[str, "SQLiteStore"] = {}
+_instances_lock = threading.Lock()
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class SQLiteStore:
+    """Thread-safe SQLite engine using one WAL-mode connection per thread.
+
+    Writes go through a single shared connection. Besides matching SQLite's
+    one-writer model, this makes ``PRAGMA data_version`` on that connection
+    change only when *another process* commits, which is how the per-user
+    cache notices writes from other workers.
+    """
+
+    def __init__(self, path: Union[str, Path], max_events_per_user: int = 200, cache_users: int = 0):
+        self.path = Path(path)
+        self.max_events_per_user = max_events_per_user
+        self.cache_users = cache_users
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._write_lock = threading.Lock()
+        self._write_conn = self._connect(check_same_thread=False)
+        # user_id -> {"profiles" | "events" | "state": decoded value}, least recently used first
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._cache_generation = 0
+        self._data_version = None
+        with self._writer() as conn:
+            conn.executescript(_SCHEMA)
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(user_states)")]
+            if "version" not in columns:  # databases created before state versioning
+                conn.execute("ALTER TABLE user_states ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+
+    @staticmethod
+    def from_config(config: Union[DictConfig, Dict[str, Any]]) -> "SQLiteStore":
+        """Return the shared engine for ``storage.sqlite_path`` (relative to backend/)."""
+        config = ensure_config_dict(config)
+        path = Path(config.get("storage", {}).get("sqlite_path", "data/genmentor.db"))
+        if not path.is_absolute():
+            path = _BACKEND_DIR / path
+        cache_users = config.get("storage", {}).get("cache_users")
+        return get_sqlite_store(path, cache_users=1000 if cache_users is None else int(cache_users))
+
+    def _connect(self, **kwargs) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, **kwargs)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _conn(self) -> sqlite3.Connection:
+        """This thread's read connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _writer(self):
+        """The shared write connection inside a transaction."""
+        with self._write_lock, self._write_conn as conn:
+            yield conn
+
+    # --------------- per-user cache ---------------
+
+    def _sync_cache(self):
+        """Drop the whole cache if another process committed since the last check."""
+        with self._write_lock:
+            version = self._write_conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            with self._cache_lock:
+                self._cache.clear()
+                self._cache_generation += 1
+                self._data_version = version
+
+    def _cached(self, user_id: str, part: str, load: Callable[[], Any]) -> Any:
+        if not self.cache_users:
+            return load()
+        self._sync_cache()
+        with self._cache_lock:
+            entry = self._cache.get(user_id)
+            if entry is not None and part in entry:
+                self._cache.move_to_end(user_id)
+                self.cache_hits += 1
+                return entry[part]
+            self.cache_misses += 1
+            generation = self._cache_generation
+        value = load()
+        with self._cache_lock:
+            # a write that raced with the load bumped the generation; don't cache stale data
+            if generation == self._cache_generation:
+                self._cache.setdefault(user_id, {})[part] = value
+                self._cache.move_to_end(user_id)
+                while len(self._cache) > self.cache_users:
+                    self._cache.popitem(last=False)
+        return value
+
+    def _invalidate(self, user_id: str):
+        with self._cache_lock:
+            self._cache.pop(user_id, None)
+            self._cache_generation += 1
+
+    def cache_info(self) -> Dict[str, int]:
+        return {"hits": self.cache_hits, "misses": self.cache_misses, "users": len(self._cache)}
+
+    # --------------- profiles ---------------
+
+    def upsert_profile(self, user_id: str, goal_id: int, profile: Dict[str, Any]):
+        with self._writer() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO profiles (user_id, goal_id, data) VALUES (?, ?, ?)",
+                (user_id, goal_id, _dumps(profile)),
+            )
+        self._invalidate(user_id)
+
+    def _load_profiles(self, user_id: str) -> Dict[int, Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT goal_id, data FROM profiles WHERE user_id = ? ORDER BY goal_id", (user_id,)
+        ).fetchall()
+        return {goal_id: json.loads(data) for goal_id, data in rows}
+
+    def get_profile(self, user_id: str, goal_id: int) -> Optional[Dict[str, Any]]:
+        return self._cached(user_id, "profiles", lambda: self._load_profiles(user_id)).get(goal_id)
+
+    def get_all_profiles_for_user(self, user_id: str) -> Dict[int, Dict[str, Any]]:
+        return dict(self._cached(user_id, "profiles", lambda: self._load_profiles(user_id)))
+
+    # --------------- events ---------------
+
+    def append_event(self, user_id: str, event: Dict[str, Any]):
+        with self._writer() as conn:
+            conn.execute(
+                "INSERT INTO events (user_id, ts, data) VALUES (?, ?, ?)",
+                (user_id, event.get("ts"), _dumps(event)),
+            )
+        self._invalidate(user_id)
+
+    def get_events(self, user_id: str) -> List[Dict[str, Any]]:
+        """The user's ``max_events_per_user`` most recent events; older rows stay queryable."""
+        return list(self._cached(user_id, "events", lambda: self._load_events(user_id)))
+
+    def _load_events(self, user_id: str) -> List[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT data FROM ("
+            "  SELECT id, data FROM events WHERE user_id = ? ORDER BY id DESC LIMIT ?"
+            ") ORDER BY id",
+            (user_id, self.max_events_per_user),
+        ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def query_events(
+        self,
+        user_id: str,
+        start: Timestamp = None,
+        end: Timestamp = None,
+        event_type: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        start, end = parse_ts(start), parse_ts(end)
+        # a separate connection: the cursor is consumed lazily, possibly from another thread
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            cursor = conn.execute("SELECT data FROM events WHERE user_id = ? ORDER BY id", (user_id,))
+            for (data,) in cursor:
+                event = json.loads(data)
+                if event_matches(event, start, end, event_type):
+                    yield event
+        finally:
+            conn.close()
+
+    # --------------- user states ---------------
+
+    def _load_user_state(self, user_id: str):
+        row = self._conn().execute(
+            "SELECT data, version FROM user_states WHERE user_id = ?", (user_id,)
+        ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else (None, 0)
+
+    def get_user_state(self, user_id: str) -> Optional[Dict[str, Any]]:
+        return self._cached(user_id, "state", lambda: self._load_user_state(user_id))[0]
+
+    def get_user_state_version(self, user_id: str) -> int:
+        return self._cached(user_id, "state", lambda: self._load_user_state(user_id))[1]
+
+    def put_user_state(self, user_id: str, state: Dict[str, Any]) -> int:
+        with self._writer() as conn:
+            conn.execute(
+                "INSERT INTO user_states (user_id, data, version) VALUES (?, ?, 1) "
+                "ON CONFLICT (user_id) DO UPDATE SET data = excluded.data, version = version + 1",
+                (user_id, _dumps(state)),
+            )
+            version = conn.execute(
+                "SELECT version FROM user_states WHERE user_id = ?", (user_id,)
+            ).fetchone()[0]
+        self._invalidate(user_id)
+        return version
+
+    def patch_user_state(
+        self,
+        user_id: str,
+        updates: Dict[str, Any],
+        removals: List[str] = (),
+        expected_version: Optional[int] = None,
+    ) -> int:
+        with self._writer() as conn:
+            # take the write lock before reading so the version check cannot race
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT data, version FROM user_states WHERE user_id = ?", (user_id,)
+            ).fetchone()
+            state, version = (json.loads(row[0]), row[1]) if row else (None, 0)
+            state = apply_state_patch(state, version, updates, removals, expected_version)
+            conn.execute(
+                "INSERT OR REPLACE INTO user_states (user_id, data, version) VALUES (?, ?, ?)",
+                (user_id, _dumps(state), version + 1),
+            )
+        self._invalidate(user_id)
+        return version + 1
+
+    def delete_user_state(self, user_id: str):
+        with self._writer() as conn:
+            conn.execute("DELETE FROM user_states WHERE user_id = ?", (user_id,))
+        self._invalidate(user_id)
+
+    def delete_all_user_data(self, user_id: str):
+        with self._writer() as conn:
+            conn.execute("DELETE FROM profiles WHERE user_id = ?", (user_id,))
+            conn.execute("DELETE FROM events WHERE user_id = ?", (user_id,))
+            conn.execute("DELETE FROM user_states WHERE user_id = ?", (user_id,))
+        self._invalidate(user_id)
+
+    # --------------- users ---------------
+
+    def create_user(self, username: str, user: Dict[str, Any]):
+        """Insert a user record. Raises ValueError if the user exists."""
+        try:
+            with self._writer() as conn:
+                conn.execute(
+                    "INSERT INTO users (username, data) VALUES (?, ?)", (username, _dumps(user))
+                )
+        except sqlite3.IntegrityError:
+            raise ValueError("User already exists")
+
+    def get_user(self, username: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute(
+            "SELECT data FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def delete_user(self, username: str) -> bool:
+        with self._writer() as conn:
+            cursor = conn.execute("DELETE FROM users WHERE username = ?", (username,))
+        return cursor.rowcount > 0
+
+    # --------------- migration ---------------
+
+    def import_records(
+        self,
+        profiles: Dict[str, Dict[str, Any]],
+        events: Dict[str, List[Dict[str, Any]]],
+        user_states: Dict[str, Dict[str, Any]],
+        users: Dict[str, Dict[str, Any]],
+        user_state_versions: Optional[Dict[str, int]] = None,
+    ):
+        """Bulk-copy the JSON backend's in-memory dicts into this database.
+
+        *user_state_versions* carries each state's version over, so clients
+        already holding it can keep patching without a version conflict.
+        """
+        versions = user_state_versions or {}
+        with self._writer() as conn:
+            for key, profile in profiles.items():
+                user_id, _, goal_id = key.rpartition(":")
+                conn.execute(
+                    "INSERT OR REPLACE INTO profiles (user_id, goal_id, data) VALUES (?, ?, ?)",
+                    (user_id, int(goal_id) if goal_id.isdigit() else goal_id, _dumps(profile)),
+                )
+            for user_id, user_events in events.items():
+                conn.execute("DELETE FROM events WHERE user_id = ?", (user_id,))
+                conn.executemany(
+                    "INSERT INTO events (user_id, ts, data) VALUES (?, ?, ?)",
+                    [(user_id, e.get("ts"), _dumps(e)) for e in user_events],
+                )
+            conn.executemany(
+                "INSERT OR REPLACE INTO user_states (user_id, data, version) VALUES (?, ?, ?)",
+                [(user_id, _dumps(state), int(versions.get(user_id, 0))) for user_id, state in user_states.items()],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO users (username, data) VALUES (?, ?)",
+                [(username, _dumps(user)) for username, user in users.items()],
+            )
+        with self._cache_lock:
+            self._cache.clear()
+            self._cache_generation += 1
+
+
+def get_sqlite_store(path: Union[str, Path], cache_users: int = 0) -> SQLiteStore:
+    """Return the process-wide engine for *path*, creating it on first use."""
+    key = str(Path(path).resolve())
+    with _instances_lock:
+        if key not in _instances:
+            _instances[key] = SQLiteStore(key, cache_users=cache_users)
+        return _instances[key]
+
+
+def engine_from_config(config: Union[DictConfig, Dict[str, Any]]) -> Optional[SQLiteStore]:
+    """Return the engine selected by ``storage.backend``, or None for the JSON files."""
+    config = ensure_config_dict(config)
+    storage = config.get("storage", {})
+    backend = storage.get("backend", "json")
+    if backend == "sqlite":
+        return SQLiteStore.from_config(config)
+    if backend == "json":
+        if storage.get("cache_users") is not None:
+            # the JSON files are always loaded whole; a user cache would be silently ignored
+            raise ValueError("storage.cache_users (lazy per-user loading) requires storage.backend: sqlite")
+        return None
+    raise ValueError(f"Unsupported storage backend: {backend}")
+
+
+if __name__ == "__main__":
+    # python -m utils.sqlite_store  -- copy the JSON files in data/ into the configured database
+    from config import default_config
+    from utils import auth_store, store
+
+    store.load()
+    auth_store.load()
+    engine = SQLiteStore.from_config(default_config)
+    # full history per user: the archived events followed by the hot window
+    events = {user_id: list(store.query_events(user_id)) for user_id in store._events}
+    engine.import_records(
+        store._profiles, events, store._user_states, auth_store._users, store._user_state_versions
+    )
+    print(f"Imported JSON data into {engine.path}")
@@ -0,0 +1,38 @@
+"""Per-key merge patches for persisted UI state with optimistic versioning.
+
+Every stored user state carries a version number that is bumped on each
+write. A patch names the version it was computed against; if the state has
+moved on since, :class:`StateVersionConflict` is raised and the caller
+reloads instead of overwriting someone else's change.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+
+class StateVersionConflict(Exception):
+    """The patch was based on an outdated version of the state."""
+
+    def __init__(self, current_version: int):
+        super().__init__(f"User state is at version {current_version}")
+        self.current_version = current_version
+
+
+def apply_state_patch(
+    state: Optional[Dict[str, Any]],
+    version: int,
+    updates: Dict[str, Any],
+    removals: Iterable[str] = (),
+    expected_version: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Return *state* with *updates* merged in and *removals* dropped.
+
+    Top-level keys are replaced wholesale. ``expected_version=None`` skips
+    the version check (last writer wins per key).
+    """
+    if expected_version is not None and expected_version != version:
+        raise StateVersionConflict(version)
+    patched = dict(state or {})
+    patched.update(updates)
+    for key in removals:
+        patched.pop(key, None)
+    return patched
@@ -1,130 +1,821 @@
-"""JSON file-backed persistence for learner profiles and behavior events."""
-
-import json
+"""JSON file-backed persistence for learner profiles and behavior events.
+
+Profiles and user states are kept as JSON snapshots that are rewritten on
+change. Behavior events are written to an append-only, line-delimited log
+(``events.log``) so that logging an event costs one small append; the log is
+periodically folded into the ``events.json`` snapshot and replayed on top of
+it by :func:`load`. Only the most recent events of each user stay in memory;
+older ones are moved to a zstd-compressed per-user archive under
+``events_archive/`` when the log is compacted, and :func:`query_events`
+streams both tiers by time range and event type.
+
+The files may be shared by several worker processes (``uvicorn --workers N``):
+every flush holds an exclusive ``flock`` on ``data/.store.lock``, snapshots
+are replaced atomically, and reads first check the files' stat stamps and
+reload whatever another process changed (new log lines are replayed
+incrementally).
+
+Mutations update memory first and are persisted according to
+``storage.durability``: ``immediate`` writes them before the call returns,
+``grouped`` leaves them to a background flusher that batches dirty keys and
+commits every ``flush_interval_ms`` or ``flush_max_pending`` mutations.
+Grouped mode is only honoured for a single worker process, and user-state
+replacements and patches are committed before returning in either mode.
+Snapshots are always written to a temp file, fsynced and renamed into place;
+call :func:`close` on shutdown to flush what is still pending.
+
+The JSON snapshots can only be parsed whole, so :func:`load` reads every
+user's profiles, recent events and UI state at startup. With
+``storage.backend: sqlite`` every call is delegated to
+:class:`utils.sqlite_store.SQLiteStore` instead (see :func:`configure`),
+which loads each user's rows on first access.
+"""
+
+import atexit
+import logging
+import os
+import shutil
 import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+from omegaconf import DictConfig
+
+from utils.config import ensure_config_dict
+from utils.event_query import Timestamp, event_matches, parse_ts
+from utils.file_lock import locked
+from utils.serialization import (
+    SNAPSHOT_FORMATS,
+    compress_records,
+    decode_record,
+    decode_snapshot,
+    encode_record,
+    encode_snapshot,
+    iter_compressed_records,
+)
+from utils.state_patch import apply_state_patch
+from utils.sqlite_store import engine_from_config
 
 _DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 _PROFILES_PATH = _DATA_DIR / "profiles.json"
 _EVENTS_PATH = _DATA_DIR / "events.json"
 _USER_STATES_PATH = _DATA_DIR / "user_states.json"
+_USER_STATE_VERSIONS_PATH = _DATA_DIR / "user_state_versions.json"
+_EVENTS_ARCHIVE_DIR = _DATA_DIR / "events_archive"
+_EVENTS_LOG_PATH = _DATA_DIR / "events.log"
+
+# Only the most recent events are kept in memory per user; older ones are archived.
+_EVENTS_MAX_PER_USER = 200
+# Number of log records after which the log is folded into the snapshot.
+_EVENTS_COMPACT_EVERY = 1000
 
+logger = logging.getLogger(__name__)
+
+# guards the in-memory dicts below; held only briefly, never during disk writes
 _lock = threading.Lock()
+# serializes disk I/O within this process (paired with a cross-process flock)
+_io_lock = threading.Lock()
 
 # keyed by "{user_id}:{goal_id}"
 _profiles: Dict[str, Dict[str, Any]] = {}
-# keyed by user_id
+# user_id -> {goal_id -> profile}; secondary index over _profiles
+_profiles_by_user: Dict[str, Dict[Union[int, str], Dict[str, Any]]] = {}
+# keyed by user_id; the hot window of each user's most recent events
 _events: Dict[str, List[Dict[str, Any]]] = {}
+# events pushed out of the hot window but not yet written to the archive
+_events_evicted: Dict[str, List[Dict[str, Any]]] = {}
 # keyed by user_id — generic UI state blob per user
 _user_states: Dict[str, Dict[str, Any]] = {}
+_user_state_versions: Dict[str, int] = {}
+# records in the event log as known by this process
+_events_log_records = 0
+
+# (st_ino, st_mtime_ns, st_size) of each file as last read or written here,
+# keyed by path; a missing key means the file was never read.
+_file_stamps: Dict[str, Optional[Tuple[int, int, int]]] = {}
+# inode and byte offset up to which events.log has been replayed
+_events_log_ino: Optional[int] = None
+_events_log_offset = 0
+
+# Mutations not yet on disk. Dirty dicts map key -> new value (or _DELETED)
+# and are re-applied whenever a snapshot is reloaded from disk.
+_DELETED = object()
+_dirty_profiles: Dict[str, Any] = {}
+_dirty_user_states: Dict[str, Any] = {}
+_dirty_user_state_versions: Dict[str, Any] = {}
+_pending_event_records: List[Dict[str, Any]] = []
+_pending_mutations = 0
+
+# "immediate": persist before returning; "grouped": background group commit
+_durability = "immediate"
+_flush_interval_ms = 200
+_flush_max_pending = 100
+# "json" or "msgpack" (zstd-compressed); reads accept either
+_snapshot_format = "json"
+_flusher: Optional[threading.Thread] = None
+_flush_wakeup = threading.Event()
+_flusher_stop = threading.Event()
+
+# SQLiteStore when storage.backend is "sqlite"; None for the JSON files above
+_engine = None
+
+
+def configure(config: Union[DictConfig, Dict[str, Any]]):
+    """Select the storage engine and durability mode from the app config."""
+    global _engine, _durability, _flush_interval_ms, _flush_max_pending, _snapshot_format
+    _engine = engine_from_config(config)
+    storage = ensure_config_dict(config).get("storage", {})
+    durability = storage.get("durability", "immediate")
+    if durability not in ("immediate", "grouped"):
+        raise ValueError(f"Unsupported storage durability: {durability}")
+    if durability == "grouped" and _engine is None and _worker_count() > 1:
+        # another worker would serve stale data (or write over newer data)
+        # while changes wait in this worker's memory
+        logger.warning(
+            "storage.durability 'grouped' is not safe with %d workers (WEB_CONCURRENCY); using 'immediate'",
+            _worker_count(),
+        )
+        durability = "immediate"
+    _durability = durability
+    _flush_interval_ms = int(storage.get("flush_interval_ms", 200))
+    _flush_max_pending = int(storage.get("flush_max_pending", 100))
+    snapshot_format = storage.get("snapshot_format", "json")
+    if snapshot_format not in SNAPSHOT_FORMATS:
+        raise ValueError(f"Unsupported snapshot format: {snapshot_format}")
+    _snapshot_format = snapshot_format
+
+
+def _worker_count() -> int:
+    """Number of uvicorn worker processes sharing the data directory."""
+    try:
+        return int(os.environ.get("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        return 1
+
+
+def _locked():
+    return locked(_io_lock, _DATA_DIR / ".store.lock")
+
+
+def _stamp(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _is_stale(path: Path) -> bool:
+    return str(path) not in _file_stamps or _file_stamps[str(path)] != _stamp(path)
+
+
+def _read_snapshot(path: Path) -> Dict[str, Any]:
+    _file_stamps[str(path)] = _stamp(path)
+    if not path.exists():
+        return {}
+    try:
+        return decode_snapshot(path.read_bytes())
+    except Exception:
+        # keep the unreadable file around instead of overwriting it on the next flush
+        backup = path.with_name(path.name + ".corrupt")
+        shutil.copyfile(path, backup)
+        logger.error(f"Could not parse {path}; starting empty, original saved to {backup}")
+        return {}
+
+
+def _apply_dirty(target: Dict[str, Any], dirty: Dict[str, Any]):
+    for key, value in dirty.items():
+        if value is _DELETED:
+            target.pop(key, None)
+        else:
+            target[key] = value
+
+
+def _atomic_write(path: Path, data: bytes):
+    """Write *data* to a temp file next to *path* and rename it into place."""
+    _DATA_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _file_stamps[str(path)] = _stamp(path)
 
 
 def load():
     """Read persisted data from disk into memory. Call once at startup."""
-    global _profiles, _events, _user_states
+    if _engine is not None:
+        return
     _DATA_DIR.mkdir(parents=True, exist_ok=True)
-    if _PROFILES_PATH.exists():
-        try:
-            _profiles = json.loads(_PROFILES_PATH.read_text(encoding="utf-8"))
-        except Exception:
-            _profiles = {}
-    if _EVENTS_PATH.exists():
-        try:
-            _events = json.loads(_EVENTS_PATH.read_text(encoding="utf-8"))
-        except Exception:
-            _events = {}
-    if _USER_STATES_PATH.exists():
+    with _locked(), _lock:
+        _reload_profiles()
+        _reload_events()
+        _reload_user_states()
+
+
+def _needs_refresh() -> bool:
+    if any(_is_stale(p) for p in (_PROFILES_PATH, _USER_STATES_PATH, _USER_STATE_VERSIONS_PATH, _EVENTS_PATH)):
+        return True
+    log_stamp = _stamp(_EVENTS_LOG_PATH)
+    if log_stamp is None:
+        return _events_log_offset > 0
+    return log_stamp[0] != _events_log_ino or log_stamp[2] != _events_log_offset
+
+
+def _refresh_locked():
+    """Reload whatever another process changed on disk. Caller holds both locks."""
+    if _is_stale(_PROFILES_PATH):
+        _reload_profiles()
+    if _is_stale(_USER_STATES_PATH) or _is_stale(_USER_STATE_VERSIONS_PATH):
+        _reload_user_states()
+    if _is_stale(_EVENTS_PATH) or not _replay_events_log():
+        _reload_events()
+
+
+def _refresh():
+    """Cheap stat check before a read; takes the locks only when a reload is due."""
+    if _needs_refresh():
+        with _locked(), _lock:
+            _refresh_locked()
+
+
+# --------------- flushing ---------------
+
+def _after_mutation():
+    """Persist a mutation that was just applied in memory, per the durability mode."""
+    global _pending_mutations
+    if _durability == "immediate":
+        flush()
+        return
+    with _lock:
+        _pending_mutations += 1
+        wake = _pending_mutations >= _flush_max_pending
+    _ensure_flusher()
+    if wake:
+        _flush_wakeup.set()
+
+
+def flush():
+    """Write every pending mutation to disk (group commit)."""
+    if _engine is not None:
+        return
+    with _locked():
+        _flush_locked()
+
+
+def _flush_locked():
+    """Caller holds the I/O lock. Memory is snapshotted under ``_lock``; the
+    actual writes happen without it so requests keep going meanwhile."""
+    global _pending_mutations
+    with _lock:
+        if not (_dirty_profiles or _dirty_user_states or _pending_event_records):
+            return
+        # merge in whatever other processes wrote; our dirty keys win
+        _refresh_locked()
+        dirty_profiles = dict(_dirty_profiles)
+        dirty_user_states = dict(_dirty_user_states)
+        dirty_user_state_versions = dict(_dirty_user_state_versions)
+        records = list(_pending_event_records)
+        _dirty_profiles.clear()
+        _dirty_user_states.clear()
+        _dirty_user_state_versions.clear()
+        _pending_event_records.clear()
+        _pending_mutations = 0
+        profiles_data = encode_snapshot(_profiles, _snapshot_format) if dirty_profiles else None
+        user_states_data = encode_snapshot(_user_states, _snapshot_format) if dirty_user_states else None
+        versions_data = (
+            encode_snapshot(_user_state_versions, _snapshot_format) if dirty_user_state_versions else None
+        )
+        events_data = None
+        evicted: Dict[str, List[Dict[str, Any]]] = {}
+        if records and _events_log_records + len(records) >= _EVENTS_COMPACT_EVERY:
+            # the snapshot already contains the pending records
+            events_data = encode_snapshot(_events, _snapshot_format)
+            evicted = _take_evicted()
+        deleted_users = [r["user_id"] for r in records if r.get("op") == "delete"]
+
+    try:
+        if profiles_data is not None:
+            _atomic_write(_PROFILES_PATH, profiles_data)
+        if user_states_data is not None:
+            _atomic_write(_USER_STATES_PATH, user_states_data)
+        if versions_data is not None:
+            _atomic_write(_USER_STATE_VERSIONS_PATH, versions_data)
+        if events_data is not None:
+            _compact_events(events_data, evicted, deleted_users)
+        elif records:
+            _delete_archives(deleted_users)
+            _append_event_records(records)
+    except Exception:
+        with _lock:
+            _restore_evicted(evicted)
+            for key, value in dirty_profiles.items():
+                _dirty_profiles.setdefault(key, value)
+            for key, value in dirty_user_states.items():
+                _dirty_user_states.setdefault(key, value)
+            for key, value in dirty_user_state_versions.items():
+                _dirty_user_state_versions.setdefault(key, value)
+            _pending_event_records[:0] = records
+        raise
+
+
+def _flush_loop():
+    while not _flusher_stop.is_set():
+        _flush_wakeup.wait(_flush_interval_ms / 1000)
+        _flush_wakeup.clear()
         try:
-            _user_states = json.loads(_USER_STATES_PATH.read_text(encoding="utf-8"))
+            flush()
         except Exception:
-            _user_states = {}
+            logger.exception("Background store flush failed; will retry")
 
 
-def _flush_profiles():
-    _DATA_DIR.mkdir(parents=True, exist_ok=True)
-    _PROFILES_PATH.write_text(json.dumps(_profiles, ensure_ascii=False, indent=2), encoding="utf-8")
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _lock:
+        if _flusher is not None and _flusher.is_alive():
+            return
+        _flusher_stop.clear()
+        _flusher = threading.Thread(target=_flush_loop, name="store-flusher", daemon=True)
+        _flusher.start()
 
 
-def _flush_events():
-    _DATA_DIR.mkdir(parents=True, exist_ok=True)
-    _EVENTS_PATH.write_text(json.dumps(_events, ensure_ascii=False, indent=2), encoding="utf-8")
+def close():
+    """Stop the background flusher and write everything still pending. Call on shutdown."""
+    global _flusher
+    if _flusher is not None:
+        _flusher_stop.set()
+        _flush_wakeup.set()
+        _flusher.join()
+        _flusher = None
+    flush()
+
+
+atexit.register(close)
+
+
+# --------------- profiles ---------------
+
+def _reload_profiles():
+    global _profiles, _profiles_by_user
+    profiles = _read_snapshot(_PROFILES_PATH)
+    _apply_dirty(profiles, _dirty_profiles)
+    by_user: Dict[str, Dict[Union[int, str], Dict[str, Any]]] = {}
+    for key, profile in profiles.items():
+        user_id, goal_id = _split_profile_key(key)
+        by_user.setdefault(user_id, {})[goal_id] = profile
+    _profiles = profiles
+    _profiles_by_user = by_user
 
 
 def _profile_key(user_id: str, goal_id: int) -> str:
     return f"{user_id}:{goal_id}"
 
 
+def _split_profile_key(key: str) -> Tuple[str, Union[int, str]]:
+    user_id, _, gid = key.rpartition(":")
+    try:
+        goal_id = int(gid)
+    except ValueError:
+        return user_id, gid
+    # only canonical integers round-trip through _profile_key
+    return (user_id, goal_id) if str(goal_id) == gid else (user_id, gid)
+
+
 def upsert_profile(user_id: str, goal_id: int, profile: Dict[str, Any]):
+    if _engine is not None:
+        return _engine.upsert_profile(user_id, goal_id, profile)
+    key = _profile_key(user_id, goal_id)
+    index_user, index_goal = _split_profile_key(key)
     with _lock:
-        _profiles[_profile_key(user_id, goal_id)] = profile
-        _flush_profiles()
+        _profiles[key] = profile
+        _profiles_by_user.setdefault(index_user, {})[index_goal] = profile
+        _dirty_profiles[key] = profile
+    _after_mutation()
 
 
 def get_profile(user_id: str, goal_id: int) -> Optional[Dict[str, Any]]:
+    if _engine is not None:
+        return _engine.get_profile(user_id, goal_id)
+    _refresh()
     return _profiles.get(_profile_key(user_id, goal_id))
 
 
 def get_all_profiles_for_user(user_id: str) -> Dict[int, Dict[str, Any]]:
-    prefix = f"{user_id}:"
-    result = {}
-    for key, profile in _profiles.items():
-        if key.startswith(prefix):
-            gid = key[len(prefix):]
+    if _engine is not None:
+        return _engine.get_all_profiles_for_user(user_id)
+    _refresh()
+    return dict(_profiles_by_user.get(user_id, {}))
+
+
+# --------------- event log ---------------
+#
+# Each line of events.log is one JSON record:
+#   {"op": "append", "user_id": ..., "event": {...}}
+#   {"op": "delete", "user_id": ...}
+#
+# Compaction writes events.json.tmp, rotates events.log to events.log.old,
+# renames the temp snapshot over events.json and finally removes the old log.
+# Every intermediate state is recognisable on the next load():
+#   * .tmp without .old      -> snapshot not installed, log intact: drop .tmp
+#   * .tmp and .old          -> snapshot not installed: restore .old as the log
+#   * .old without .tmp      -> snapshot installed and covers .old: drop .old
+#
+# Events pushed out of the hot window are appended to
+# events_archive/<quoted user_id>.jsonl.zst as one zstd frame per compaction,
+# before the new snapshot is installed. The archive sizes from before the
+# append are recorded in events_archive/journal.json first; if the snapshot
+# never gets installed, recovery truncates the archives back to those sizes
+# so the same events are not archived twice when the log is replayed.
+
+
+def _events_tmp_path() -> Path:
+    return _EVENTS_PATH.with_name(_EVENTS_PATH.name + ".tmp")
+
+
+def _events_old_log_path() -> Path:
+    return _EVENTS_LOG_PATH.with_name(_EVENTS_LOG_PATH.name + ".old")
+
+
+def _archive_path(user_id: str) -> Path:
+    return _EVENTS_ARCHIVE_DIR / (quote(user_id, safe="") + ".jsonl.zst")
+
+
+def _archive_journal_path() -> Path:
+    return _EVENTS_ARCHIVE_DIR / "journal.json"
+
+
+def _apply_event_record(record: Dict[str, Any]):
+    user_id = record.get("user_id")
+    if record.get("op") == "delete":
+        _events.pop(user_id, None)
+        _events_evicted.pop(user_id, None)
+    else:
+        user_events = _events.setdefault(user_id, [])
+        user_events.append(record.get("event"))
+        overflow = len(user_events) - _EVENTS_MAX_PER_USER
+        if overflow > 0:
+            _events_evicted.setdefault(user_id, []).extend(user_events[:overflow])
+            del user_events[:overflow]
+
+
+def _take_evicted() -> Dict[str, List[Dict[str, Any]]]:
+    """Hand the not-yet-archived events to a compaction. Caller holds ``_lock``."""
+    global _events_evicted
+    evicted, _events_evicted = _events_evicted, {}
+    return evicted
+
+
+def _restore_evicted(evicted: Dict[str, List[Dict[str, Any]]]):
+    """Put back events whose compaction failed. Caller holds ``_lock``."""
+    for user_id, events in evicted.items():
+        if user_id in _events:
+            _events_evicted[user_id] = events + _events_evicted.get(user_id, [])
+
+
+def _archive_events(evicted: Dict[str, List[Dict[str, Any]]]):
+    """Append one frame per user to the archives, journaling the old sizes first."""
+    _EVENTS_ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    sizes = {}
+    for user_id in evicted:
+        path = _archive_path(user_id)
+        sizes[path.name] = path.stat().st_size if path.exists() else 0
+    _atomic_write(_archive_journal_path(), encode_record(sizes))
+    for user_id, events in evicted.items():
+        with open(_archive_path(user_id), "ab") as f:
+            f.write(compress_records(events))
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _rollback_archives():
+    """Truncate archives back to the sizes in the journal and drop it."""
+    journal = _archive_journal_path()
+    if not journal.exists():
+        return
+    for name, size in decode_record(journal.read_bytes()).items():
+        path = _EVENTS_ARCHIVE_DIR / name
+        if not path.exists():
+            continue
+        if size:
+            os.truncate(path, size)
+        else:
+            path.unlink()
+    journal.unlink()
+
+
+def _delete_archives(user_ids: List[str]):
+    for user_id in user_ids:
+        path = _archive_path(user_id)
+        if path.exists():
+            path.unlink()
+
+
+def _recover_events_compaction():
+    """Finish a compaction that was interrupted by a crash."""
+    tmp_path = _events_tmp_path()
+    old_log_path = _events_old_log_path()
+    if _archive_journal_path().exists():
+        if old_log_path.exists() and not tmp_path.exists():
+            _archive_journal_path().unlink()  # snapshot installed: archive is current
+        else:
+            _rollback_archives()
+    if old_log_path.exists():
+        if tmp_path.exists():
+            if _EVENTS_LOG_PATH.exists():
+                combined = old_log_path.read_bytes() + _EVENTS_LOG_PATH.read_bytes()
+                old_log_path.write_bytes(combined)
+            os.replace(old_log_path, _EVENTS_LOG_PATH)
+        else:
+            old_log_path.unlink()
+    if tmp_path.exists():
+        tmp_path.unlink()
+
+
+def _reload_events():
+    """Read the snapshot, replay the whole log and re-apply pending records."""
+    global _events, _events_evicted, _events_log_records, _events_log_ino, _events_log_offset
+    _recover_events_compaction()
+    _events = _read_snapshot(_EVENTS_PATH)
+    _events_evicted = {}
+    _events_log_records = 0
+    _events_log_ino = None
+    _events_log_offset = 0
+    _replay_events_log()
+    for record in _pending_event_records:
+        _apply_event_record(record)
+
+
+def _replay_events_log() -> bool:
+    """Apply log records past the replayed offset. Caller holds both locks.
+
+    Returns False when the log was rotated by another process's compaction,
+    in which case the caller must reload from the snapshot. Writers append
+    whole lines under the lock, so a torn trailing line can only come from a
+    crash mid-append; it is cut off so later appends start on a clean line.
+    """
+    global _events_log_records, _events_log_ino, _events_log_offset
+    if not _EVENTS_LOG_PATH.exists():
+        return _events_log_offset == 0
+    with open(_EVENTS_LOG_PATH, "r+b") as f:
+        st = os.fstat(f.fileno())
+        if _events_log_ino is not None and (st.st_ino != _events_log_ino or st.st_size < _events_log_offset):
+            return False
+        f.seek(_events_log_offset)
+        valid_bytes = _events_log_offset
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
             try:
-                result[int(gid)] = profile
+                record = decode_record(line)
             except ValueError:
-                result[gid] = profile
-    return result
+                break
+            _apply_event_record(record)
+            _events_log_records += 1
+            valid_bytes += len(line)
+        if valid_bytes < st.st_size:
+            f.truncate(valid_bytes)
+        _events_log_ino = st.st_ino
+        _events_log_offset = valid_bytes
+    return True
+
+
+def _append_event_records(records: List[Dict[str, Any]]):
+    """Append *records* to the log in one write. Caller holds the I/O lock."""
+    global _events_log_records, _events_log_ino, _events_log_offset
+    _DATA_DIR.mkdir(parents=True, exist_ok=True)
+    lines = b"".join(encode_record(record) + b"\n" for record in records)
+    with open(_EVENTS_LOG_PATH, "ab") as f:
+        f.write(lines)
+        f.flush()
+        st = os.fstat(f.fileno())
+    _events_log_records += len(records)
+    _events_log_ino = st.st_ino
+    _events_log_offset = st.st_size
+
+
+def _compact_events(
+    events_data: bytes,
+    evicted: Dict[str, List[Dict[str, Any]]],
+    deleted_users: List[str] = (),
+):
+    """Archive *evicted*, install *events_data* as the snapshot and start a
+    fresh log. Caller holds the I/O lock; *events_data* must cover everything
+    in the current log."""
+    global _events_log_records, _events_log_ino, _events_log_offset
+    _DATA_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = _events_tmp_path()
+    old_log_path = _events_old_log_path()
+    try:
+        _delete_archives(deleted_users)
+        if evicted:
+            _archive_events(evicted)
+        with open(tmp_path, "wb") as f:
+            f.write(events_data)
+            f.flush()
+            os.fsync(f.fileno())
+        if _EVENTS_LOG_PATH.exists():
+            os.replace(_EVENTS_LOG_PATH, old_log_path)
+        else:
+            # recovery relies on .old to tell that the snapshot was installed
+            old_log_path.touch()
+    except Exception:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        _rollback_archives()
+        raise
+    os.replace(tmp_path, _EVENTS_PATH)
+    if _archive_journal_path().exists():
+        _archive_journal_path().unlink()
+    old_log_path.unlink()
+    _file_stamps[str(_EVENTS_PATH)] = _stamp(_EVENTS_PATH)
+    _events_log_records = 0
+    _events_log_ino = None
+    _events_log_offset = 0
+
+
+def compact_events():
+    """Force a compaction of the event log (e.g. on shutdown)."""
+    if _engine is not None:
+        return
+    with _locked():
+        _flush_locked()
+        with _lock:
+            _refresh_locked()
+            events_data = encode_snapshot(_events, _snapshot_format)
+            evicted = _take_evicted()
+        try:
+            _compact_events(events_data, evicted)
+        except Exception:
+            with _lock:
+                _restore_evicted(evicted)
+            raise
 
 
 def append_event(user_id: str, event: Dict[str, Any]):
+    if _engine is not None:
+        return _engine.append_event(user_id, event)
+    record = {"op": "append", "user_id": user_id, "event": event}
     with _lock:
-        _events.setdefault(user_id, []).append(event)
-        _events[user_id] = _events[user_id][-200:]
-        _flush_events()
+        _apply_event_record(record)
+        _pending_event_records.append(record)
+    _after_mutation()
 
 
 def get_events(user_id: str) -> List[Dict[str, Any]]:
+    """The user's most recent events (the in-memory hot window)."""
+    if _engine is not None:
+        return _engine.get_events(user_id)
+    _refresh()
     return _events.get(user_id, [])
 
 
+def query_events(
+    user_id: str,
+    start: Timestamp = None,
+    end: Timestamp = None,
+    event_type: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Stream all of the user's events, oldest first, with ``start <= ts < end``.
+
+    Archived events are decompressed frame by frame, so memory stays flat
+    however long the history is. The hot window and the archive size are
+    captured together up front; events logged afterwards are not included.
+    """
+    if _engine is not None:
+        yield from _engine.query_events(user_id, start, end, event_type)
+        return
+    start, end = parse_ts(start), parse_ts(end)
+    archive = None
+    with _locked():
+        with _lock:
+            _refresh_locked()
+            recent = _events_evicted.get(user_id, []) + _events.get(user_id, [])
+        # opened under the lock so a concurrent delete cannot pull the file away
+        if _archive_path(user_id).exists():
+            archive = open(_archive_path(user_id), "rb")
+            archive_size = os.fstat(archive.fileno()).st_size
+    if archive is not None:
+        with archive:
+            for event in iter_compressed_records(archive, archive_size):
+                if event_matches(event, start, end, event_type):
+                    yield event
+    for event in recent:
+        if event_matches(event, start, end, event_type):
+            yield event
+
+
 # --------------- user states (generic UI state per user) ---------------
 
-def _flush_user_states():
-    _DATA_DIR.mkdir(parents=True, exist_ok=True)
-    _USER_STATES_PATH.write_text(json.dumps(_user_states, ensure_ascii=False, indent=2), encoding="utf-8")
+def _reload_user_states():
+    global _user_states, _user_state_versions
+    user_states = _read_snapshot(_USER_STATES_PATH)
+    versions = _read_snapshot(_USER_STATE_VERSIONS_PATH)
+    _apply_dirty(user_states, _dirty_user_states)
+    _apply_dirty(versions, _dirty_user_state_versions)
+    _user_states = user_states
+    _user_state_versions = versions
+
+
+def _set_user_state(user_id: str, state: Any, version: Any):
+    """Record a new state (or _DELETED) and its version. Caller holds ``_lock``."""
+    if state is _DELETED:
+        _user_states.pop(user_id, None)
+        _user_state_versions.pop(user_id, None)
+    else:
+        _user_states[user_id] = state
+        _user_state_versions[user_id] = version
+    _dirty_user_states[user_id] = state
+    _dirty_user_state_versions[user_id] = version
 
 
 def get_user_state(user_id: str) -> Optional[Dict[str, Any]]:
+    if _engine is not None:
+        return _engine.get_user_state(user_id)
+    _refresh()
     return _user_states.get(user_id)
 
 
-def put_user_state(user_id: str, state: Dict[str, Any]):
-    with _lock:
-        _user_states[user_id] = state
-        _flush_user_states()
+def get_user_state_version(user_id: str) -> int:
+    """Version of the stored state; 0 when the user has none."""
+    if _engine is not None:
+        return _engine.get_user_state_version(user_id)
+    _refresh()
+    return _user_state_versions.get(user_id, 0)
+
+
+def put_user_state(user_id: str, state: Dict[str, Any]) -> int:
+    """Replace the whole state and return its new version.
+
+    Like :func:`patch_user_state`, the version is assigned and the write
+    committed under the cross-process lock in every durability mode, so a
+    later flush cannot write this state over a version another worker has
+    committed meanwhile.
+    """
+    if _engine is not None:
+        return _engine.put_user_state(user_id, state)
+    with _locked():
+        with _lock:
+            _refresh_locked()
+            version = _user_state_versions.get(user_id, 0) + 1
+            _set_user_state(user_id, state, version)
+        _flush_locked()
+    return version
+
+
+def patch_user_state(
+    user_id: str,
+    updates: Dict[str, Any],
+    removals: List[str] = (),
+    expected_version: Optional[int] = None,
+) -> int:
+    """Merge *updates* into the stored state, drop *removals* and return the new version.
+
+    Raises :class:`utils.state_patch.StateVersionConflict` if *expected_version* is given and
+    the stored state is at a different version. The check and the write are
+    made under the cross-process lock and committed before returning, so two
+    workers can never both accept a patch against the same version.
+    """
+    if _engine is not None:
+        return _engine.patch_user_state(user_id, updates, removals, expected_version)
+    with _locked():
+        with _lock:
+            _refresh_locked()
+            version = _user_state_versions.get(user_id, 0)
+            state = apply_state_patch(_user_states.get(user_id), version, updates, removals, expected_version)
+            _set_user_state(user_id, state, version + 1)
+        _flush_locked()
+    return version + 1
 
 
 def delete_user_state(user_id: str):
+    if _engine is not None:
+        return _engine.delete_user_state(user_id)
     with _lock:
-        _user_states.pop(user_id, None)
-        _flush_user_states()
+        _set_user_state(user_id, _DELETED, _DELETED)
+    _after_mutation()
 
 
 def delete_all_user_data(user_id: str):
+    if _engine is not None:
+        return _engine.delete_all_user_data(user_id)
+    _refresh()
     with _lock:
         # Remove profiles (keyed as "user_id:goal_id")
-        prefix = f"{user_id}:"
-        keys_to_remove = [k for k in _profiles if k.startswith(prefix)]
-        for k in keys_to_remove:
-            del _profiles[k]
-        _flush_profiles()
+        for goal_id in _profiles_by_user.pop(user_id, {}):
+            key = _profile_key(user_id, goal_id)
+            del _profiles[key]
+            _dirty_profiles[key] = _DELETED
 
-        # Remove events
-        _events.pop(user_id, None)
-        _flush_events()
+        # Remove events (tombstone in the log, folded away on compaction)
+        if user_id in _events:
+            record = {"op": "delete", "user_id": user_id}
+            _apply_event_record(record)
+            _pending_event_records.append(record)
 
         # Remove user state
-        _user_states.pop(user_id, None)
-        _flush_user_states()
+        _set_user_state(user_id, _DELETED, _DELETED)
+    _after_mutation()
@@ -1,6 +1,6 @@
 import streamlit as st
 from streamlit_float import *
-from utils.request_api import chat_with_tutor
+from utils.request_api import StreamInterrupted, stream_chat_with_tutor
 from utils.state import index_goal_by_id
 
 
@@ -20,11 +20,16 @@ def ask_autor_chatbot():
     if prompt := st.chat_input("Ask me anything"):
         messages.chat_message("user").write(prompt)
         st.session_state["tutor_messages"].append({"role": "user", "content": prompt})
-        response = chat_with_tutor(
-            st.session_state["tutor_messages"][-20:], 
-            learner_profile,
-            st.session_state["llm_type"])
-        messages.chat_message("assistant").write(response)
+        reply = messages.chat_message("assistant")
+        try:
+            response = reply.write_stream(
+                stream_chat_with_tutor(
+                    st.session_state["tutor_messages"][-20:],
+                    learner_profile,
+                    st.session_state["llm_type"]))
+        except StreamInterrupted as e:
+            response = e.partial
+            reply.error("The reply was interrupted before it finished. Please ask again.")
         st.session_state["tutor_messages"].append({"role": "assistant", "content": response})
         # messages.chat_message("assistant").write(f"Echo: {prompt}")
 
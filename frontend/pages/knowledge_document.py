@@ -7,8 +7,7 @@ import streamlit as st
 import streamlit.components.v1 as components
 import urllib.parse as urlparse
 from components.time_tracking import track_session_learning_start_time
-from utils.request_api import draft_knowledge_points, explore_knowledge_points, generate_document_quizzes, integrate_learning_document, update_learner_profile
-from utils.format import prepare_markdown_document
+from utils.request_api import stream_learning_content, update_learner_profile
 from utils.state import get_current_session_uid, save_persistent_state
 from config import use_mock_data, use_search
 from assets.js.doc_reading import doc_reading_auto_scroll_js
@@ -187,63 +186,51 @@ def render_content_preparation(goal):
             pass
         return learning_content
 
-    with st.spinner("Stage 1/4 - Exploring knowledge Points..."):
-        knowledge_points = explore_knowledge_points(
-            goal["learner_profile"],
-            goal["learning_path"],
-            learning_session,
-            llm_type="gpt4o"
-        )
-    if knowledge_points is None:
-        st.error("Failed to explore knowledge points.")
-        return
-    else:
-        st.success("Stage 1/4 🔍 Knowledge points explored successfully.")
-        with st.expander("View Explored Knowledge Points", expanded=False):
-            for kp in knowledge_points:
-                st.write(f"- {kp['name']} (`{kp['type']}`)")
-    with st.spinner("Stage 2/4 - Drafting knowledge points..."):
-        knowledge_drafts = draft_knowledge_points(
+    # One streamed request: each stage is reported as soon as it finishes and
+    # every knowledge point can be read as soon as its draft is written.
+    knowledge_points = []
+    learning_content = None
+    drafted = 0
+    status = st.status("Stage 1/4 - Exploring knowledge Points...", expanded=True)
+    try:
+        for event, payload in stream_learning_content(
             goal["learner_profile"],
             goal["learning_path"],
             learning_session,
-            knowledge_points,
             use_search=use_search,
             allow_parallel=True,
-            llm_type="gpt4o"
-        )
-    if knowledge_drafts is None:
-        st.error("Failed to draft knowledge points.")
-        return
-    st.success("Stage 2/4 📝 Knowledge points drafted successfully.")
-    with st.spinner("Stage 3/4 - Integrating knowledge document..."):
-        document_structure = integrate_learning_document(
-            goal["learner_profile"],
-            goal["learning_path"],
-            learning_session,
-            knowledge_points,
-            knowledge_drafts,
+            quiz_counts=(3, 1, 1, 1),
             llm_type="gpt4o",
-            output_markdown=False
-        )
-        learning_document = prepare_markdown_document(document_structure, knowledge_points, knowledge_drafts)
-    if learning_document is None:
-        st.error("Failed to integrate knowledge document.")
+        ):
+            if event == "knowledge_points":
+                knowledge_points = payload["knowledge_points"]
+                status.success("Stage 1/4 🔍 Knowledge points explored successfully.")
+                status.write("  ".join(f"`{kp['name']}`" for kp in knowledge_points))
+                status.update(label="Stage 2/4 - Drafting knowledge points...")
+            elif event == "draft":
+                drafted += 1
+                draft = payload["draft"]
+                status.markdown(f"#### {draft['title']}\n\n{draft['content']}")
+                status.update(label=f"Stage 2/4 - Drafted {drafted}/{len(knowledge_points)} knowledge points...")
+                if drafted == len(knowledge_points):
+                    status.success("Stage 2/4 📝 Knowledge points drafted successfully.")
+                    status.update(label="Stage 3/4 - Integrating knowledge document...")
+            elif event == "document":
+                status.success("Stage 3/4 📚 Knowledge document integrated successfully.")
+                status.update(label="Stage 4/4 - Generating document quizzes...")
+            elif event == "quizzes":
+                status.success("Stage 4/4 🎯 Document quizzes generated successfully.")
+            elif event == "done":
+                learning_content = payload["tailored_content"]
+    except Exception as e:
+        status.update(label="Knowledge document generation failed", state="error")
+        st.error(f"Failed to generate the knowledge document: {e}")
         return
-    st.success("Stage 3/4 📚 Knowledge document integrated successfully.")
-    learning_content = {"document": learning_document}
-    with st.spinner("Stage 4/4 - Generating document quizzes..."):
-        quizzes = generate_document_quizzes(
-            goal["learner_profile"],
-            learning_document,
-            single_choice_count=3,
-            multiple_choice_count=1,
-            true_false_count=1,
-            short_answer_count=1,
-            llm_type="gpt4o"
-        )
-    learning_content["quizzes"] = quizzes
-    st.success("Stage 4/4 🎯 Document quizzes generated successfully.")
+    if learning_content is None:
+        status.update(label="Knowledge document generation failed", state="error")
+        st.error("Failed to generate the knowledge document.")
+        return
+    status.update(label="Knowledge document ready", state="complete", expanded=False)
     st.session_state["document_caches"][session_uid] = learning_content
     try:
         save_persistent_state()
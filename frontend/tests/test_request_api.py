@@ -0,0 +1,70 @@
+"""Tests for the tutor reply stream in utils.request_api.
+
+The SSE transport is patched, so no backend is needed.
+
+Run from the repo root:
+    python -m pytest frontend/tests/test_request_api.py -v
+"""
+
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+import httpx
+from utils import request_api
+from utils.request_api import StreamInterrupted, stream_chat_with_tutor
+
+
+@pytest.fixture
+def fallback_calls(monkeypatch):
+    calls = []
+
+    def chat_with_tutor(*args, **kwargs):
+        calls.append(args)
+        return "full reply"
+
+    monkeypatch.setattr(request_api, "use_mock_data", False)
+    monkeypatch.setattr(request_api, "chat_with_tutor", chat_with_tutor)
+    return calls
+
+
+def _sse(*texts, error=None):
+    def iter_sse_events(api_name, data, timeout=500):
+        for text in texts:
+            yield "token", {"text": text}
+        if error is not None:
+            raise error
+        yield "done", {}
+    return iter_sse_events
+
+
+# ===================================================================
+# stream_chat_with_tutor
+# ===================================================================
+
+class TestStreamChatWithTutor:
+    def test_yields_tokens(self, monkeypatch, fallback_calls):
+        monkeypatch.setattr(request_api, "iter_sse_events", _sse("Hel", "lo"))
+        assert list(stream_chat_with_tutor([], {})) == ["Hel", "lo"]
+        assert fallback_calls == []
+
+    def test_failure_after_tokens_raises_with_partial_text(self, monkeypatch, fallback_calls):
+        monkeypatch.setattr(request_api, "iter_sse_events", _sse("Hel", "lo", error=httpx.ReadError("boom")))
+        received = []
+        with pytest.raises(StreamInterrupted) as excinfo:
+            for chunk in stream_chat_with_tutor([], {}):
+                received.append(chunk)
+        assert received == ["Hel", "lo"]
+        assert excinfo.value.partial == "Hello"
+        assert isinstance(excinfo.value.__cause__, httpx.ReadError)
+        assert fallback_calls == []
+
+    def test_failure_before_first_token_falls_back(self, monkeypatch, fallback_calls):
+        monkeypatch.setattr(request_api, "iter_sse_events", _sse(error=httpx.ConnectError("refused")))
+        assert list(stream_chat_with_tutor([], {})) == ["full reply"]
+        assert len(fallback_calls) == 1
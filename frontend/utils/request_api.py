@@ -1,5 +1,6 @@
 import json
 import httpx
+from httpx_sse import connect_sse
 import streamlit as st
 from config import backend_endpoint, use_mock_data, use_search
 from datetime import datetime, timezone
@@ -110,6 +111,7 @@ API_NAMES = {
     "auth_register": "auth/register",
     "auth_login": "auth/login",
     "chat_with_tutor": "chat-with-tutor",
+    "chat_with_tutor_stream": "chat-with-tutor/stream",
     "refine_goal": "refine-learning-goal",
     "identify_skill_gap": "identify-skill-gap-with-info",
     "create_profile": "create-learner-profile-with-info",
@@ -129,6 +131,7 @@ API_NAMES = {
     "simulate_path_feedback": "simulate-path-feedback",
     "refine_path": "refine-learning-path",
     "iterative_refine_path": "iterative-refine-path",
+    "tailor_knowledge_content_stream": "tailor-knowledge-content/stream",
 }
 
 
@@ -227,6 +230,118 @@ def chat_with_tutor(chat_messages, learner_profile, llm_type="gpt4o", method_nam
     response = make_post_request(API_NAMES["chat_with_tutor"], data, "./assets/data_example/ai)tutor_chat.json")
     return response.get("response") if response else None
 
+def iter_sse_events(api_name, data, timeout=500):
+    """POST *data* to a streaming endpoint and yield ``(event, payload)`` per Server-Sent Event.
+
+    Stops after the ``done`` event; an ``error`` event is raised as RuntimeError.
+    """
+    backend_url = f"{backend_endpoint}{api_name}"
+    try:
+        with httpx.Client(timeout=httpx.Timeout(timeout, connect=30)) as client:
+            with connect_sse(client, "POST", backend_url, json=data) as event_source:
+                event_source.response.raise_for_status()
+                for sse in event_source.iter_sse():
+                    payload = sse.json()
+                    if sse.event == "error":
+                        raise RuntimeError(payload.get("detail", "stream failed"))
+                    yield sse.event, payload
+                    if sse.event == "done":
+                        break
+        _set_api_debug_last(url=backend_url, status=200, request_json=data, response_text="(event stream)")
+    except Exception as e:
+        _set_api_debug_last(
+            url=backend_url,
+            status=None,
+            request_json=data,
+            response_text=f"{type(e).__name__}: {e}",
+        )
+        raise
+
+
+class StreamInterrupted(RuntimeError):
+    """A reply stream failed after part of the reply had already been yielded.
+
+    ``partial`` holds the text received so far, so the caller can keep what
+    was shown and tell the user that the reply is incomplete.
+    """
+
+    def __init__(self, partial, cause):
+        super().__init__(f"reply interrupted: {type(cause).__name__}: {cause}")
+        self.partial = partial
+
+
+def stream_chat_with_tutor(chat_messages, learner_profile, llm_type="gpt4o", method_name="genmentor", timeout=500):
+    """Yield the tutor's reply chunk by chunk from the SSE endpoint.
+
+    Meant for ``st.write_stream``. Falls back to the non-streaming endpoint
+    (one chunk) when mock data is enabled or the stream fails before any text
+    arrived. A failure after the first chunk raises :class:`StreamInterrupted`
+    instead, so a truncated reply is never passed off as complete.
+    """
+    if use_mock_data:
+        response = chat_with_tutor(chat_messages, learner_profile, llm_type, method_name)
+        if response:
+            yield response
+        return
+
+    data = {
+        "messages": str(chat_messages),
+        "learner_profile": str(learner_profile),
+        "llm_type": str(llm_type),
+        "method_name": str(method_name),
+    }
+    received = False
+    chunks = []
+    try:
+        for event, payload in iter_sse_events(API_NAMES["chat_with_tutor_stream"], data, timeout=timeout):
+            if event == "token":
+                received = True
+                chunks.append(payload.get("text", ""))
+                yield chunks[-1]
+    except Exception as e:
+        if received:
+            raise StreamInterrupted("".join(chunks), e) from e
+        response = chat_with_tutor(chat_messages, learner_profile, llm_type, method_name)
+        if response:
+            yield response
+
+
+def stream_learning_content(
+    learner_profile,
+    learning_path,
+    learning_session,
+    use_search=True,
+    allow_parallel=True,
+    with_quiz=True,
+    quiz_counts=(3, 0, 0, 0),
+    llm_type="gpt4o",
+    method_name="genmentor",
+    timeout=500,
+):
+    """Yield ``(event, payload)`` from the streaming content pipeline.
+
+    Events: ``knowledge_points``, ``draft`` (one per knowledge point, in
+    completion order), ``document``, ``quizzes`` and ``done``. *quiz_counts*
+    is (single choice, multiple choice, true/false, short answer).
+    """
+    single_choice, multiple_choice, true_false, short_answer = quiz_counts
+    data = {
+        "learner_profile": str(learner_profile),
+        "learning_path": str(learning_path),
+        "learning_session": str(learning_session),
+        "use_search": use_search,
+        "allow_parallel": allow_parallel,
+        "with_quiz": with_quiz,
+        "output_markdown": True,
+        "single_choice_count": single_choice,
+        "multiple_choice_count": multiple_choice,
+        "true_false_count": true_false,
+        "short_answer_count": short_answer,
+        "llm_type": str(llm_type),
+        "method_name": str(method_name),
+    }
+    yield from iter_sse_events(API_NAMES["tailor_knowledge_content_stream"], data, timeout=timeout)
+
 def refine_learning_goal(learning_goal, learner_information, llm_type="gpt4o", method_name="genmentor"):
     data = {
         "learning_goal": str(learning_goal),
@@ -467,6 +582,19 @@ def save_user_state(backend_ep, user_id, state):
         return None, {"detail": str(e)}
 
 
+def patch_user_state(backend_ep, user_id, updates, removals, version):
+    """PATCH /user-state/{user_id} with changed keys only → (status_code, response_json)"""
+    if use_mock_data:
+        return 200, {"ok": True, "version": (version or 0) + 1}
+    url = f"{backend_ep}user-state/{user_id}"
+    body = {"set": updates, "unset": removals, "version": version}
+    try:
+        resp = httpx.patch(url, json=body, timeout=30)
+        return resp.status_code, resp.json()
+    except Exception as e:
+        return None, {"detail": str(e)}
+
+
 def delete_user_state(backend_ep, user_id):
     """DELETE /user-state/{user_id} → (status_code, response_json)"""
     if use_mock_data:
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import time
 import streamlit as st
 from collections import defaultdict
@@ -35,6 +37,19 @@ PERSIST_KEYS = [
 _SAVE_DEBOUNCE_SECS = 1.0
 
 
+def _fingerprint(value):
+    """Stable digest of a session value, used to spot keys that changed since the last save."""
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(encoded.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _remember_persisted(user_id, fingerprints, version):
+    """Record what the backend now holds so the next save only sends the difference."""
+    st.session_state["_persisted_user"] = user_id
+    st.session_state["_persisted_fingerprints"] = fingerprints
+    st.session_state["_persisted_version"] = version
+
+
 def load_persistent_state():
     """Load persisted keys from the backend into st.session_state."""
     from utils.request_api import get_user_state as _api_get
@@ -45,21 +60,29 @@ def load_persistent_state():
     if status != 200:
         return False
     state = data.get("state", {})
+    fingerprints = {}
     for k, v in state.items():
         if k in PERSIST_KEYS:
             st.session_state[k] = v
+            fingerprints[k] = _fingerprint(v)
+    _remember_persisted(user_id, fingerprints, data.get("version"))
     return True
 
 
 def save_persistent_state():
     """Save whitelisted st.session_state keys to the backend.
 
-    Debounced: at most one HTTP PUT per ``_SAVE_DEBOUNCE_SECS`` seconds.
+    Debounced: at most one HTTP request per ``_SAVE_DEBOUNCE_SECS`` seconds.
     The caller never needs to know whether the write was debounced away —
     the final save at the end of each Streamlit rerun will always go through
     because enough time will have elapsed (or because a new rerun starts).
+
+    Only keys whose value changed since the last load/save are sent, as a
+    versioned PATCH. The full state is PUT when nothing is known yet about
+    the backend copy (first save for this user).
     """
     from utils.request_api import save_user_state as _api_put
+    from utils.request_api import patch_user_state as _api_patch
 
     now = time.time()
     last = st.session_state.get("_last_save_ts", 0.0)
@@ -69,15 +92,36 @@ def save_persistent_state():
     user_id = st.session_state.get("userId", "default")
     backend_ep = st.session_state.get("backend_endpoint", config.backend_endpoint)
     payload = {}
+    fingerprints = {}
     for k in PERSIST_KEYS:
         if k in st.session_state:
             try:
                 payload[k] = st.session_state[k]
+                fingerprints[k] = _fingerprint(payload[k])
             except Exception:
-                pass
-    status, _resp = _api_put(backend_ep, user_id, payload)
+                payload.pop(k, None)
+
+    saved = None
+    if st.session_state.get("_persisted_user") == user_id:
+        saved = st.session_state.get("_persisted_fingerprints")
+    if saved is None:
+        status, resp = _api_put(backend_ep, user_id, payload)
+    else:
+        changed = {k: payload[k] for k, f in fingerprints.items() if saved.get(k) != f}
+        removed = [k for k in saved if k not in fingerprints]
+        if not changed and not removed:
+            st.session_state["_last_save_ts"] = now
+            return True
+        version = st.session_state.get("_persisted_version")
+        status, resp = _api_patch(backend_ep, user_id, changed, removed, version)
+        if status == 409:
+            # Another session saved in between; its other keys are kept and
+            # ours overwrite the ones we changed.
+            version = resp.get("detail", {}).get("version")
+            status, resp = _api_patch(backend_ep, user_id, changed, removed, version)
     if status == 200:
         st.session_state["_last_save_ts"] = now
+        _remember_persisted(user_id, fingerprints, resp.get("version"))
         return True
     return False
 
@@ -89,6 +133,8 @@ def delete_persistent_state():
     user_id = st.session_state.get("userId", "default")
     backend_ep = st.session_state.get("backend_endpoint", config.backend_endpoint)
     status, _resp = _api_del(backend_ep, user_id)
+    if status == 200:
+        st.session_state.pop("_persisted_user", None)
     return status == 200
 
 